@@ -0,0 +1,138 @@
+"""
+Benchmark for checkpointed ingestion: checkpoint cost against the interval.
+
+Ingests a synthetic corpus into a flat FAISS index through IngestionService with a
+stub embedder, once per `--every-chunks` interval, and reports how many checkpoints
+were taken, how long they took, and how much longer the run got than without
+checkpoints. Embedding continues while a checkpoint is saved, until the pipeline's
+queues fill, so the run slows down by less than the time spent saving. The stub
+embedder takes `--embed-ms-per-chunk` per chunk to stand in for the model.
+
+Example:
+    python scripts/benchmark_checkpointing.py --documents 20000 --every-chunks 0 20000 50000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.adapters.environment import setup_logging  # noqa: E402
+from src.adapters.vector_storage.faiss_vector_repository import (  # noqa: E402
+    FaissVectorRepository,
+)
+from src.application.services.ingestion_service import IngestionService  # noqa: E402
+from src.domain.entities import Chunk, Document  # noqa: E402
+from src.domain.ports import (  # noqa: E402
+    IChunkingStrategy,
+    IDataSource,
+    IEmbeddingService,
+)
+
+
+class SyntheticSource(IDataSource):
+    def __init__(self, documents: int):
+        self.ids = [f"doc-{i}" for i in range(documents)]
+
+    def get_all_source_document_identifiers(self):
+        return list(self.ids)
+
+    def load_all(self):
+        return [self.load(doc_id) for doc_id in self.ids]
+
+    def load_new(self, last_known_ids):
+        known = set(last_known_ids)
+        return [self.load(doc_id) for doc_id in self.ids if doc_id not in known]
+
+    def load(self, doc_id):
+        text = " ".join(
+            f"{doc_id} paragraph {i} " + "lorem ipsum " * 60 for i in range(8)
+        )
+        return Document(id=doc_id, content=text, source_location=doc_id)
+
+
+class ParagraphChunker(IChunkingStrategy):
+    def chunk(self, document):
+        return [
+            Chunk(id=f"{document.id}_chunk_{i}", document_id=document.id, content=text)
+            for i, text in enumerate(document.content.split(" " * 2))
+        ]
+
+
+class SleepingEmbedder(IEmbeddingService):
+    def __init__(self, dim: int, seconds_per_chunk: float):
+        self.dim = dim
+        self.seconds_per_chunk = seconds_per_chunk
+        self.rng = np.random.default_rng(0)
+
+    def embed_chunks(self, chunks, out=None):
+        time.sleep(self.seconds_per_chunk * len(chunks))
+        out[:] = self.rng.random((len(chunks), self.dim), dtype=np.float32)
+
+    def embed_query(self, query):
+        return self.rng.random(self.dim, dtype=np.float32)
+
+    def get_dimension(self):
+        return self.dim
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--embed-ms-per-chunk", type=float, default=0.5)
+    parser.add_argument(
+        "--every-chunks", type=int, nargs="+", default=[0, 10000, 25000, 50000]
+    )
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    rows = []
+    for every in args.every_chunks:
+        with tempfile.TemporaryDirectory() as tmp:
+            repository = FaissVectorRepository(
+                embedding_dim=args.dim, persist_path=os.path.join(tmp, "index.faiss")
+            )
+            service = IngestionService(
+                SyntheticSource(args.documents),
+                ParagraphChunker(),
+                SleepingEmbedder(args.dim, args.embed_ms_per_chunk / 1000),
+                repository,
+                checkpoint_every_chunks=every,
+            )
+            start = time.perf_counter()
+            stats = service._stream(service.data_source.iter_all())
+            final_start = time.perf_counter()
+            repository.save()
+            final = time.perf_counter() - final_start
+            total = time.perf_counter() - start
+            repository.chunks.close()
+        rows.append((every, stats, final, total))
+
+    print(
+        f"# Checkpointing {args.documents} documents ({rows[0][1].chunks} chunks, "
+        f"dim {args.dim}, {args.embed_ms_per_chunk} ms/chunk embedding)\n\n"
+        "| every (chunks) | checkpoints | checkpoint s | mean s | final save s "
+        "| total s | vs. off |\n"
+        "|----------------|-------------|--------------|--------|--------------"
+        "|---------|---------|"
+    )
+    baseline = next((total for every, _, _, total in rows if not every), None)
+    for every, stats, final, total in rows:
+        mean = stats.checkpoint_seconds / stats.checkpoints if stats.checkpoints else 0
+        print(
+            f"| {every or 'off'} | {stats.checkpoints} "
+            f"| {stats.checkpoint_seconds:.2f} | {mean:.2f} | {final:.2f} "
+            f"| {total:.1f} "
+            f"| {f'{total / baseline - 1:+.1%}' if baseline else '-'} |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
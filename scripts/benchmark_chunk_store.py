@@ -0,0 +1,143 @@
+"""
+Cold-start benchmark for chunk metadata: legacy JSON vs. the mmap ChunkStore.
+
+Writes the same synthetic chunks in both formats, then measures what a freshly
+started process pays before it can answer a query: parsing the JSON list and building
+one Chunk per entry, versus mapping the ChunkStore and reading only the top-k rows.
+Each load runs in a fresh subprocess so the Python heap does not carry over.
+
+Example:
+    python scripts/benchmark_chunk_store.py --num-chunks 200000 --content-bytes 800
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.adapters.environment import setup_logging  # noqa: E402
+from src.adapters.vector_storage.chunk_store import write_chunk_store  # noqa: E402
+
+# ru_maxrss survives exec (it would report this parent's peak), so read VmHWM instead.
+PEAK_RSS = """
+def peak_rss_kib():
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM"))
+"""
+
+# Each probe prints "<seconds> <peak RSS KiB>" for load + fetching top-k chunks.
+JSON_PROBE = (
+    PEAK_RSS
+    + """
+import json, sys, time
+from src.domain.entities.chunk import Chunk
+start = time.perf_counter()
+with open(sys.argv[1], encoding="utf-8") as f:
+    rows = json.load(f)
+chunks = {}
+for row in rows:
+    vid = row.pop("vector_id")
+    chunks[vid] = Chunk(**row)
+hits = [chunks[i] for i in range(0, len(chunks), max(1, len(chunks) // 10))]
+print(time.perf_counter() - start, peak_rss_kib())
+"""
+)
+
+STORE_PROBE = (
+    PEAK_RSS
+    + """
+import sys, time
+from src.adapters.vector_storage.chunk_store import ChunkMap, ChunkStore
+start = time.perf_counter()
+chunks = ChunkMap(ChunkStore(sys.argv[1]))
+hits = [chunks[i] for i in range(0, len(chunks), max(1, len(chunks) // 10))]
+print(time.perf_counter() - start, peak_rss_kib())
+"""
+)
+
+
+def make_rows(num_chunks: int, content_bytes: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    words = ["contract", "clause", "party", "term", "liability", "notice", "payment"]
+    for i in range(num_chunks):
+        content = " ".join(rng.choice(words, size=content_bytes // 7))
+        yield (
+            i,
+            f"chunk-{i}",
+            f"doc-{i // 20}",
+            content,
+            json.dumps({"source": f"s3://bucket/doc-{i // 20}.md", "chunk": i % 20}),
+        )
+
+
+def run_probe(probe: str, path: str, repeats: int):
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    runs = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", probe, path],
+            cwd=root,
+            env={**os.environ, "PYTHONPATH": root},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        runs.append((float(out[0]), int(out[1]) / 1024.0))
+    return min(r[0] for r in runs), min(r[1] for r in runs)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--num-chunks", type=int, default=100_000)
+    parser.add_argument("--content-bytes", type=int, default=800)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    workdir = tempfile.mkdtemp()
+    json_path = os.path.join(workdir, "index.meta.json")
+    store_path = os.path.join(workdir, "index.chunks")
+
+    rows = list(make_rows(args.num_chunks, args.content_bytes))
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(
+            [
+                {
+                    "vector_id": vid,
+                    "id": cid,
+                    "document_id": doc,
+                    "content": content,
+                    "metadata": json.loads(meta),
+                }
+                for vid, cid, doc, content, meta in rows
+            ],
+            f,
+        )
+    write_chunk_store(store_path, rows)
+    del rows
+
+    json_s, json_mb = run_probe(JSON_PROBE, json_path, args.repeats)
+    store_s, store_mb = run_probe(STORE_PROBE, store_path, args.repeats)
+    print(
+        f"# Chunk metadata cold start ({args.num_chunks} chunks, "
+        f"~{args.content_bytes} B content, best of {args.repeats})\n\n"
+        "| format | file (MB) | load + top-k (ms) | peak RSS (MB) |\n"
+        "|--------|-----------|-------------------|---------------|\n"
+        f"| JSON | {os.path.getsize(json_path) / 1e6:.1f} | {json_s * 1000:.1f} "
+        f"| {json_mb:.0f} |\n"
+        f"| ChunkStore | {os.path.getsize(store_path) / 1e6:.1f} "
+        f"| {store_s * 1000:.1f} | {store_mb:.0f} |"
+    )
+    shutil.rmtree(workdir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
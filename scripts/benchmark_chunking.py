@@ -0,0 +1,126 @@
+"""
+Benchmark for the chunking strategies: LangChain's splitter vs. the built-in one.
+
+Builds a large code file by concatenating this repository's own Python sources until
+it reaches `--file-mb`, splits it with both strategies (best of `--repeat` runs), and
+checks they produce identical chunks. The import time of each strategy's module is
+measured in a fresh interpreter, since that is paid once per ingestion process.
+Needs langchain_text_splitters for the comparison; without it only the built-in
+strategy is timed.
+
+Example:
+    python scripts/benchmark_chunking.py --file-mb 8 --chunk-size 1000 --chunk-overlap 200
+"""
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.adapters.chunking.recursive_chunking_strategy import (  # noqa: E402
+    RecursiveChunkingStrategy,
+)
+from src.adapters.environment import setup_logging  # noqa: E402
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def build_code_file(target_mb: float) -> str:
+    sources = []
+    for path in sorted(
+        glob.glob(os.path.join(ROOT, "src", "**", "*.py"), recursive=True)
+    ):
+        with open(path, encoding="utf-8") as f:
+            sources.append(f.read())
+    corpus = "\n\n".join(sources)
+    return (corpus + "\n\n") * max(1, int(target_mb * 1e6 / len(corpus)) + 1)
+
+
+def import_seconds(module: str) -> float:
+    """Seconds spent importing `module`, timed inside a fresh interpreter."""
+    code = "import time; t = time.perf_counter(); import {}; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-c", code.format(module)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    return float(result.stdout) if result.returncode == 0 else float("nan")
+
+
+def best_of(repeat: int, fn, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--file-mb", type=float, default=8.0)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    text = build_code_file(args.file_mb)
+    size_mb = len(text) / 1e6
+
+    rows = []
+    native = RecursiveChunkingStrategy(args.chunk_size, args.chunk_overlap)
+    seconds, native_chunks = best_of(args.repeat, native.split_text, text)
+    rows.append(
+        (
+            "recursive (built-in)",
+            import_seconds("src.adapters.chunking.recursive_chunking_strategy"),
+            seconds,
+            len(native_chunks),
+        )
+    )
+    try:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+    except ImportError:
+        print("langchain_text_splitters is not installed; timing the built-in only.")
+    else:
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            length_function=len,
+        )
+        seconds, langchain_chunks = best_of(args.repeat, splitter.split_text, text)
+        if langchain_chunks != native_chunks:
+            print("The built-in strategy's chunks differ from LangChain's.")
+            return 1
+        rows.insert(
+            0,
+            (
+                "langchain",
+                import_seconds("src.adapters.chunking.langchain_chunking_strategy"),
+                seconds,
+                len(langchain_chunks),
+            ),
+        )
+
+    print(
+        f"# Chunking a {size_mb:.1f} MB Python file (chunk_size={args.chunk_size}, "
+        f"chunk_overlap={args.chunk_overlap}, best of {args.repeat})\n\n"
+        "| strategy | import (s) | split (s) | MB/s | chunks |\n"
+        "|----------|------------|-----------|------|--------|"
+    )
+    for label, imported, seconds, num_chunks in rows:
+        print(
+            f"| {label} | {imported:.2f} | {seconds:.2f} | {size_mb / seconds:.1f} "
+            f"| {num_chunks} |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Recall-vs-latency benchmark for the FaissVectorRepository index families.
+
+Builds a flat (exact) baseline plus HNSW / IVF-Flat / IVF-PQ indexes over the same
+synthetic corpus, sweeps each family's query-time knob (efSearch / nprobe) and reports
+recall@k against the flat baseline, per-query latency (mean / p99) and build time.
+Use the output to pick `vector_repository` settings per environment.
+
+Example:
+    python scripts/benchmark_faiss_index.py --num-vectors 200000 --dim 384
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import faiss  # type: ignore
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.adapters.environment import setup_logging  # noqa: E402
+from src.adapters.vector_storage.faiss_vector_repository import (  # noqa: E402
+    FaissVectorRepository,
+)
+from src.domain.entities.chunk import Chunk  # noqa: E402
+
+# Query-time parameter swept for each index family.
+SWEEPS: Dict[str, Dict] = {
+    "flat": {"param": None, "values": [None]},
+    "hnsw": {"param": "efSearch", "values": [16, 32, 64, 128, 256]},
+    "ivf_flat": {"param": "nprobe", "values": [1, 4, 16, 64]},
+    "ivf_pq": {"param": "nprobe", "values": [1, 4, 16, 64]},
+}
+
+
+def make_corpus(num_vectors: int, num_queries: int, dim: int, seed: int = 42):
+    """Gaussian-mixture vectors, closer to real embedding clusters than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, num_vectors // 1000), dim)).astype("float32")
+    assignment = rng.integers(0, len(centers), size=num_vectors + num_queries)
+    data = centers[assignment] + 0.3 * rng.normal(
+        size=(num_vectors + num_queries, dim)
+    ).astype("float32")
+    return data[:num_vectors], data[num_vectors:]
+
+
+def build_repository(index_type: str, corpus: np.ndarray, **params) -> tuple:
+    persist_path = os.path.join(tempfile.mkdtemp(), f"{index_type}.bin")
+    repo = FaissVectorRepository(
+        embedding_dim=corpus.shape[1],
+        persist_path=persist_path,
+        index_type=index_type,
+        **params,
+    )
+    chunks = [
+        Chunk(id=str(i), document_id=str(i), content="", embedding=vector)
+        for i, vector in enumerate(corpus)
+    ]
+    start = time.perf_counter()
+    repo.add(chunks)
+    repo.save()  # Forces IVF training if the corpus is below the auto-train threshold.
+    return repo, time.perf_counter() - start
+
+
+def run_queries(repo: FaissVectorRepository, queries: np.ndarray, top_k: int):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = repo.search(query, top_k=top_k)
+        latencies.append(time.perf_counter() - start)
+        results.append([int(chunk.id) for chunk, _ in hits])
+    return np.array(latencies) * 1000.0, results
+
+
+def recall_at_k(results: List[List[int]], ground_truth: List[List[int]]) -> float:
+    hits = sum(len(set(r) & set(g)) for r, g in zip(results, ground_truth))
+    return hits / max(1, sum(len(g) for g in ground_truth))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--num-vectors", type=int, default=100_000)
+    parser.add_argument("--num-queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--ivf-nlist", type=int, default=1024)
+    parser.add_argument("--pq-m", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=1, help="FAISS OpenMP threads.")
+    parser.add_argument(
+        "--output", type=str, default=None, help="Optional Markdown report path."
+    )
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    faiss.omp_set_num_threads(args.threads)
+    corpus, queries = make_corpus(args.num_vectors, args.num_queries, args.dim)
+    build_params = {
+        "hnsw_m": args.hnsw_m,
+        "ivf_nlist": args.ivf_nlist,
+        "pq_m": args.pq_m,
+    }
+
+    rows = []
+    ground_truth: List[List[int]] = []
+    for index_type, sweep in SWEEPS.items():
+        repo, build_seconds = build_repository(index_type, corpus, **build_params)
+        for value in sweep["values"]:
+            if sweep["param"]:
+                faiss.ParameterSpace().set_index_parameter(
+                    repo.index, sweep["param"], value
+                )
+            latencies, results = run_queries(repo, queries, args.top_k)
+            if index_type == "flat":
+                ground_truth = results
+            rows.append(
+                {
+                    "index": index_type,
+                    "param": f"{sweep['param']}={value}" if sweep["param"] else "-",
+                    "recall": recall_at_k(results, ground_truth),
+                    "mean_ms": float(latencies.mean()),
+                    "p99_ms": float(np.percentile(latencies, 99)),
+                    "build_s": build_seconds,
+                }
+            )
+            logging.warning(f"Finished {index_type} {rows[-1]['param']}")
+
+    lines = [
+        f"# FAISS index benchmark ({args.num_vectors} x {args.dim}, "
+        f"{args.num_queries} queries, top_k={args.top_k}, threads={args.threads})",
+        "",
+        f"| index | search param | recall@{args.top_k} | mean (ms) | p99 (ms) | build (s) |",
+        "|-------|--------------|-----------|-----------|----------|-----------|",
+    ]
+    for row in rows:
+        lines.append(
+            f"| {row['index']} | {row['param']} | {row['recall']:.3f} "
+            f"| {row['mean_ms']:.3f} | {row['p99_ms']:.3f} | {row['build_s']:.1f} |"
+        )
+    report = "\n".join(lines) + "\n"
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+        logging.warning(f"Benchmark report saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Benchmark for incremental re-chunking: chunks re-embedded after small edits.
+
+Copies this repository's sources and docs into a temporary tree, syncs it into a flat
+FAISS index through FileSystemDataSource, then edits a few lines in `--edited-files`
+files and syncs again. The second sync runs twice from the same starting index: with
+chunk-level diffing (unchanged chunks keep their vectors) and with it disabled (every
+chunk of an edited file is re-embedded, the previous behaviour). Embeddings come
+from a counting stub, so only chunk volumes are measured.
+
+Example:
+    python scripts/benchmark_incremental_sync.py --edited-files 20 --strategy recursive
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.adapters.chunking.recursive_chunking_strategy import (  # noqa: E402
+    RecursiveChunkingStrategy,
+)
+from src.adapters.chunking.token_budget_chunking_strategy import (  # noqa: E402
+    TokenBudgetChunkingStrategy,
+)
+from src.adapters.data_sources.file_system_data_source import (  # noqa: E402
+    FileSystemDataSource,
+)
+from src.adapters.environment import setup_logging  # noqa: E402
+from src.adapters.vector_storage.faiss_vector_repository import (  # noqa: E402
+    FaissVectorRepository,
+)
+from src.application.services.ingestion_service import IngestionService  # noqa: E402
+from src.domain.ports import IEmbeddingService  # noqa: E402
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DIM = 32
+
+
+class CountingEmbedder(IEmbeddingService):
+    """Deterministic pseudo-embeddings derived from the text; counts chunks embedded."""
+
+    def __init__(self):
+        self.embedded = 0
+
+    def embed_chunks(self, chunks, out=None):
+        self.embedded += len(chunks)
+        for i, chunk in enumerate(chunks):
+            out[i] = self.embed_query(chunk.content)
+
+    def embed_query(self, query):
+        seed = int(hashlib.sha256(query.encode("utf-8")).hexdigest()[:8], 16)
+        return np.random.default_rng(seed).random(DIM, dtype=np.float32)
+
+    def get_dimension(self):
+        return DIM
+
+
+class NoCarryOverRepository(FaissVectorRepository):
+    """The previous behaviour: an edited file's stored chunks are simply deleted."""
+
+    def get_chunks_by_document_id(self, doc_ids):
+        return {}
+
+
+def copy_corpus(dest: str) -> list:
+    patterns = ("src/**/*.py", "scripts/*.py", "codecraft-ai-docs/**/*.md")
+    copied = []
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(ROOT, pattern), recursive=True):
+            rel = os.path.relpath(path, ROOT)
+            os.makedirs(os.path.join(dest, os.path.dirname(rel)), exist_ok=True)
+            shutil.copyfile(path, os.path.join(dest, rel))
+            copied.append(rel)
+    return sorted(copied)
+
+
+def edit_files(root: str, files: list, count: int, seed: int = 3) -> None:
+    """Changes one line near the middle of each of `count` files."""
+    rng = random.Random(seed)
+    for rel in rng.sample(files, min(count, len(files))):
+        path = os.path.join(root, rel)
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        i = len(lines) // 2
+        lines[i] = lines[i] + "  # edited"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+
+def sync(tree, index_path, repository_cls, strategy, load=True) -> tuple:
+    embedder = CountingEmbedder()
+    repository = repository_cls(embedding_dim=DIM, persist_path=index_path)
+    if load:
+        repository.load()
+    source = FileSystemDataSource(
+        tree, manifest_path=os.path.join(os.path.dirname(index_path), "manifest.json")
+    )
+    IngestionService(source, strategy, embedder, repository).run()
+    rows = len(repository.chunks)
+    repository.chunks.close()
+    return embedder.embedded, rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--edited-files", type=int, default=20)
+    parser.add_argument(
+        "--strategy", choices=["recursive", "token_budget"], default="recursive"
+    )
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    if args.strategy == "recursive":
+        strategy = RecursiveChunkingStrategy(chunk_size=1000, chunk_overlap=200)
+    else:
+        strategy = TokenBudgetChunkingStrategy(max_tokens=512)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "tree")
+        files = copy_corpus(tree)
+        base_dir = os.path.join(tmp, "base")
+        os.makedirs(base_dir)
+        initial, _ = sync(
+            tree, os.path.join(base_dir, "index.faiss"), FaissVectorRepository, strategy
+        )
+        edit_files(tree, files, args.edited_files)
+
+        rows = []
+        for label, repository_cls in (
+            ("re-chunk whole files", NoCarryOverRepository),
+            ("chunk-level diff", FaissVectorRepository),
+        ):
+            run_dir = os.path.join(tmp, label.replace(" ", "_"))
+            shutil.copytree(base_dir, run_dir)
+            embedded, stored = sync(
+                tree, os.path.join(run_dir, "index.faiss"), repository_cls, strategy
+            )
+            rows.append((label, embedded, stored))
+
+    print(
+        f"# Incremental sync ({args.strategy}, {len(files)} files, {initial} chunks; "
+        f"one line edited in {args.edited_files} files)\n\n"
+        "| strategy | chunks embedded | vs. whole files | chunks stored |\n"
+        "|----------|-----------------|-----------------|---------------|"
+    )
+    for label, embedded, stored in rows:
+        print(f"| {label} | {embedded} | {embedded / rows[0][1]:.1%} | {stored} |")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
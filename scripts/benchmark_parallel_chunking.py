@@ -0,0 +1,126 @@
+"""
+Benchmark for ParallelChunker: chunking throughput across 1/2/4/8 worker processes.
+
+Generates a synthetic corpus of documents with uneven sizes and chunks it with each
+worker count, checking that every run produces the same chunks in the same order as
+the serial one. Uses LangchainChunkingStrategy when langchain_text_splitters is
+installed, or `--strategy words` for a dependency-free, pure-Python word packer with a
+similar cost profile.
+
+Example:
+    python scripts/benchmark_parallel_chunking.py --num-docs 2000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.adapters.environment import setup_logging  # noqa: E402
+from src.application.parallel_chunking import ParallelChunker  # noqa: E402
+from src.domain.entities import Chunk, Document  # noqa: E402
+from src.domain.ports import IChunkingStrategy  # noqa: E402
+
+WORDS = (
+    "the party shall indemnify agreement clause term notice payment within days".split()
+)
+
+
+class WordPackChunker(IChunkingStrategy):
+    """Packs whole words into chunks of at most `chunk_size` characters."""
+
+    def __init__(self, chunk_size: int = 1000):
+        self.chunk_size = chunk_size
+
+    def chunk(self, document: Document) -> List[Chunk]:
+        pieces, current, length = [], [], 0
+        for word in document.content.split():
+            if current and length + 1 + len(word) > self.chunk_size:
+                pieces.append(" ".join(current))
+                current, length = [], 0
+            current.append(word)
+            length += len(word) + (1 if length else 0)
+        if current:
+            pieces.append(" ".join(current))
+        return [
+            Chunk(id=f"{document.id}_chunk_{i}", document_id=document.id, content=text)
+            for i, text in enumerate(pieces)
+        ]
+
+
+def make_corpus(num_docs: int, mean_kb: int, seed: int = 7) -> List[Document]:
+    rng = random.Random(seed)
+    docs = []
+    for i in range(num_docs):
+        # Log-normal sizes: mostly small documents with a long tail of large ones.
+        num_words = max(1, int(rng.lognormvariate(0, 1) * mean_kb * 1024 / 7))
+        text = " ".join(rng.choice(WORDS) for _ in range(num_words))
+        docs.append(Document(id=f"doc-{i}", content=text, source_location=f"doc-{i}"))
+    return docs
+
+
+def make_strategy(name: str) -> IChunkingStrategy:
+    if name == "langchain":
+        from src.adapters.chunking.langchain_chunking_strategy import (
+            LangchainChunkingStrategy,
+        )
+
+        return LangchainChunkingStrategy(chunk_size=1000, chunk_overlap=200)
+    return WordPackChunker(chunk_size=1000)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--num-docs", type=int, default=2000)
+    parser.add_argument("--mean-kb", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-kb", type=int, default=1024)
+    parser.add_argument(
+        "--strategy", choices=["langchain", "words"], default="langchain"
+    )
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    docs = make_corpus(args.num_docs, args.mean_kb)
+    total_mb = sum(len(d.content) for d in docs) / 1e6
+    strategy = make_strategy(args.strategy)
+
+    rows, reference = [], None
+    for workers in args.workers:
+        chunker = ParallelChunker(
+            strategy, max_workers=workers, batch_bytes=args.batch_kb << 10
+        )
+        start = time.perf_counter()
+        # The pool is started lazily, so its start-up is part of the measurement.
+        ids = [
+            chunk.id for _, chunks in chunker.chunk_documents(docs) for chunk in chunks
+        ]
+        seconds = time.perf_counter() - start
+        chunker.close()
+        if reference is None:
+            reference = ids
+        elif ids != reference:
+            print(f"Chunk order with {workers} workers differs from the serial run.")
+            return 1
+        rows.append((workers, seconds, len(ids)))
+
+    print(
+        f"# ParallelChunker ({args.strategy}, {len(docs)} documents, {total_mb:.1f} MB, "
+        f"{args.batch_kb} KB batches, {os.cpu_count()} CPUs)\n\n"
+        "| workers | total (s) | MB/s | chunks/s | speedup |\n"
+        "|---------|-----------|------|----------|---------|"
+    )
+    for workers, seconds, num_chunks in rows:
+        print(
+            f"| {workers} | {seconds:.2f} | {total_mb / seconds:.1f} "
+            f"| {num_chunks / seconds:,.0f} | {rows[0][1] / seconds:.2f}x |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
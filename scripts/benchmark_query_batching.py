@@ -0,0 +1,198 @@
+"""
+Benchmark for /query micro-batching: QPS and latency under concurrent load.
+
+Compares the two ways the API can answer concurrent /query requests:
+- threadpool: each request calls QueryService.search on a worker thread (what a sync
+  FastAPI handler does), so every query is encoded and searched on its own;
+- batched: requests await QueryBatcher.search, which encodes and searches
+  micro-batches in one call each.
+
+The model is a NumPy encoder shaped like all-MiniLM-L6-v2 (6 layers, 384 wide,
+random weights, up to 32 tokens), since the benchmark host cannot download the real
+one; its cost per call and per token is of the same order. The index is flat.
+
+Example:
+    python scripts/benchmark_query_batching.py --concurrency 1 8 32 64
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.adapters.environment import setup_logging  # noqa: E402
+from src.adapters.vector_storage.faiss_vector_repository import (  # noqa: E402
+    FaissVectorRepository,
+)
+from src.application.query_batching import QueryBatcher  # noqa: E402
+from src.application.services.query_service import QueryService  # noqa: E402
+from src.domain.entities import Chunk  # noqa: E402
+from src.domain.ports import IEmbeddingService  # noqa: E402
+
+DIM = 384
+# Starlette runs sync handlers on anyio's default thread limiter of 40.
+THREADPOOL_SIZE = 40
+
+
+class NumpyEncoder(IEmbeddingService):
+    """A MiniLM-shaped transformer encoder in NumPy, with random weights."""
+
+    def __init__(self, layers=6, dim=DIM, ffn=1536, heads=12, max_tokens=32):
+        rng = np.random.default_rng(0)
+        self.dim, self.heads, self.max_tokens = dim, heads, max_tokens
+        self.vocab = rng.standard_normal((30522, dim), dtype=np.float32) * 0.02
+
+        def w(*shape):
+            return rng.standard_normal(shape, dtype=np.float32) / np.sqrt(shape[0])
+
+        self.layers = [
+            (w(dim, 3 * dim), w(dim, dim), w(dim, ffn), w(ffn, dim))
+            for _ in range(layers)
+        ]
+
+    def _tokens(self, query):
+        ids = [hash(word) % 30522 for word in query.lower().split()]
+        return ids[: self.max_tokens] or [0]
+
+    def embed_queries(self, queries):
+        tokens = [self._tokens(q) for q in queries]
+        length = max(len(t) for t in tokens)
+        ids = np.zeros((len(queries), length), dtype=np.int64)
+        mask = np.zeros((len(queries), length), dtype=np.float32)
+        for i, t in enumerate(tokens):
+            ids[i, : len(t)] = t
+            mask[i, : len(t)] = 1.0
+        n, head = len(queries), self.dim // self.heads
+        # Token rows of the whole batch go through each weight matrix in one GEMM.
+        x = self.vocab[ids.reshape(-1)]
+        for qkv_w, out_w, up_w, down_w in self.layers:
+            q, k, v = (
+                a.reshape(n, length, self.heads, head).transpose(0, 2, 1, 3)
+                for a in np.split(x @ qkv_w, 3, axis=-1)
+            )
+            scores = q @ k.transpose(0, 1, 3, 2) / np.sqrt(head)
+            scores = scores + (mask[:, None, None, :] - 1.0) * 1e4
+            scores = np.exp(scores - scores.max(-1, keepdims=True))
+            scores /= scores.sum(-1, keepdims=True)
+            attended = (scores @ v).transpose(0, 2, 1, 3).reshape(n * length, -1)
+            x = x + attended @ out_w
+            x = x + np.maximum(x @ up_w, 0) @ down_w
+        x = x.reshape(n, length, -1)
+        pooled = (x * mask[..., None]).sum(1) / mask.sum(1, keepdims=True)
+        return pooled.astype(np.float32)
+
+    def embed_query(self, query):
+        return self.embed_queries([query])[0]
+
+    def embed_chunks(self, chunks, out=None):
+        out[:] = self.embed_queries([c.content for c in chunks])
+
+    def get_dimension(self):
+        return self.dim
+
+
+def build_service(path: str, vectors: int) -> QueryService:
+    repository = FaissVectorRepository(embedding_dim=DIM, persist_path=path)
+    rng = np.random.default_rng(1)
+    for start in range(0, vectors, 10000):
+        batch = [
+            Chunk(id=f"c{i}", document_id=f"d{i // 10}", content=f"chunk {i}")
+            for i in range(start, min(start + 10000, vectors))
+        ]
+        for chunk in batch:
+            chunk.embedding = rng.random(DIM, dtype=np.float32)
+        repository.add(batch)
+    return QueryService(NumpyEncoder(), repository)
+
+
+def queries(n: int):
+    words = "how do i configure the faiss index for s3 hot reload with hnsw".split()
+    return [" ".join(words[i % 5 :] + [str(i)]) for i in range(n)]
+
+
+def run_threadpool(service, qs, concurrency):
+    latencies = []
+
+    def one(q):
+        start = time.perf_counter()
+        service.search(q, top_k=3)
+        latencies.append(time.perf_counter() - start)
+
+    # The first `concurrency` requests arrive together; each new one as one finishes.
+    start = time.perf_counter()
+    with ThreadPoolExecutor(min(concurrency, THREADPOOL_SIZE)) as pool:
+        list(pool.map(one, qs))
+    return len(qs) / (time.perf_counter() - start), latencies
+
+
+def run_batched(service, qs, concurrency, max_batch_size, max_wait_ms):
+    latencies = []
+
+    async def main():
+        batcher = QueryBatcher(service.search_batch, max_batch_size, max_wait_ms)
+        pending = iter(qs)
+
+        async def client():
+            for q in pending:
+                start = time.perf_counter()
+                await batcher.search(q, top_k=3)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        await batcher.close()
+        return batcher
+
+    start = time.perf_counter()
+    batcher = asyncio.run(main())
+    qps = len(qs) / (time.perf_counter() - start)
+    return qps, latencies, batcher.queries / max(batcher.batches, 1)
+
+
+def ms(latencies, q):
+    return f"{statistics.quantiles(latencies, n=100)[q - 1] * 1000:.1f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    service = build_service("/tmp/benchmark_query_batching.faiss", args.vectors)
+    qs = queries(args.queries)
+    service.search_batch(qs[:8])  # Warm up
+
+    print(
+        f"# /query under concurrent load ({args.vectors} vectors, flat, "
+        f"{args.queries} queries, batches of <= {args.max_batch_size} / "
+        f"{args.max_wait_ms} ms)\n\n"
+        "| concurrency | threadpool QPS | p50 ms | p95 ms | batched QPS | p50 ms "
+        "| p95 ms | mean batch |\n"
+        "|-------------|----------------|--------|--------|-------------|--------"
+        "|--------|------------|"
+    )
+    for concurrency in args.concurrency:
+        t_qps, t_lat = run_threadpool(service, qs, concurrency)
+        b_qps, b_lat, mean_batch = run_batched(
+            service, qs, concurrency, args.max_batch_size, args.max_wait_ms
+        )
+        print(
+            f"| {concurrency} | {t_qps:.0f} | {ms(t_lat, 50)} | {ms(t_lat, 95)} "
+            f"| {b_qps:.0f} | {ms(b_lat, 50)} | {ms(b_lat, 95)} | {mean_batch:.1f} |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Benchmark for the /query result cache: latency and hit ratio on a repeating workload.
+
+Answers a stream of queries drawn from a Zipf-like distribution over `--distinct`
+questions (a few popular ones asked again and again, a long tail asked rarely) with
+QueryService.search, once without the cache and once through QueryResultCache keyed
+by the repository's index version, the way /query does. The encoder and index are
+the MiniLM-shaped stand-ins of benchmark_query_batching.py.
+
+Example:
+    python scripts/benchmark_query_cache.py --requests 2000 --distinct 200 500 2000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.benchmark_query_batching import build_service, queries  # noqa: E402
+from src.adapters.environment import setup_logging  # noqa: E402
+from src.application.query_cache import QueryResultCache  # noqa: E402
+
+
+def workload(distinct: int, requests: int, skew: float, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, distinct + 1) ** skew
+    picks = rng.choice(distinct, size=requests, p=weights / weights.sum())
+    pool = queries(distinct)
+    return [pool[i] for i in picks]
+
+
+def run(service, qs, cache=None):
+    latencies = []
+    repository = service.vector_repository
+    for q in qs:
+        start = time.perf_counter()
+        version = repository.index_version()
+        chunks = cache.get(q, 3, version) if cache else None
+        if chunks is None:
+            chunks = service.search(q, top_k=3)
+            if cache:
+                cache.put(q, 3, version, chunks)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def ms(latencies, q):
+    return f"{statistics.quantiles(latencies, n=100)[q - 1] * 1000:.2f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, nargs="+", default=[200, 500, 2000])
+    parser.add_argument("--skew", type=float, default=1.0)
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    service = build_service("/tmp/benchmark_query_cache.faiss", args.vectors)
+    service.search_batch(queries(8))  # Warm up
+
+    print(
+        f"# /query result cache ({args.vectors} vectors, flat, {args.requests} "
+        f"requests, Zipf s={args.skew})\n\n"
+        "| distinct queries | uncached mean ms | p95 ms | cached mean ms | p50 ms "
+        "| p95 ms | hit ratio | cache KiB |\n"
+        "|------------------|------------------|--------|----------------|--------"
+        "|--------|-----------|-----------|"
+    )
+    for distinct in args.distinct:
+        qs = workload(distinct, args.requests, args.skew)
+        uncached = run(service, qs)
+        cache = QueryResultCache()
+        cached = run(service, qs, cache)
+        stats = cache.stats()
+        print(
+            f"| {distinct} | {statistics.mean(uncached) * 1000:.2f} "
+            f"| {ms(uncached, 95)} | {statistics.mean(cached) * 1000:.2f} "
+            f"| {ms(cached, 50)} | {ms(cached, 95)} | {stats['hit_ratio']:.1%} "
+            f"| {stats['memory_bytes'] / 1024:.0f} |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Benchmark for S3DataSource.load(doc_id): re-listing per call vs. the listing snapshot.
+
+Builds an in-memory fake bucket, then loads k documents by ETag both ways: the legacy
+path lists the whole prefix and scans it for every call; the snapshot path lists once
+and resolves each id with a dict lookup. LIST pages (1000 keys) and GETs can be given a
+simulated latency, so the numbers reflect S3 round trips rather than just CPU.
+
+Example:
+    python scripts/benchmark_s3_lookup.py --num-objects 100000 --loads 50 --list-page-ms 30
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.adapters.data_sources.s3_data_source import S3DataSource  # noqa: E402
+from src.adapters.environment import setup_logging  # noqa: E402
+
+
+class FakeBucketClient:
+    """Minimal list_objects_v2 / get_object stand-in over a sorted key list."""
+
+    def __init__(self, num_objects: int, list_page_ms: float, get_ms: float):
+        self.keys = [f"raw/doc-{i:07d}.md" for i in range(num_objects)]
+        self.list_page_seconds = list_page_ms / 1000.0
+        self.get_seconds = get_ms / 1000.0
+        self.list_pages = 0
+
+    def get_paginator(self, name):
+        client = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix, StartAfter=""):
+                keys = [k for k in client.keys if k > StartAfter]
+                for start in range(0, len(keys), 1000):
+                    client.list_pages += 1
+                    time.sleep(client.list_page_seconds)
+                    yield {
+                        "Contents": [
+                            {"Key": k, "ETag": f'"{k[8:15]}"', "Size": 64}
+                            for k in keys[start : start + 1000]
+                        ]
+                    }
+
+        return Paginator()
+
+    def get_object(self, Bucket, Key):
+        time.sleep(self.get_seconds)
+        return {"Body": io.BytesIO(b"# contract\n" * 6)}
+
+
+def legacy_load(source: S3DataSource, doc_id: str):
+    """The pre-snapshot implementation: a full listing and linear scan per call."""
+    for obj in source._paginate():
+        if obj.get("ETag", "").strip('"') == doc_id or obj.get("Key") == doc_id:
+            return source._load_document_from_s3(obj)
+    raise ValueError(doc_id)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--num-objects", type=int, default=100_000)
+    parser.add_argument("--loads", type=int, default=20)
+    parser.add_argument("--list-page-ms", type=float, default=0.0)
+    parser.add_argument("--get-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    step = max(1, args.num_objects // args.loads)
+    doc_ids = [f"{i:07d}" for i in range(0, args.num_objects, step)][: args.loads]
+
+    rows = []
+    for label, load in (
+        ("re-list per load", legacy_load),
+        ("listing snapshot", lambda source, doc_id: source.load(doc_id)),
+    ):
+        client = FakeBucketClient(args.num_objects, args.list_page_ms, args.get_ms)
+        source = S3DataSource("bucket", "raw/", client=client)
+        start = time.perf_counter()
+        for doc_id in doc_ids:
+            load(source, doc_id)
+        seconds = time.perf_counter() - start
+        rows.append((label, seconds, client.list_pages))
+
+    print(
+        f"# S3DataSource.load ({args.num_objects} objects, {len(doc_ids)} loads, "
+        f"{args.list_page_ms:g} ms per LIST page, {args.get_ms:g} ms per GET)\n\n"
+        "| strategy | total (s) | per load (ms) | LIST pages |\n"
+        "|----------|-----------|---------------|------------|"
+    )
+    for label, seconds, pages in rows:
+        print(
+            f"| {label} | {seconds:.2f} | {seconds / len(doc_ids) * 1000:.1f} "
+            f"| {pages} |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Benchmark for the semantic /query cache: hit ratio, search time saved and answer
+agreement for paraphrased queries.
+
+Requests pick a topic from a Zipf-like distribution over `--topics` and one of
+`--paraphrases` wordings of it. The benchmark host cannot download a sentence
+embedding model, so each wording's embedding is its topic's vector plus noise of
+norm `--spread`; two wordings of a topic then have cosine similarity of about
+1 / (1 + spread^2), e.g. 0.94 at 0.25, the range all-MiniLM-L6-v2 gives close
+paraphrases. The flat index holds `--vectors` chunks spread around the topics
+(noise of norm up to `--chunk-spread`), as a corpus covers the subjects users ask about.
+Each workload is answered by QueryService without and with SemanticQueryCache at each
+`--thresholds` value. Agreement is the share of top-3 chunks a semantic hit returned
+that a real search of the query returns too.
+
+Example:
+    python scripts/benchmark_semantic_cache.py --thresholds 0.9 0.95 0.98
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.adapters.environment import setup_logging  # noqa: E402
+from src.adapters.vector_storage.faiss_vector_repository import (  # noqa: E402
+    FaissVectorRepository,
+)
+from src.adapters.vector_storage.semantic_query_cache import (  # noqa: E402
+    SemanticQueryCache,
+)
+from src.application.services.query_service import QueryService  # noqa: E402
+from src.domain.entities import Chunk  # noqa: E402
+from src.domain.ports import IEmbeddingService  # noqa: E402
+
+DIM = 384
+
+
+def around(centers: np.ndarray, spread, rng) -> np.ndarray:
+    """Each center plus Gaussian noise of norm `spread` times the center's norm."""
+    noise = rng.standard_normal(centers.shape).astype(np.float32)
+    noise *= np.asarray(spread, dtype=np.float32)[..., None] / np.linalg.norm(
+        noise, axis=-1, keepdims=True
+    )
+    return centers + noise * np.linalg.norm(centers, axis=-1, keepdims=True)
+
+
+class ParaphraseEncoder(IEmbeddingService):
+    """Embeds "topic T wording W" as topic T's vector plus wording W's noise."""
+
+    def __init__(self, topics: int, paraphrases: int, spread: float, seed: int = 2):
+        rng = np.random.default_rng(seed)
+        self.topics = rng.random((topics, DIM), dtype=np.float32)
+        self.vectors = around(
+            np.repeat(self.topics[:, None, :], paraphrases, axis=1), spread, rng
+        )
+
+    def embed_query(self, query):
+        _, topic, _, wording = query.split()
+        return self.vectors[int(topic), int(wording)]
+
+    def embed_chunks(self, chunks, out=None):
+        raise NotImplementedError
+
+    def get_dimension(self):
+        return DIM
+
+
+def build_repository(path: str, encoder, vectors: int, spread: float):
+    repository = FaissVectorRepository(embedding_dim=DIM, persist_path=path)
+    rng = np.random.default_rng(1)
+    topics = len(encoder.topics)
+    for start in range(0, vectors, 10000):
+        ids = range(start, min(start + 10000, vectors))
+        # Chunks range from on-topic to loosely related, so each topic has a few
+        # clearly most relevant chunks.
+        spreads = spread * rng.uniform(0.2, 1.0, len(ids))
+        embeddings = around(encoder.topics[[i % topics for i in ids]], spreads, rng)
+        repository.add(
+            [
+                Chunk(
+                    id=f"c{i}",
+                    document_id=f"d{i // 10}",
+                    content=f"chunk {i}",
+                    embedding=embedding,
+                )
+                for i, embedding in zip(ids, embeddings)
+            ]
+        )
+    return repository
+
+
+def workload(args, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, args.topics + 1) ** args.skew
+    topics = rng.choice(args.topics, size=args.requests, p=weights / weights.sum())
+    wordings = rng.integers(args.paraphrases, size=args.requests)
+    return [f"topic {t} wording {w}" for t, w in zip(topics, wordings)]
+
+
+def run(service, qs):
+    """Returns the latency and answer of each query, and whether the cache hit."""
+    latencies, answers, hit = [], [], []
+    cache = service.semantic_cache
+    for q in qs:
+        hits = cache.hits if cache else 0
+        start = time.perf_counter()
+        answers.append(service.search(q, top_k=3, use_semantic_cache=True))
+        latencies.append(time.perf_counter() - start)
+        hit.append(cache is not None and cache.hits > hits)
+    return latencies, answers, hit
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--topics", type=int, default=300)
+    parser.add_argument("--paraphrases", type=int, default=8)
+    parser.add_argument("--spread", type=float, default=0.25)
+    parser.add_argument("--chunk-spread", type=float, default=0.5)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--max-entries", type=int, default=1000)
+    parser.add_argument(
+        "--thresholds", type=float, nargs="+", default=[0.9, 0.95, 0.98]
+    )
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    encoder = ParaphraseEncoder(args.topics, args.paraphrases, args.spread)
+    repository = build_repository(
+        "/tmp/benchmark_semantic_cache.faiss",
+        encoder,
+        args.vectors,
+        args.chunk_spread,
+    )
+    qs = workload(args)
+    uncached, truth, _ = run(QueryService(encoder, repository), qs)
+
+    print(
+        f"# Semantic /query cache ({args.vectors} vectors, flat, {args.requests} "
+        f"requests over {args.topics} topics x {args.paraphrases} wordings, "
+        f"spread {args.spread}, {args.max_entries} entries)\n\n"
+        f"Uncached: mean {statistics.mean(uncached) * 1000:.2f} ms per query.\n\n"
+        "| threshold | hit ratio | mean ms | vs. uncached | saved ms (reported) "
+        "| lookup ms | agreement |\n"
+        "|-----------|-----------|---------|--------------|---------------------"
+        "|-----------|-----------|"
+    )
+    for threshold in args.thresholds:
+        cache = SemanticQueryCache(DIM, threshold, args.max_entries)
+        cached, answers, hit = run(QueryService(encoder, repository, cache), qs)
+        stats = cache.stats()
+        overlaps = [
+            len({c.id for c in a} & {c.id for c in t}) / 3
+            for a, t, h in zip(answers, truth, hit)
+            if h
+        ]
+        agreement = statistics.mean(overlaps) if overlaps else 1.0
+        mean = statistics.mean(cached)
+        print(
+            f"| {threshold} | {stats['hit_ratio']:.1%} | {mean * 1000:.2f} "
+            f"| {mean / statistics.mean(uncached) - 1:+.0%} "
+            f"| {stats['saved_ms']:.0f} | {stats['mean_lookup_ms']:.3f} "
+            f"| {agreement:.1%} |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Benchmark for token-budgeted chunking: chunk counts and fill vs. character sizing.
+
+Chunks this repository's Python sources and docs with the character-sized recursive
+splitter (the current config) and with TokenBudgetChunkingStrategy, then measures
+every chunk in tokens with the same counter. Fewer chunks means fewer embedding
+calls and index rows; fewer total tokens means less overlap re-embedded.
+
+Example:
+    python scripts/benchmark_token_chunking.py --max-tokens 512 --tokenizer tokenizer.json
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.adapters.chunking.recursive_chunking_strategy import (  # noqa: E402
+    RecursiveChunkingStrategy,
+)
+from src.adapters.chunking.token_budget_chunking_strategy import (  # noqa: E402
+    TokenBudgetChunkingStrategy,
+)
+from src.adapters.chunking.token_counting import TokenCounter  # noqa: E402
+from src.adapters.environment import setup_logging  # noqa: E402
+from src.domain.entities import Document  # noqa: E402
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def load_corpus():
+    patterns = ("src/**/*.py", "scripts/*.py", "codecraft-ai-docs/**/*.md")
+    paths = sorted(
+        path
+        for pattern in patterns
+        for path in glob.glob(os.path.join(ROOT, pattern), recursive=True)
+    )
+    docs = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            docs.append(Document(id=path, content=f.read(), source_location=path))
+    return docs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--max-tokens", type=int, default=512)
+    parser.add_argument("--overlap-tokens", type=int, default=0)
+    parser.add_argument("--tokenizer", default=None)
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    docs = load_corpus()
+    counter = TokenCounter(args.tokenizer)
+    strategies = [
+        (
+            f"recursive ({args.chunk_size} chars, {args.chunk_overlap} overlap)",
+            RecursiveChunkingStrategy(args.chunk_size, args.chunk_overlap),
+        ),
+        (
+            f"token_budget ({args.max_tokens} tokens, {args.overlap_tokens} overlap)",
+            TokenBudgetChunkingStrategy(
+                args.max_tokens, args.overlap_tokens, tokenizer=args.tokenizer
+            ),
+        ),
+    ]
+
+    print(
+        f"# Chunking {len(docs)} files "
+        f"({sum(len(d.content) for d in docs) / 1e6:.1f} MB) measured with "
+        f"{args.tokenizer or 'approximate'} token counts\n\n"
+        "| strategy | chunks | total tokens | mean tokens | p95 tokens "
+        "| max tokens | split (s) |\n"
+        "|----------|--------|--------------|-------------|------------"
+        "|------------|-----------|"
+    )
+    for label, strategy in strategies:
+        start = time.perf_counter()
+        chunks = [c for doc in docs for c in strategy.chunk(doc)]
+        seconds = time.perf_counter() - start
+        tokens = sorted(counter.count(c.content) for c in chunks)
+        print(
+            f"| {label} | {len(chunks)} | {sum(tokens)} "
+            f"| {statistics.mean(tokens):.0f} "
+            f"| {tokens[int(len(tokens) * 0.95)]} | {tokens[-1]} | {seconds:.2f} |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,37 @@
+import copy
 import os
 import logging
+import time
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, Depends, HTTPException, status
+from fastapi import FastAPI, Request, Response, Depends, HTTPException, status
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Any, Dict, List, Optional
 
+from src.adapters.api.metrics import (
+    RESULTS_RETURNED,
+    SERIALIZE_SECONDS,
+    RequestMetricsMiddleware,
+    register_app_metrics,
+)
 from src.adapters.config_manager import ConfigManager
+from src.application.metrics import CONTENT_TYPE, REGISTRY
 from src.application.services.query_service import QueryService  # <-- FIXED IMPORT
+from src.application.query_batching import QueryBatcher
+from src.application.query_cache import QueryResultCache
+from src.application.service_reloader import (
+    BuiltService,
+    ReloadInProgressError,
+    ServiceReloader,
+)
 from src.domain.entities.chunk import Chunk
 from src.adapters.factories.factories import (
     create_embedding_service,
+    create_semantic_query_cache,
     create_vector_repository,
 )
+from src.adapters.vector_storage.faiss_vector_repository import FaissVectorRepository
+from src.adapters.vector_storage.index_refresher import S3IndexRefresher
 
 os.environ.setdefault(
     "APP_MODE", "dev"
@@ -40,6 +59,22 @@ class QueryResponse(BaseModel):
     results: List[ChunkResponse]
 
 
+class BatchQueryRequest(BaseModel):
+    queries: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="The questions to ask the knowledge base.",
+    )
+    top_k: int = Field(
+        default=3, gt=0, le=10, description="The number of results per query."
+    )
+
+
+class BatchQueryResponse(BaseModel):
+    results: List[QueryResponse]
+
+
 # --- Configuration Management ---
 config_manager = ConfigManager()
 
@@ -52,6 +87,155 @@ def get_api_key(request: Request):
     return request.headers.get("X-API-Key")
 
 
+def create_index_refresher(
+    query_service: QueryService, repo_config: Dict[str, Any]
+) -> Optional[S3IndexRefresher]:
+    """
+    Creates (but does not start) hot reloading of the query service's index from S3,
+    if S3 is configured.
+    """
+    repository = query_service.vector_repository
+    if not isinstance(repository, FaissVectorRepository) or not repository.s3_client:
+        return None
+    return S3IndexRefresher(
+        repository,
+        on_swap=index_publisher(query_service),
+        poll_interval_seconds=float(repo_config.get("s3_poll_interval_seconds", 30)),
+    )
+
+
+def index_publisher(query_service: QueryService):
+    def publish(new_repository: FaissVectorRepository) -> None:
+        # A single reference assignment: each search sees the old or the new index.
+        query_service.vector_repository = new_repository
+
+    return publish
+
+
+def build_query_service(
+    config: Any,
+    current: Optional[QueryService] = None,
+    current_embedding_config: Optional[Dict[str, Any]] = None,
+    current_repository_config: Optional[Dict[str, Any]] = None,
+) -> BuiltService:
+    """
+    Builds a QueryService for `config` on the index it will serve. The current
+    service's embedding service (and its loaded model) is reused when the
+    embedding_service config is unchanged, and its live index (with the S3 refresher
+    keeping it current) when the vector_repository config is unchanged, so unrelated
+    config edits pay neither a model load nor an index download.
+    """
+    reuse = current is not None and config.embedding_service == current_embedding_config
+    embedding_service = (
+        current.embedding_service
+        if reuse
+        else create_embedding_service(config.embedding_service)
+    )
+    reuse_index = (
+        current is not None and config.vector_repository == current_repository_config
+    )
+    if reuse_index:
+        # Re-pointed at the refresher's live repository when published.
+        vector_repository = current.vector_repository
+    else:
+        vector_repository = create_vector_repository(
+            config.vector_repository, embedding_service
+        )
+        vector_repository.load()
+    query_service = QueryService(
+        embedding_service=embedding_service,
+        vector_repository=vector_repository,
+        semantic_cache=create_semantic_query_cache(
+            getattr(config, "query", {}), embedding_service
+        ),
+    )
+    index_refresher = None
+    if not reuse_index:
+        index_refresher = create_index_refresher(
+            query_service, config.vector_repository
+        )
+        if index_refresher:
+            # Pull the live S3 version now, so the service is warmed on (and starts
+            # serving) the index it will keep; the refresher then only polls for newer.
+            index_refresher.check_once()
+    return BuiltService(
+        query_service=query_service,
+        config=config,
+        config_version=config_manager.last_version,
+        reused_embedding_service=reuse,
+        reused_index=reuse_index,
+        index_refresher=index_refresher,
+    )
+
+
+def configure_query_path(app: FastAPI, query_config: Dict[str, Any]) -> None:
+    """
+    Applies the `query` config to the shared /query batcher and result cache. They
+    outlive reloads (queued queries and cached results carry over), so new limits
+    are set in place rather than by replacing them.
+    """
+    batcher = app.state.query_batcher
+    batcher.max_batch_size = int(query_config.get("max_batch_size", 32))
+    batcher.max_wait_ms = float(query_config.get("max_batch_wait_ms", 5.0))
+    app.state.query_cache.configure(
+        max_entries=int(query_config.get("result_cache_max_entries", 10000)),
+        max_bytes=int(query_config.get("result_cache_max_bytes", 64 << 20)),
+        ttl_seconds=float(query_config.get("result_cache_ttl_seconds", 300.0)),
+    )
+
+
+def publish_query_service(app: FastAPI, built: BuiltService) -> None:
+    """
+    Swaps a built QueryService in. A reused index keeps its S3 refresher, re-pointed
+    at the new service; otherwise the old refresher is closed and the new one started.
+    A reused index searched with a new embedding model gets a new index version, so
+    the result and semantic caches drop what the old model found.
+    """
+    old_refresher = getattr(app.state, "index_refresher", None)
+    if built.reused_index and old_refresher:
+        # The refresher may have swapped in a newer index since the build.
+        built.query_service.vector_repository = old_refresher.redirect(
+            index_publisher(built.query_service)
+        )
+    # A single reference assignment: each request sees the old or the new service.
+    app.state.query_service = built.query_service
+    app.state.embedding_config = copy.deepcopy(built.config.embedding_service)
+    app.state.vector_repository_config = copy.deepcopy(built.config.vector_repository)
+    configure_query_path(app, getattr(built.config, "query", {}))
+    if built.reused_index:
+        repository = built.query_service.vector_repository
+        # After the swap, so results the old model finds meanwhile are cached under
+        # the old version and dropped with it.
+        if not built.reused_embedding_service and isinstance(
+            repository, FaissVectorRepository
+        ):
+            repository.bump_index_version()
+        return
+    if old_refresher:
+        old_refresher.close()
+    if built.index_refresher:
+        built.index_refresher.start()
+    app.state.index_refresher = built.index_refresher
+
+
+def create_service_reloader(app: FastAPI) -> ServiceReloader:
+    def rebuild() -> BuiltService:
+        config = config_manager.load(force_reload=True)
+        logging.info(
+            f"Config reloaded via /reload-config. New version: {config_manager.last_version or 'unknown'}"
+        )
+        return build_query_service(
+            config,
+            app.state.query_service,
+            app.state.embedding_config,
+            app.state.vector_repository_config,
+        )
+
+    return ServiceReloader(
+        build=rebuild, publish=lambda built: publish_query_service(app, built)
+    )
+
+
 # --- Lifespan Management for Application State ---
 # This is the modern replacement for @app.on_event("startup")
 @asynccontextmanager
@@ -62,19 +246,26 @@ async def lifespan(app: FastAPI):
     config_manager.load()
     config = config_manager.config
 
-    embedding_service = create_embedding_service(config.embedding_service)
-    vector_repository = create_vector_repository(
-        config.vector_repository, embedding_service
-    )
-
-    app.state.query_service = QueryService(
-        embedding_service=embedding_service, vector_repository=vector_repository
+    # Reads app.state.query_service per batch, so /reload-config swaps are picked up.
+    # Only /query goes through the semantic tier; /query/batch searches every query.
+    # Both are configured from `query` on every publish (see configure_query_path).
+    app.state.query_batcher = QueryBatcher(
+        lambda queries, top_k: app.state.query_service.search_batch(
+            queries, top_k, use_semantic_cache=True
+        )
     )
+    app.state.query_cache = QueryResultCache()
+    publish_query_service(app, build_query_service(config))
+    app.state.service_reloader = create_service_reloader(app)
+    register_app_metrics(app.state)
     logging.info(
         f"API dependencies initialized. Config version: {config_manager.last_version or 'unknown'}"
     )
 
     yield
+    await app.state.query_batcher.close()
+    if app.state.index_refresher:
+        app.state.index_refresher.stop()
     logging.info("API shutting down.")
 
 
@@ -84,6 +275,12 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan,
 )
+app.add_middleware(RequestMetricsMiddleware)
+
+_QUERY_SERIALIZE_SECONDS = SERIALIZE_SECONDS.labels("/query")
+_QUERY_RESULTS = RESULTS_RETURNED.labels("/query")
+_BATCH_SERIALIZE_SECONDS = SERIALIZE_SECONDS.labels("/query/batch")
+_BATCH_RESULTS = RESULTS_RETURNED.labels("/query/batch")
 
 # --- API Endpoints ---
 
@@ -95,32 +292,134 @@ def health_check():
 
 
 @app.post("/query", response_model=QueryResponse, tags=["RAG"])
-def query_endpoint(query: QueryRequest, request: Request):
+async def query_endpoint(query: QueryRequest, request: Request):
     """
     Receives a query and returns the most relevant document chunks.
+    Results are cached per index version (see QueryResultCache); the X-Cache response
+    header reports HIT, MISS or BYPASS ("Cache-Control: no-cache" request header).
+    Misses are embedded and searched together with concurrent queries (see
+    QueryBatcher), off the event loop.
     """
     query_service = request.app.state.query_service
     if not query_service:
         raise HTTPException(status_code=503, detail="Service not available.")
 
     try:
-        retrieved_chunks: List[Chunk] = query_service.search(
-            query=query.query, top_k=query.top_k
+        cache = request.app.state.query_cache
+        use_cache = "no-cache" not in request.headers.get("Cache-Control", "").lower()
+        # Read before searching, so a result that races with a swap is not stored
+        # under the new version.
+        version = query_service.vector_repository.index_version()
+        retrieved_chunks: Optional[List[Chunk]] = (
+            cache.get(query.query, query.top_k, version) if use_cache else None
         )
-        response_chunks = [
-            ChunkResponse(
-                document_id=chunk.document_id,
-                content=chunk.content,
-                metadata=chunk.metadata,
+        cache_status = (
+            "BYPASS" if not use_cache else "MISS" if retrieved_chunks is None else "HIT"
+        )
+        if retrieved_chunks is None:
+            retrieved_chunks = await request.app.state.query_batcher.search(
+                query.query, top_k=query.top_k
             )
-            for chunk in retrieved_chunks
-        ]
-        return QueryResponse(results=response_chunks)
+            if use_cache:
+                cache.put(query.query, query.top_k, version, retrieved_chunks)
+        # Encoded here rather than by FastAPI, so serialization can be timed (and
+        # the response model is not validated a second time).
+        start = time.perf_counter()
+        body = QueryResponse(
+            results=[
+                ChunkResponse(
+                    document_id=chunk.document_id,
+                    content=chunk.content,
+                    metadata=chunk.metadata,
+                )
+                for chunk in retrieved_chunks
+            ]
+        ).model_dump_json()
+        _QUERY_SERIALIZE_SECONDS.observe(time.perf_counter() - start)
+        _QUERY_RESULTS.inc(len(retrieved_chunks))
+        return Response(
+            body, media_type="application/json", headers={"X-Cache": cache_status}
+        )
     except Exception as e:
         logging.error(f"Error during query: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
+@app.get("/index/status", tags=["Health"])
+def index_status(request: Request):
+    """
+    Reports the active index version and the outcome of the last S3 hot reload.
+    """
+    refresher = getattr(request.app.state, "index_refresher", None)
+    if refresher:
+        return {"hot_reload": True, **refresher.status()}
+    repository = request.app.state.query_service.vector_repository
+    return {
+        "hot_reload": False,
+        "active_version": getattr(repository, "last_known_s3_version_id", None),
+    }
+
+
+@app.get("/query/cache", tags=["Health"])
+def query_cache_status(request: Request):
+    """
+    Reports the /query result cache: hits, misses, entries, estimated memory, and
+    the index version its entries belong to. "semantic" reports the near-duplicate
+    tier behind it, including the search time its hits saved.
+    """
+    semantic_cache = getattr(request.app.state.query_service, "semantic_cache", None)
+    return {
+        **request.app.state.query_cache.stats(),
+        "semantic": semantic_cache.stats() if semantic_cache else {"enabled": False},
+    }
+
+
+@app.get("/metrics", tags=["Health"])
+def metrics():
+    """
+    Prometheus metrics in text exposition format: per-stage latency histograms
+    (embedding, search, serialization, whole request), result and error counters,
+    and index, cache and memory gauges.
+    """
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.post("/query/batch", response_model=BatchQueryResponse, tags=["RAG"])
+def batch_query_endpoint(batch: BatchQueryRequest, request: Request):
+    """
+    Answers many queries at once: one embedding call and one index search for all
+    of them. Results are returned in the order of `queries`.
+    """
+    query_service = request.app.state.query_service
+    if not query_service:
+        raise HTTPException(status_code=503, detail="Service not available.")
+
+    try:
+        retrieved = query_service.search_batch(queries=batch.queries, top_k=batch.top_k)
+        start = time.perf_counter()
+        body = BatchQueryResponse(
+            results=[
+                QueryResponse(
+                    results=[
+                        ChunkResponse(
+                            document_id=chunk.document_id,
+                            content=chunk.content,
+                            metadata=chunk.metadata,
+                        )
+                        for chunk in chunks
+                    ]
+                )
+                for chunks in retrieved
+            ]
+        ).model_dump_json()
+        _BATCH_SERIALIZE_SECONDS.observe(time.perf_counter() - start)
+        _BATCH_RESULTS.inc(sum(len(chunks) for chunks in retrieved))
+        return Response(body, media_type="application/json")
+    except Exception as e:
+        logging.error(f"Error during batch query: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error.")
+
+
 @app.get("/config")
 def show_config(cfg=Depends(get_app_config)):
     """
@@ -129,33 +428,47 @@ def show_config(cfg=Depends(get_app_config)):
     return cfg.dict()
 
 
-@app.post("/reload-config", status_code=200, tags=["Admin"])
-def reload_config(request: Request, api_key: str = Depends(get_api_key)):
-    """
-    Reloads configuration from SSM Parameter Store at runtime.
-    Requires a valid X-API-Key header.
-    """
+def require_api_key(api_key: Optional[str]) -> None:
     expected_api_key = config_manager.get_current_api_key()
     if not api_key or api_key != expected_api_key:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key."
         )
 
+
+@app.post("/reload-config", status_code=202, tags=["Admin"])
+def reload_config(request: Request, api_key: str = Depends(get_api_key)):
+    """
+    Reloads configuration from SSM Parameter Store without blocking: a new
+    QueryService is built and warmed in the background, then swapped in, while the
+    current one keeps serving. Returns a job id to poll at /reload-config/{job_id}.
+    Requires a valid X-API-Key header. 409 if a reload is already running.
+    """
+    require_api_key(api_key)
     try:
-        config_manager.load(force_reload=True)
-        config = config_manager.config
-        logging.info(
-            f"Config reloaded via /reload-config. New version: {config_manager.last_version or 'unknown'}"
-        )
-        # Optionally, re-initialize downstream services if config affects them
-        embedding_service = create_embedding_service(config.embedding_service)
-        vector_repository = create_vector_repository(
-            config.vector_repository, embedding_service
-        )
-        request.app.state.query_service = QueryService(
-            embedding_service=embedding_service, vector_repository=vector_repository
+        job = request.app.state.service_reloader.start()
+    except ReloadInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "job_id": e.job_id},
         )
-        return {"status": "reloaded", "config_version": config_manager.last_version}
-    except Exception as e:
-        logging.error(f"Failed to reload config: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to reload config")
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/reload-config/{job.id}",
+    }
+
+
+@app.get("/reload-config/{job_id}", tags=["Admin"])
+def reload_config_status(
+    job_id: str, request: Request, api_key: str = Depends(get_api_key)
+):
+    """
+    Reports a reload job: pending, building, warming, succeeded or failed, with the
+    config version, build and warm-up times, and whether the model was reused.
+    """
+    require_api_key(api_key)
+    job = request.app.state.service_reloader.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown reload job.")
+    return job.to_dict()
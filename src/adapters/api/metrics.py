@@ -0,0 +1,126 @@
+import time
+from typing import Any, Callable, Dict
+
+from src.application.metrics import REGISTRY
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "rag_request_seconds",
+    "Total time to answer an HTTP request, by route.",
+    ["endpoint"],
+)
+SERIALIZE_SECONDS = REGISTRY.histogram(
+    "rag_serialize_seconds",
+    "Time to build and JSON-encode a query response, by route.",
+    ["endpoint"],
+)
+RESULTS_RETURNED = REGISTRY.counter(
+    "rag_query_results_total", "Chunks returned to clients, by route.", ["endpoint"]
+)
+ERRORS = REGISTRY.counter(
+    "rag_errors_total",
+    "Requests answered with a 5xx status or an unhandled exception, by route.",
+    ["endpoint"],
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Times every HTTP request and counts server errors, labelled by route template
+    (unmatched paths share one label, so scanners cannot blow up cardinality).
+
+    A plain ASGI middleware: it adds two clock reads and one observation per request,
+    where Starlette's BaseHTTPMiddleware would add a task and a stream per request.
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+        self._children: Dict[str, Any] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router records the matched route in the scope.
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            request_seconds, errors = self._metrics(endpoint)
+            request_seconds.observe(time.perf_counter() - start)
+            if status_code >= 500:
+                errors.inc()
+
+    def _metrics(self, endpoint: str):
+        children = self._children.get(endpoint)
+        if children is None:
+            children = (REQUEST_SECONDS.labels(endpoint), ERRORS.labels(endpoint))
+            self._children[endpoint] = children
+        return children
+
+
+def register_app_metrics(state: Any) -> None:
+    """
+    Points the scrape-time metrics at an app's state: index size, the /query caches
+    and batcher. They read `state` when scraped, so service swaps are picked up.
+    """
+
+    def tiers(stat: str) -> Dict[tuple, float]:
+        values = {("exact",): state.query_cache.stats()[stat]}
+        semantic_cache = getattr(state.query_service, "semantic_cache", None)
+        if semantic_cache is not None:
+            values[("semantic",)] = semantic_cache.stats()[stat]
+        return values
+
+    def index_vectors() -> float:
+        repository = state.query_service.vector_repository
+        count = getattr(repository, "live_vector_count", None)
+        return count() if callable(count) else float("nan")
+
+    REGISTRY.gauge(
+        "rag_index_vectors",
+        "Vectors searchable in the active index.",
+        function=index_vectors,
+    )
+    REGISTRY.counter(
+        "rag_query_cache_hits_total",
+        "/query cache hits, by tier.",
+        ["tier"],
+        function=lambda: tiers("hits"),
+    )
+    REGISTRY.counter(
+        "rag_query_cache_misses_total",
+        "/query cache misses, by tier.",
+        ["tier"],
+        function=lambda: tiers("misses"),
+    )
+    REGISTRY.gauge(
+        "rag_query_cache_entries",
+        "Entries held by the /query caches, by tier.",
+        ["tier"],
+        function=lambda: tiers("entries"),
+    )
+    REGISTRY.gauge(
+        "rag_query_cache_memory_bytes",
+        "Estimated memory held by the /query result cache.",
+        function=lambda: state.query_cache.memory_bytes,
+    )
+    REGISTRY.counter(
+        "rag_query_batches_total",
+        "/query micro-batches searched.",
+        function=lambda: state.query_batcher.batches,
+    )
+    REGISTRY.counter(
+        "rag_query_batched_queries_total",
+        "Queries answered in /query micro-batches.",
+        function=lambda: state.query_batcher.queries,
+    )
@@ -1,5 +1,6 @@
-from typing import List
+from typing import Iterator, List
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from src.adapters.chunking.streaming import iter_split_stream
 from src.domain.ports import IChunkingStrategy
 from src.domain.entities import Document, Chunk
 
@@ -10,7 +11,11 @@ class LangchainChunkingStrategy(IChunkingStrategy):
     Ensures Clean Architecture compliance and production-grade chunking for a single Document.
     """
 
+    # Streamed documents are split this many chunk sizes of text at a time.
+    STREAM_WINDOW_CHUNKS = 64
+
     def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+        self.chunk_size = chunk_size
         self._splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
@@ -22,13 +27,28 @@ class LangchainChunkingStrategy(IChunkingStrategy):
         Splits a single Document into Chunks using LangChain's splitter.
         This signature matches the IChunkingStrategy port (document: Document) -> List[Chunk].
         """
+        if document.is_streamed:
+            return list(self.chunk_stream(document))
         split_texts = self._splitter.split_text(document.content)
-        return [
-            Chunk(
-                id=f"{document.id}_chunk_{i}",
-                document_id=document.id,
-                content=text,
-                metadata={"source": document.metadata.get("source")},
-            )
-            for i, text in enumerate(split_texts)
-        ]
+        return [self._to_chunk(document, i, text) for i, text in enumerate(split_texts)]
+
+    def chunk_stream(self, document: Document) -> Iterator[Chunk]:
+        """
+        Yields chunks while reading the document; a streamed document is split a
+        window at a time and never held in memory whole.
+        """
+        split_texts = iter_split_stream(
+            document.iter_text(),
+            self._splitter.split_text,
+            window_chars=self.STREAM_WINDOW_CHUNKS * self.chunk_size,
+        )
+        for i, text in enumerate(split_texts):
+            yield self._to_chunk(document, i, text)
+
+    def _to_chunk(self, document: Document, i: int, text: str) -> Chunk:
+        return Chunk(
+            id=f"{document.id}_chunk_{i}",
+            document_id=document.id,
+            content=text,
+            metadata={"source": document.metadata.get("source")},
+        )
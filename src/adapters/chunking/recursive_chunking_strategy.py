@@ -0,0 +1,187 @@
+from collections import deque
+from typing import Deque, Iterator, List, Optional, Sequence, Tuple
+from src.domain.ports import IChunkingStrategy
+from src.domain.entities import Document, Chunk
+
+DEFAULT_SEPARATORS = ("\n\n", "\n", " ", "")
+
+# A half-open [start, end) character range of the text being split.
+Span = Tuple[int, int]
+
+
+class RecursiveChunkingStrategy(IChunkingStrategy):
+    """
+    Dependency-free recursive character splitter, producing the same chunks as
+    LangChain's RecursiveCharacterTextSplitter (separators kept at the start of each
+    piece, whitespace stripped, len() as the length function).
+
+    The text is split into (start, end) offsets instead of substrings: finding
+    separators, recursing into oversized pieces, merging and stripping all work on
+    offsets, and each chunk's text is sliced once at the end. Every chunk records
+    its span of the document in metadata as `start_index` / `end_index`, so
+    text[start_index:end_index] == chunk.content.
+    """
+
+    # Streamed documents are split this many chunk sizes of text at a time.
+    STREAM_WINDOW_CHUNKS = 64
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        separators: Optional[Sequence[str]] = None,
+    ):
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be > 0, got {chunk_size}")
+        if not 0 <= chunk_overlap <= chunk_size:
+            raise ValueError(
+                f"chunk_overlap must be between 0 and chunk_size, got {chunk_overlap}"
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators or DEFAULT_SEPARATORS)
+
+    def split_spans(self, text: str) -> List[Span]:
+        """Returns the [start, end) span of every chunk of `text`, in order."""
+        spans: List[Span] = []
+        self._split(text, 0, len(text), self.separators, spans)
+        return spans
+
+    def split_text(self, text: str) -> List[str]:
+        return [text[start:end] for start, end in self.split_spans(text)]
+
+    def chunk(self, document: Document) -> List[Chunk]:
+        if document.is_streamed:
+            return list(self.chunk_stream(document))
+        return [
+            self._to_chunk(document, i, document.content, span)
+            for i, span in enumerate(self.split_spans(document.content))
+        ]
+
+    def chunk_stream(self, document: Document) -> Iterator[Chunk]:
+        """
+        Yields chunks while reading the document. A streamed document is split a
+        window at a time, as iter_split_stream does; since the last chunk's offset
+        is known, the window restarts exactly where that chunk begins, and spans stay
+        relative to the whole document.
+        """
+        window_chars = self.STREAM_WINDOW_CHUNKS * self.chunk_size
+        buffer, base, i = "", 0, 0
+        for segment in document.iter_text():
+            buffer += segment
+            if len(buffer) < window_chars:
+                continue
+            spans = self.split_spans(buffer)
+            if len(spans) < 2:
+                continue
+            for span in spans[:-1]:
+                yield self._to_chunk(document, i, buffer, span, base)
+                i += 1
+            cut = spans[-1][0]
+            buffer, base = buffer[cut:], base + cut
+        for span in self.split_spans(buffer):
+            yield self._to_chunk(document, i, buffer, span, base)
+            i += 1
+
+    def _split(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        separators: Sequence[str],
+        out: List[Span],
+    ) -> None:
+        """Appends the chunk spans of text[start:end] to `out`."""
+        separator, remaining = separators[-1], ()
+        for i, candidate in enumerate(separators):
+            if not candidate:
+                separator = candidate
+                break
+            if text.find(candidate, start, end) != -1:
+                separator, remaining = candidate, separators[i + 1 :]
+                break
+
+        good: List[Span] = []
+        for piece in split_keeping_separator(text, start, end, separator):
+            if piece[1] - piece[0] < self.chunk_size:
+                good.append(piece)
+                continue
+            if good:
+                self._merge(text, good, out)
+                good = []
+            if remaining:
+                self._split(text, piece[0], piece[1], remaining, out)
+            else:
+                out.append(piece)  # Unsplittable; kept whole and unstripped
+        if good:
+            self._merge(text, good, out)
+
+    def _merge(self, text: str, pieces: List[Span], out: List[Span]) -> None:
+        """
+        Packs consecutive pieces into chunks of at most chunk_size characters, each
+        starting with up to chunk_overlap characters of the previous one. Pieces are
+        adjacent in the text, so a chunk is simply first piece start..last piece end.
+        """
+        current: Deque[Span] = deque()
+        total = 0
+        for start, end in pieces:
+            length = end - start
+            if total + length > self.chunk_size and current:
+                append_stripped(text, current[0][0], current[-1][1], out)
+                while total > self.chunk_overlap or (
+                    total + length > self.chunk_size and total > 0
+                ):
+                    first_start, first_end = current.popleft()
+                    total -= first_end - first_start
+            current.append((start, end))
+            total += length
+        if current:
+            append_stripped(text, current[0][0], current[-1][1], out)
+
+    def _to_chunk(
+        self, document: Document, i: int, text: str, span: Span, base: int = 0
+    ) -> Chunk:
+        start, end = span
+        return Chunk(
+            id=f"{document.id}_chunk_{i}",
+            document_id=document.id,
+            content=text[start:end],
+            metadata={
+                "source": document.metadata.get("source"),
+                "start_index": base + start,
+                "end_index": base + end,
+            },
+        )
+
+
+def split_keeping_separator(
+    text: str, start: int, end: int, separator: str
+) -> Iterator[Span]:
+    """
+    Splits text[start:end] before every occurrence of `separator`, which stays at the
+    start of the following piece; an empty separator splits into characters. Empty
+    pieces are skipped.
+    """
+    if not separator:
+        for pos in range(start, end):
+            yield pos, pos + 1
+        return
+    step = len(separator)
+    piece_start = start
+    pos = text.find(separator, start, end)
+    while pos != -1:
+        if pos > piece_start:
+            yield piece_start, pos
+        piece_start = pos
+        pos = text.find(separator, pos + step, end)
+    if end > piece_start:
+        yield piece_start, end
+
+
+def append_stripped(text: str, start: int, end: int, out: List[Span]) -> None:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if end > start:
+        out.append((start, end))
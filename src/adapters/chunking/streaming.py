@@ -0,0 +1,35 @@
+from typing import Callable, Iterable, Iterator, List
+
+
+def iter_split_stream(
+    segments: Iterable[str],
+    split_text: Callable[[str], List[str]],
+    window_chars: int,
+) -> Iterator[str]:
+    """
+    Applies a whole-text splitter to a stream of text segments with bounded memory.
+
+    Text is buffered until it reaches `window_chars`, then split. Every piece but the
+    last is emitted; the last may be cut short by the window edge, so the buffer
+    restarts where it begins and it is split again with the following text. Away from
+    window edges the pieces are exactly those of splitting the whole text at once.
+    """
+    buffer = ""
+    for segment in segments:
+        buffer += segment
+        if len(buffer) < window_chars:
+            continue
+        pieces = split_text(buffer)
+        if len(pieces) < 2:
+            continue
+        tail = pieces[-1]
+        cut = buffer.rfind(tail)
+        if cut <= 0:
+            # The tail cannot be located (or is the whole buffer): flush everything.
+            yield from pieces
+            buffer = ""
+            continue
+        yield from pieces[:-1]
+        buffer = buffer[cut:]
+    if buffer:
+        yield from split_text(buffer)
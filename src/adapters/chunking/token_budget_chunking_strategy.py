@@ -0,0 +1,271 @@
+import ast
+import os
+import re
+from collections import deque
+from typing import Deque, Iterator, List, Optional, Sequence, Tuple, Union
+from src.adapters.chunking.recursive_chunking_strategy import (
+    DEFAULT_SEPARATORS,
+    Span,
+    append_stripped,
+    split_keeping_separator,
+)
+from src.adapters.chunking.token_counting import TokenCounter
+from src.domain.ports import IChunkingStrategy
+from src.domain.entities import Document, Chunk
+
+# Documents with these extensions are split along their syntax tree.
+PYTHON_EXTENSIONS = (".py", ".pyi")
+
+# No plausible tokenizer averages more characters per token than this, so longer
+# spans are over budget without being tokenized.
+MAX_CHARS_PER_TOKEN = 32
+
+# Nodes whose line range forms a unit: statements, except clauses and match cases.
+_Unit = Union[ast.stmt, ast.excepthandler, ast.match_case]
+
+
+class TokenBudgetChunkingStrategy(IChunkingStrategy):
+    """
+    Packs a document into chunks of at most `max_tokens` model tokens (see
+    TokenCounter), so chunks are as full as the embedding model allows instead of
+    being sized in characters, which over- or under-shoots badly on code.
+
+    The text is first cut into units that must not be split unless they alone exceed
+    the budget. Python sources are cut along their syntax tree: top-level statements,
+    with the comments and blank lines above each kept with it. An oversized class or
+    function is cut into its body's statements, with its header kept on the first.
+    Other text, and code that does not parse, is cut by paragraph, line and word as
+    the recursive splitter does. Consecutive units are then packed greedily to the
+    budget, carrying up to `overlap_tokens` of trailing units into the next chunk.
+
+    🟦 NOTE: A chunk's size is the sum of its units' counts. Tokenizers split words at
+    whitespace and punctuation before merging, so in practice the sum equals the count
+    of the joined text, or exceeds it for units cut mid-word.
+    Each chunk records `tokens`, `start_index` and `end_index` in its metadata.
+    """
+
+    # Streamed documents are split in windows of this many characters per token of
+    # budget: about 64 chunks' worth at a generous 8 characters per token.
+    STREAM_WINDOW_CHARS_PER_TOKEN = 512
+
+    def __init__(
+        self,
+        max_tokens: int = 512,
+        overlap_tokens: int = 0,
+        tokenizer: Optional[str] = None,
+    ):
+        if max_tokens <= 0:
+            raise ValueError(f"max_tokens must be > 0, got {max_tokens}")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError(
+                f"overlap_tokens must be between 0 and max_tokens, got {overlap_tokens}"
+            )
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.counter = TokenCounter(tokenizer)
+
+    def split_spans(self, text: str, python: bool = False) -> List[Span]:
+        """Returns the [start, end) span of every chunk of `text`, in order."""
+        pieces: List[Span] = []
+        units = _python_units(text) if python else None
+        if units is None:
+            self._fit_text(text, 0, len(text), DEFAULT_SEPARATORS, pieces)
+        else:
+            lines = _line_starts(text)
+            for start, end, node in units(lines):
+                self._fit_code(text, start, end, node, lines, pieces)
+        return self._pack(text, pieces)
+
+    def chunk(self, document: Document) -> List[Chunk]:
+        if document.is_streamed:
+            return list(self.chunk_stream(document))
+        text = document.content
+        spans = self.split_spans(text, python=_is_python(document))
+        return [self._to_chunk(document, i, text, span) for i, span in enumerate(spans)]
+
+    def chunk_stream(self, document: Document) -> Iterator[Chunk]:
+        """
+        Streamed documents are split as plain text a window at a time (a window is
+        rarely a complete module), restarting each window at its last chunk.
+        """
+        if not document.is_streamed:
+            yield from self.chunk(document)
+            return
+        window_chars = self.STREAM_WINDOW_CHARS_PER_TOKEN * self.max_tokens
+        buffer, base, i = "", 0, 0
+        for segment in document.iter_text():
+            buffer += segment
+            if len(buffer) < window_chars:
+                continue
+            spans = self.split_spans(buffer)
+            if len(spans) < 2:
+                continue
+            for span in spans[:-1]:
+                yield self._to_chunk(document, i, buffer, span, base)
+                i += 1
+            cut = spans[-1][0]
+            buffer, base = buffer[cut:], base + cut
+        for span in self.split_spans(buffer):
+            yield self._to_chunk(document, i, buffer, span, base)
+            i += 1
+
+    def _tokens(self, text: str, start: int, end: int) -> int:
+        return self.counter.count(text[start:end])
+
+    def _fits(self, text: str, start: int, end: int) -> bool:
+        return (
+            end - start <= self.max_tokens * MAX_CHARS_PER_TOKEN
+            and self._tokens(text, start, end) <= self.max_tokens
+        )
+
+    def _fit_code(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        node: Optional[_Unit],
+        lines: List[int],
+        out: List[Span],
+    ) -> None:
+        """Appends text[start:end] as one piece, or cut along the node's children."""
+        if self._fits(text, start, end):
+            out.append((start, end))
+            return
+        children = _child_units(node) if node is not None else []
+        if not children:
+            self._fit_text(text, start, end, DEFAULT_SEPARATORS[1:], out)
+            return
+        for child_start, child_end, child in _unit_spans(children, start, end, lines):
+            self._fit_code(text, child_start, child_end, child, lines, out)
+
+    def _fit_text(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        separators: Sequence[str],
+        out: List[Span],
+    ) -> None:
+        """Appends text[start:end] as one piece, or cut at the coarsest separator."""
+        if self._fits(text, start, end):
+            out.append((start, end))
+            return
+        separator, remaining = separators[-1], ()
+        for i, candidate in enumerate(separators):
+            if not candidate or text.find(candidate, start, end) != -1:
+                separator, remaining = candidate, separators[i + 1 :]
+                break
+        for piece_start, piece_end in split_keeping_separator(
+            text, start, end, separator
+        ):
+            if remaining:
+                self._fit_text(text, piece_start, piece_end, remaining, out)
+            else:
+                out.append((piece_start, piece_end))  # A single character
+
+    def _pack(self, text: str, pieces: List[Span]) -> List[Span]:
+        """Greedily packs adjacent pieces into chunks of at most max_tokens."""
+        out: List[Span] = []
+        current: Deque[Tuple[int, int, int]] = deque()
+        total = 0
+        for start, end in pieces:
+            tokens = self._tokens(text, start, end)
+            if total + tokens > self.max_tokens and current:
+                append_stripped(text, current[0][0], current[-1][1], out)
+                while total > self.overlap_tokens or (
+                    total + tokens > self.max_tokens and total > 0
+                ):
+                    total -= current.popleft()[2]
+            current.append((start, end, tokens))
+            total += tokens
+        if current:
+            append_stripped(text, current[0][0], current[-1][1], out)
+        return out
+
+    def _to_chunk(
+        self, document: Document, i: int, text: str, span: Span, base: int = 0
+    ) -> Chunk:
+        start, end = span
+        content = text[start:end]
+        return Chunk(
+            id=f"{document.id}_chunk_{i}",
+            document_id=document.id,
+            content=content,
+            metadata={
+                "source": document.metadata.get("source"),
+                "start_index": base + start,
+                "end_index": base + end,
+                "tokens": self.counter.count(content),
+            },
+        )
+
+
+def _is_python(document: Document) -> bool:
+    location = document.source_location or document.metadata.get("source") or ""
+    return os.path.splitext(location)[1].lower() in PYTHON_EXTENSIONS
+
+
+def _python_units(text: str):
+    """Returns a function of the line offsets yielding top-level units, or None."""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return None
+    if not tree.body:
+        return None
+    return lambda lines: _unit_spans(tree.body, 0, len(text), lines)
+
+
+def _line_starts(text: str) -> List[int]:
+    """Offset of each line's first character; ast line numbers index this from 1."""
+    return [0] + [match.end() for match in re.finditer("\n", text)]
+
+
+def _first_line(node: _Unit) -> int:
+    if isinstance(node, ast.match_case):
+        return node.pattern.lineno
+    decorators = getattr(node, "decorator_list", None) or []
+    return min([node.lineno] + [d.lineno for d in decorators])
+
+
+def _child_units(node: _Unit) -> List[_Unit]:
+    children = [
+        child
+        for child in ast.iter_child_nodes(node)
+        if isinstance(child, (ast.stmt, ast.excepthandler, ast.match_case))
+    ]
+    if len(children) > 1 and _is_docstring(children[0]):
+        # A docstring is part of the header, which stays with the first statement.
+        return children[1:]
+    return children
+
+
+def _is_docstring(node: _Unit) -> bool:
+    return (
+        isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Constant)
+        and isinstance(node.value.value, str)
+    )
+
+
+def _unit_spans(
+    nodes: Sequence[_Unit], start: int, end: int, lines: List[int]
+) -> Iterator[Tuple[int, int, Optional[_Unit]]]:
+    """
+    Cuts text[start:end] at the line each node begins on. Whatever precedes a node
+    (comments, blank lines, or the parent's header for the first) stays with it, and
+    the tail after the last node stays with that one. Nodes sharing a line are kept
+    together, as an unsplittable unit.
+    """
+    bounds: List[Tuple[int, Optional[_Unit]]] = []
+    for node in nodes:
+        offset = lines[_first_line(node) - 1]
+        if not bounds:
+            bounds.append((start, node))
+        elif offset > bounds[-1][0]:
+            bounds.append((offset, node))
+        else:
+            bounds[-1] = (bounds[-1][0], None)
+    for i, (unit_start, node) in enumerate(bounds):
+        unit_end = bounds[i + 1][0] if i + 1 < len(bounds) else end
+        yield unit_start, unit_end, node
@@ -0,0 +1,70 @@
+import functools
+import logging
+import os
+import re
+from typing import Any, Optional
+
+# Approximates a BPE tokenizer: a word costs one token per ~4 characters, and every
+# punctuation or operator character costs one token, which is what inflates code.
+_APPROX_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]")
+
+# Distinct texts whose token counts are remembered per process, and the longest text
+# cached; whole documents are counted once while splitting and not worth keeping.
+COUNT_CACHE_SIZE = 1 << 14
+MAX_CACHED_CHARS = 16 << 10
+
+
+class TokenCounter:
+    """
+    Counts tokens with a Hugging Face fast tokenizer (the `tokenizers` package, which
+    sentence-transformers already depends on), or approximates them when no tokenizer
+    is configured or it cannot be loaded.
+
+    `tokenizer` is a hub name (e.g. "sentence-transformers/all-MiniLM-L6-v2") or a
+    path to a tokenizer.json. It is loaded once per process, and counts are cached
+    per text, so re-measuring the same unit while packing chunks is free. Only the
+    name is pickled, so a counter can be shipped to chunking worker processes.
+    """
+
+    def __init__(self, tokenizer: Optional[str] = None):
+        self.tokenizer = tokenizer
+        if tokenizer and _load_tokenizer(tokenizer) is None:
+            self.tokenizer = None
+
+    @property
+    def exact(self) -> bool:
+        return self.tokenizer is not None
+
+    def count(self, text: str) -> int:
+        if len(text) > MAX_CACHED_CHARS:
+            return _count_tokens.__wrapped__(self.tokenizer, text)
+        return _count_tokens(self.tokenizer, text)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_tokenizer(name: str) -> Optional[Any]:
+    try:
+        from tokenizers import Tokenizer  # type: ignore
+    except ImportError:
+        logging.warning(
+            f"'tokenizers' is not installed; approximating token counts for '{name}'."
+        )
+        return None
+    try:
+        if os.path.isfile(name):
+            return Tokenizer.from_file(name)
+        return Tokenizer.from_pretrained(name)
+    except Exception as e:
+        logging.warning(
+            f"Failed to load tokenizer '{name}' ({e}); approximating token counts."
+        )
+        return None
+
+
+@functools.lru_cache(maxsize=COUNT_CACHE_SIZE)
+def _count_tokens(name: Optional[str], text: str) -> int:
+    if name is not None:
+        tokenizer = _load_tokenizer(name)
+        if tokenizer is not None:
+            return len(tokenizer.encode(text, add_special_tokens=False).ids)
+    return len(_APPROX_TOKEN_RE.findall(text))
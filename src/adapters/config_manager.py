@@ -5,6 +5,19 @@ from typing import Any, Dict, Optional
 import boto3  # type: ignore
 from pydantic import BaseModel
 
+from src.application.metrics import REGISTRY
+
+CONFIG_INFO = REGISTRY.gauge(
+    "rag_config_info",
+    "Always 1, labelled with the loaded config version.",
+    ["env", "version"],
+)
+CONFIG_LOAD_FAILURES = REGISTRY.counter(
+    "rag_config_load_failures_total",
+    "Config loads from SSM that failed or did not validate.",
+    ["env"],
+)
+
 
 # --- Pydantic schema for config validation ---
 class AppConfig(BaseModel):
@@ -18,6 +31,8 @@ class AppConfig(BaseModel):
     data_source: Dict[str, Any]
     embedding_service: Dict[str, Any]
     vector_repository: Dict[str, Any]
+    ingestion: Dict[str, Any] = {}
+    query: Dict[str, Any] = {}
 
 
 class ConfigManager:
@@ -46,22 +61,26 @@ class ConfigManager:
             self.last_version = str(response["Parameter"].get("Version", "unknown"))
             data = json.loads(raw)
             self._config = AppConfig(**data)
-            print(f'[METRIC] config_version{{env="{self.env}"}} {self.last_version}')
+            self._record_version(self.last_version)
             return self._config
         except Exception as e:
-            print(f'[METRIC] config_validation_failure{{env="{self.env}"}} 1')
+            CONFIG_LOAD_FAILURES.labels(self.env).inc()
             # Fallback to local config for development
             local_path = f"config/{self.env}.json"
             if os.path.exists(local_path):
                 with open(local_path, "r") as f:
                     data = json.load(f)
                 self._config = AppConfig(**data)
-                print(f'[METRIC] config_version{{env="{self.env}"}} "local-dev"')
+                self._record_version("local-dev")
                 return self._config
             raise RuntimeError(
                 f"Failed to load or validate config from {self.ssm_param} and no local fallback found: {e}"
             )
 
+    def _record_version(self, version: str) -> None:
+        CONFIG_INFO.clear()
+        CONFIG_INFO.labels(self.env, version).set(1)
+
     @property
     def config(self) -> AppConfig:
         if self._config is None:
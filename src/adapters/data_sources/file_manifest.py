@@ -0,0 +1,137 @@
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+MANIFEST_VERSION = 1
+HASH_BLOCK_BYTES = 1 << 20
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _matches(rel_path: str, name: str, patterns: Sequence[str]) -> bool:
+    # Patterns without a "/" match the name at any depth ("*.md", ".git");
+    # patterns with one match the path relative to the root ("docs/*.md").
+    return any(
+        fnmatch.fnmatchcase(rel_path if "/" in pattern else name, pattern)
+        for pattern in patterns
+    )
+
+
+def walk_files(
+    root: str, include: Sequence[str], exclude: Sequence[str]
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Recursively yields (POSIX path relative to root, stat) for files matching an
+    include pattern and no exclude pattern. Excluded directories are not descended.
+    """
+    stack = [("", root)]
+    while stack:
+        rel_dir, directory = stack.pop()
+        try:
+            with os.scandir(directory) as scan:
+                entries = sorted(scan, key=lambda e: e.name)
+        except OSError as e:
+            logging.error(f"Error listing files in {directory}: {e}")
+            continue
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}{entry.name}"
+            if _matches(rel_path, entry.name, exclude):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((f"{rel_path}/", entry.path))
+            elif entry.is_file() and _matches(rel_path, entry.name, include):
+                yield rel_path, entry.stat()
+        # Reversed so the stack pops directories in sorted order.
+        stack.extend(reversed(subdirs))
+
+
+class FileManifest:
+    """
+    Persisted (path -> size, mtime_ns, sha256) record of the files last seen under a
+    root. A file whose size and mtime_ns are unchanged keeps its recorded hash without
+    being read; only new or touched files are hashed.
+    🟨 CAUTION: Like git's index, this trusts mtime_ns: an in-place rewrite that keeps
+    both the size and the mtime (e.g. restored with `touch -r`) is not noticed.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, FileEntry] = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.entries = {
+                        rel: FileEntry(*fields) for rel, fields in data["files"].items()
+                    }
+            except (OSError, ValueError, TypeError) as e:
+                # 🟦 NOTE: A bad manifest only costs one full re-hash, so start empty.
+                logging.warning(f"Ignoring unreadable file manifest {path}: {e}")
+
+    def refresh(
+        self, root: str, include: Sequence[str], exclude: Sequence[str]
+    ) -> Tuple[Dict[str, FileEntry], int]:
+        """
+        Walks root and returns ({relative path: entry}, number of files hashed),
+        forgetting files that disappeared.
+        """
+        current: Dict[str, FileEntry] = {}
+        hashed = 0
+        for rel_path, stat in walk_files(root, include, exclude):
+            entry = self.entries.get(rel_path)
+            if (
+                entry is None
+                or entry.size != stat.st_size
+                or entry.mtime_ns != stat.st_mtime_ns
+            ):
+                full_path = os.path.join(root, rel_path)
+                entry = FileEntry(stat.st_size, stat.st_mtime_ns, hash_file(full_path))
+                hashed += 1
+                self._dirty = True
+            current[rel_path] = entry
+        if len(current) != len(self.entries):
+            self._dirty = True
+        self.entries = current
+        return current, hashed
+
+    def save(self) -> None:
+        """Writes the manifest atomically, if anything changed since the last save."""
+        if not self.path or not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "files": {
+                        rel: [e.size, e.mtime_ns, e.sha256]
+                        for rel, e in self.entries.items()
+                    },
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -1,55 +1,139 @@
+import hashlib
 import os
 import logging
-from typing import List
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from src.adapters.data_sources.file_manifest import FileManifest, hash_file
+from src.adapters.data_sources.streaming_reads import (
+    DEFAULT_STREAM_THRESHOLD_BYTES,
+    iter_decoded,
+    iter_mmap_blocks,
+)
 from src.domain.entities.document import Document
+from src.domain.entities.sync_plan import SyncPlan
 from src.domain.ports import IDataSource
 
+DEFAULT_EXCLUDE = (".git", ".hg", ".svn", "__pycache__", "node_modules", ".DS_Store")
+
+# Hex digits of the content hash carried in document ids.
+DOC_ID_HASH_CHARS = 16
+
 
 class FileSystemDataSource(IDataSource):
     """
-    Loads documents from a local file system directory.
+    Loads documents from a local file system directory tree.
     This adapter is suitable for development and processing local data.
+
+    Files are found recursively and filtered by glob patterns. A document id is
+    "<path relative to root>#<content hash prefix>", so an edited file gets a new id
+    and a sync replaces it, just as S3 ETags do. Hashes come from a FileManifest: only
+    files whose size or mtime changed since the last scan are read.
+    Files of at least `stream_threshold_bytes` are returned as streamed documents,
+    decoded incrementally through mmap instead of read into one string.
     """
 
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        manifest_path: Optional[str] = None,
+        stream_threshold_bytes: int = DEFAULT_STREAM_THRESHOLD_BYTES,
+    ):
         self.path = path
+        self.stream_threshold_bytes = stream_threshold_bytes
+        self.include = list(include or ["*"])
+        self.exclude = list(DEFAULT_EXCLUDE if exclude is None else exclude)
+        if manifest_path:
+            # A manifest kept inside the tree must not be ingested itself.
+            rel = os.path.relpath(os.path.abspath(manifest_path), os.path.abspath(path))
+            if not rel.startswith(".."):
+                rel = rel.replace(os.sep, "/")
+                self.exclude += [rel, f"{rel}.tmp"]
+        self.manifest = FileManifest(manifest_path)
+        self._rel_path_by_id: Dict[str, str] = {}
         logging.info(f"Initialized FileSystemDataSource for path '{path}'")
 
+    def scan(self) -> Dict[str, str]:
+        """Walks the tree once and returns {document id: relative path}."""
+        start = time.perf_counter()
+        entries, hashed = self.manifest.refresh(self.path, self.include, self.exclude)
+        self.manifest.save()
+        self._rel_path_by_id = {
+            _doc_id(rel_path, entry.sha256): rel_path
+            for rel_path, entry in entries.items()
+        }
+        logging.info(
+            f"Scanned {len(entries)} files under {self.path} in "
+            f"{time.perf_counter() - start:.2f}s ({hashed} hashed)."
+        )
+        return self._rel_path_by_id
+
     def get_all_source_document_identifiers(self) -> List[str]:
-        """Returns a list of file names in the directory as document identifiers."""
-        try:
-            return [
-                f
-                for f in os.listdir(self.path)
-                if os.path.isfile(os.path.join(self.path, f))
-            ]
-        except Exception as e:
-            logging.error(f"Error listing files in {self.path}: {e}")
-            return []
+        """Returns the content-versioned ids of all matching files in the tree."""
+        return list(self.scan())
 
     def load_all(self) -> List[Document]:
         """Loads all documents from the file system."""
-        doc_ids = self.get_all_source_document_identifiers()
-        return [self.load(doc_id) for doc_id in doc_ids]
+        return list(self.iter_all())
 
     def load_new(self, last_known_ids: List[str]) -> List[Document]:
-        """Loads only new or modified documents by comparing file names."""
-        current_ids = set(self.get_all_source_document_identifiers())
-        new_ids = current_ids - set(last_known_ids)
-        return [self.load(doc_id) for doc_id in new_ids]
+        """Loads only new or modified documents by comparing content-versioned ids."""
+        return list(self.iter_new(last_known_ids))
+
+    def iter_all(self) -> Iterator[Document]:
+        """Yields one document at a time; a file is read only when it is consumed."""
+        for rel_path in self.scan().values():
+            yield self.load(rel_path)
+
+    def iter_new(self, last_known_ids: Iterable[str]) -> Iterator[Document]:
+        yield from self.iter_planned(self.plan_sync(last_known_ids))
+
+    def plan_sync(self, known_ids: Iterable[str]) -> SyncPlan:
+        return SyncPlan.compute(self.scan(), known_ids)
 
     def load(self, doc_id: str) -> Document:
-        """Loads a single document by its file name."""
-        file_path = os.path.join(self.path, doc_id)
+        """Loads a single document by its id or its path relative to the root."""
+        rel_path = self._rel_path_by_id.get(doc_id)
+        if rel_path is None:
+            rel_path = doc_id
+            if not os.path.isfile(os.path.join(self.path, rel_path)):
+                rel_path = doc_id.rpartition("#")[0] or doc_id
+        file_path = os.path.join(self.path, rel_path)
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            if os.path.getsize(file_path) >= self.stream_threshold_bytes:
+                return self._streamed_document(rel_path, file_path)
+            with open(file_path, "rb") as f:
+                raw = f.read()
             return Document(
-                id=doc_id,
-                content=content,
+                # The id reflects the bytes actually read, even if the file changed
+                # since the last scan.
+                id=_doc_id(rel_path, hashlib.sha256(raw).hexdigest()),
+                # Universal newlines, as text-mode open() gives.
+                content=raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n"),
                 source_location=file_path,
                 metadata={"source": file_path},
             )
         except Exception as e:
             logging.error(f"Error loading file {file_path}: {e}")
             raise
+
+    def _streamed_document(self, rel_path: str, file_path: str) -> Document:
+        stat = os.stat(file_path)
+        entry = self.manifest.entries.get(rel_path)
+        if entry and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            sha256 = entry.sha256
+        else:
+            sha256 = hash_file(file_path)  # Hashed in blocks, never fully in memory
+        logging.info(f"Streaming {file_path} ({stat.st_size / 1e6:.1f} MB) via mmap.")
+        return Document(
+            id=_doc_id(rel_path, sha256),
+            content="",
+            source_location=file_path,
+            metadata={"source": file_path},
+            stream=lambda: iter_decoded(iter_mmap_blocks(file_path)),
+        )
+
+
+def _doc_id(rel_path: str, sha256: str) -> str:
+    return f"{rel_path}#{sha256[:DOC_ID_HASH_CHARS]}"
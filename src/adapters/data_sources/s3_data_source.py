@@ -1,40 +1,101 @@
 import boto3  # type: ignore
 import logging
-from typing import List
+from typing import Any, Iterable, Iterator, List, Optional
+from botocore.config import Config  # type: ignore
 from botocore.exceptions import ClientError  # type: ignore
+from src.adapters.data_sources.s3_fetcher import ParallelS3Fetcher
+from src.adapters.data_sources.s3_listing import S3ListingSnapshot
+from src.adapters.data_sources.streaming_reads import (
+    DEFAULT_STREAM_THRESHOLD_BYTES,
+    iter_decoded,
+    iter_s3_blocks,
+)
 from src.domain.entities.document import Document
+from src.domain.entities.sync_plan import SyncPlan
 from src.domain.ports import IDataSource
 
 
 class S3DataSource(IDataSource):
-    """A data source that reads documents from an AWS S3 bucket."""
+    """
+    A data source that reads documents from an AWS S3 bucket.
+    Bulk loads fetch up to `max_workers` objects concurrently over one pooled client;
+    `ordered=False` yields documents as they arrive rather than in listing order.
+    Single-document loads resolve their id against a listing snapshot (see
+    S3ListingSnapshot) instead of re-listing the prefix on every call.
+    Objects of at least `stream_threshold_bytes` are not fetched up front; they
+    become streamed documents read through ranged GETs as they are chunked.
+    """
 
-    def __init__(self, bucket: str, prefix: str):
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str,
+        max_workers: int = 32,
+        ordered: bool = True,
+        listing_ttl_seconds: float = 300.0,
+        stream_threshold_bytes: int = DEFAULT_STREAM_THRESHOLD_BYTES,
+        client: Optional[Any] = None,
+    ):
         self.bucket = bucket
         self.prefix = prefix
-        self.s3_client = boto3.client("s3")
+        self.stream_threshold_bytes = stream_threshold_bytes
+        # 🟦 NOTE: botocore's pool defaults to 10 connections; without raising it,
+        # workers beyond the tenth queue for a connection instead of fetching.
+        self.s3_client = client or boto3.client(
+            "s3",
+            config=Config(
+                max_pool_connections=max_workers,
+                retries={"mode": "standard", "max_attempts": 3},
+            ),
+        )
+        self.fetcher = ParallelS3Fetcher(
+            self.s3_client, bucket, max_workers=max_workers, ordered=ordered
+        )
+        self.listing = S3ListingSnapshot(
+            self._paginate, ttl_seconds=listing_ttl_seconds
+        )
         logging.info(
             f"Initialized S3DataSource for bucket '{bucket}' and prefix '{prefix}'"
         )
 
+    def _paginate(self, start_after: Optional[str] = None) -> List[dict]:
+        params = {"Bucket": self.bucket, "Prefix": self.prefix}
+        if start_after:
+            params["StartAfter"] = start_after
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(**params)
+        return [obj for page in pages for obj in page.get("Contents", [])]
+
     def _list_objects(self) -> List[dict]:
         """Helper to list all objects under the configured prefix."""
         try:
-            paginator = self.s3_client.get_paginator("list_objects_v2")
-            pages = paginator.paginate(Bucket=self.bucket, Prefix=self.prefix)
-            return [obj for page in pages for obj in page.get("Contents", [])]
+            s3_objects = self._paginate()
         except ClientError as e:
             logging.error(
                 f"Error listing objects in s3://{self.bucket}/{self.prefix}: {e}"
             )
             return []
+        # Every full listing doubles as a fresh snapshot for point lookups.
+        self.listing.replace(s3_objects)
+        return s3_objects
 
     def _load_document_from_s3(self, s3_object: dict) -> Document:
         """Loads a single document's content from S3."""
         key = s3_object["Key"]
+        if self._is_large(s3_object):
+            return self._streamed_document(s3_object)
         try:
             response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-            content = response["Body"].read().decode("utf-8")
+            body = response["Body"].read()
+        except ClientError as e:
+            logging.error(f"Error reading object s3://{self.bucket}/{key}: {e}")
+            raise
+        return self._to_document(s3_object, body)
+
+    def _to_document(self, s3_object: dict, body: bytes) -> Document:
+        key = s3_object["Key"]
+        try:
+            content = body.decode("utf-8")
             doc_id = s3_object["ETag"].strip('"')
             return Document(
                 id=doc_id,
@@ -42,15 +103,44 @@ class S3DataSource(IDataSource):
                 source_location=f"s3://{self.bucket}/{key}",
                 metadata={"source": f"s3://{self.bucket}/{key}"},
             )
-        except ClientError as e:
-            logging.error(f"Error reading object s3://{self.bucket}/{key}: {e}")
-            raise
         except Exception as e:
             logging.error(
                 f"Failed to decode or process object s3://{self.bucket}/{key}: {e}"
             )
             raise
 
+    def _is_large(self, s3_object: dict) -> bool:
+        return s3_object.get("Size", 0) >= self.stream_threshold_bytes
+
+    def _streamed_document(self, s3_object: dict) -> Document:
+        key, size = s3_object["Key"], s3_object["Size"]
+        etag = s3_object.get("ETag", "")
+        logging.info(
+            f"Streaming s3://{self.bucket}/{key} ({size / 1e6:.1f} MB) in ranged reads."
+        )
+        return Document(
+            id=etag.strip('"'),
+            content="",
+            source_location=f"s3://{self.bucket}/{key}",
+            metadata={"source": f"s3://{self.bucket}/{key}"},
+            stream=lambda: iter_decoded(
+                iter_s3_blocks(self.s3_client, self.bucket, key, size, etag=etag)
+            ),
+        )
+
+    def _fetch_documents(self, s3_objects: Iterable[dict]) -> Iterator[Document]:
+        try:
+            for s3_object, body in self.fetcher.fetch(
+                s3_objects, skip_body=self._is_large
+            ):
+                if body is None:
+                    yield self._streamed_document(s3_object)
+                else:
+                    yield self._to_document(s3_object, body)
+        except ClientError as e:
+            logging.error(f"Error reading objects from s3://{self.bucket}: {e}")
+            raise
+
     def get_all_source_document_identifiers(self) -> List[str]:
         """Retrieves all document ETags from the S3 source."""
         logging.info("Fetching all document identifiers from source...")
@@ -59,40 +149,59 @@ class S3DataSource(IDataSource):
 
     def load_all(self) -> List[Document]:
         """Loads all documents from the S3 source."""
-        logging.info("Executing full load from S3...")
-        s3_objects = self._list_objects()
-        documents = [self._load_document_from_s3(obj) for obj in s3_objects if obj]
-        return documents
+        return list(self.iter_all())
 
     def load_new(self, last_known_ids: List[str]) -> List[Document]:
         """Loads only new or modified documents from S3 by comparing ETags."""
+        return list(self.iter_new(last_known_ids))
+
+    def iter_all(self) -> Iterator[Document]:
+        """Lists the prefix once, then fetches objects concurrently as they are consumed."""
+        logging.info("Executing full load from S3...")
+        s3_objects = self._list_objects()
+        yield from self._fetch_documents(obj for obj in s3_objects if obj)
+
+    def iter_new(self, last_known_ids: Iterable[str]) -> Iterator[Document]:
+        """Streaming counterpart of load_new(): yields each changed object as it is read."""
         logging.info("Executing incremental load from S3...")
+        known = set(last_known_ids)
         s3_objects = self._list_objects()
         new_or_modified_objects = [
-            obj
-            for obj in s3_objects
-            if obj.get("ETag", "").strip('"') not in last_known_ids
+            obj for obj in s3_objects if obj.get("ETag", "").strip('"') not in known
         ]
         if not new_or_modified_objects:
             logging.info("No new or modified S3 objects found.")
-            return []
+            return
         logging.info(
             f"Found {len(new_or_modified_objects)} new or modified S3 objects to process."
         )
-        documents = [
-            self._load_document_from_s3(obj) for obj in new_or_modified_objects if obj
-        ]
-        return documents
+        yield from self._fetch_documents(new_or_modified_objects)
+
+    def plan_sync(self, known_ids: Iterable[str]) -> SyncPlan:
+        """Diffs a single listing, keyed by ETag, against the ingested ids."""
+        s3_objects = self._list_objects()
+        return SyncPlan.compute(
+            {obj["ETag"].strip('"'): obj for obj in s3_objects if obj.get("ETag")},
+            known_ids,
+        )
+
+    def iter_planned(self, plan: SyncPlan) -> Iterator[Document]:
+        """Fetches the plan's listing entries directly; no further listing calls."""
+        yield from self._fetch_documents(plan.to_add.values())
 
     def load(self, doc_id: str) -> Document:
         """
         Loads a single document by its unique identifier (ETag or S3 key).
         This method is required by the IDataSource interface.
         """
-        # Try to find the object with the given ETag or key
-        s3_objects = self._list_objects()
-        for obj in s3_objects:
-            # Prefer ETag match, fallback to Key match
-            if obj.get("ETag", "").strip('"') == doc_id or obj.get("Key") == doc_id:
-                return self._load_document_from_s3(obj)
-        raise ValueError(f"Document with id or key '{doc_id}' not found in S3.")
+        try:
+            # ETag match first, then key match, as a dict lookup in the snapshot
+            s3_object = self.listing.find(doc_id)
+        except ClientError as e:
+            logging.error(
+                f"Error listing objects in s3://{self.bucket}/{self.prefix}: {e}"
+            )
+            raise
+        if s3_object is None:
+            raise ValueError(f"Document with id or key '{doc_id}' not found in S3.")
+        return self._load_document_from_s3(s3_object)
@@ -0,0 +1,174 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional, Set, Tuple
+
+from botocore.exceptions import (  # type: ignore
+    ClientError,
+    ConnectionError as BotoConnectionError,
+    IncompleteReadError,
+    ReadTimeoutError,
+    ResponseStreamingError,
+)
+
+# Server-side codes worth retrying; anything else (NoSuchKey, AccessDenied) fails fast.
+RETRYABLE_ERROR_CODES = {
+    "InternalError",
+    "RequestTimeout",
+    "ServiceUnavailable",
+    "SlowDown",
+    "ThrottlingException",
+    "503",
+    "500",
+}
+
+
+def is_retryable_fetch_error(error: Exception) -> bool:
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in RETRYABLE_ERROR_CODES
+    # Body reads fail outside botocore's own retry loop, so they are retried here.
+    return isinstance(
+        error,
+        (
+            BotoConnectionError,
+            IncompleteReadError,
+            ReadTimeoutError,
+            ResponseStreamingError,
+        ),
+    )
+
+
+@dataclass
+class FetchStats:
+    """Throughput of one parallel fetch."""
+
+    objects: int = 0
+    bytes: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.objects / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+class ParallelS3Fetcher:
+    """
+    Fetches many S3 objects concurrently over a shared connection pool.
+
+    At most `max_workers` GETs are in flight, and at most twice that many bodies are
+    buffered ahead of the consumer, so a slow consumer throttles fetching. Each
+    object is retried with jittered backoff on transient errors, including failures
+    while streaming the body. Results are yielded in input order (`ordered=True`) or
+    as they complete.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        bucket: str,
+        max_workers: int = 32,
+        max_retries: int = 4,
+        base_backoff_seconds: float = 0.1,
+        ordered: bool = True,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.client = client
+        self.bucket = bucket
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.ordered = ordered
+        self.sleep = sleep
+        self.last_stats = FetchStats()
+        self._retry_lock = threading.Lock()
+
+    def fetch(
+        self,
+        s3_objects: Iterable[dict],
+        skip_body: Optional[Callable[[dict], bool]] = None,
+    ) -> Iterator[Tuple[dict, Optional[bytes]]]:
+        """
+        Yields (listing entry, body bytes) for each object. Objects for which
+        `skip_body` is true are passed through in order with a body of None.
+        """
+        stats = FetchStats()
+        self.last_stats = stats
+        start = time.perf_counter()
+        window = 2 * self.max_workers
+        objects = iter(s3_objects)
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="s3-fetch"
+        ) as pool:
+            pending: Deque[Future] = deque()
+            try:
+                for obj in objects:
+                    pending.append(self._submit(pool, obj, stats, skip_body))
+                    if len(pending) >= window:
+                        break
+                while pending:
+                    if self.ordered:
+                        done = [pending.popleft()]
+                    else:
+                        finished: Set[Future] = wait(
+                            pending, return_when=FIRST_COMPLETED
+                        ).done
+                        done = [f for f in pending if f in finished]
+                        pending = deque(f for f in pending if f not in finished)
+                    for future in done:
+                        obj, body = future.result()
+                        if body is not None:
+                            stats.objects += 1
+                            stats.bytes += len(body)
+                        # Top the window back up before handing the body over.
+                        next_obj = next(objects, None)
+                        if next_obj is not None:
+                            pending.append(
+                                self._submit(pool, next_obj, stats, skip_body)
+                            )
+                        yield obj, body
+            finally:
+                for future in pending:
+                    future.cancel()
+                stats.seconds = time.perf_counter() - start
+        logging.info(
+            f"Fetched {stats.objects} objects ({stats.bytes / 1e6:.1f} MB) from "
+            f"s3://{self.bucket} in {stats.seconds:.2f}s: "
+            f"{stats.objects_per_second:.0f} objects/s, "
+            f"{stats.bytes_per_second / 1e6:.2f} MB/s, {stats.retries} retries."
+        )
+
+    def _submit(
+        self,
+        pool: ThreadPoolExecutor,
+        obj: dict,
+        stats: FetchStats,
+        skip_body: Optional[Callable[[dict], bool]],
+    ) -> Future:
+        if skip_body is not None and skip_body(obj):
+            future: Future = Future()
+            future.set_result((obj, None))
+            return future
+        return pool.submit(self._get, obj, stats)
+
+    def _get(self, obj: dict, stats: FetchStats) -> Tuple[dict, bytes]:
+        attempt = 0
+        while True:
+            try:
+                response = self.client.get_object(Bucket=self.bucket, Key=obj["Key"])
+                return obj, response["Body"].read()
+            except Exception as e:
+                if not is_retryable_fetch_error(e) or attempt >= self.max_retries:
+                    raise
+                with self._retry_lock:
+                    stats.retries += 1
+                self.sleep(random.uniform(0, self.base_backoff_seconds * 2**attempt))
+                attempt += 1
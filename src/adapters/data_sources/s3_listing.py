@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Lists the prefix, optionally only keys after the given one (S3 StartAfter).
+ListFn = Callable[[Optional[str]], List[dict]]
+
+
+class S3ListingSnapshot:
+    """
+    In-memory snapshot of a prefix listing, indexed by key and by ETag.
+
+    Lookups are dict hits. The snapshot is re-listed in full once it is older than
+    `ttl_seconds`; a lookup that misses first lists only the keys after the last one
+    seen (StartAfter), which finds newly appended objects in one cheap request, and
+    only then falls back to a full re-list (at most once per `min_relist_seconds`), which
+    also catches objects overwritten in place under a new ETag.
+    """
+
+    def __init__(
+        self,
+        list_fn: ListFn,
+        ttl_seconds: float = 300.0,
+        min_relist_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.list_fn = list_fn
+        self.ttl_seconds = ttl_seconds
+        self.min_relist_seconds = min_relist_seconds
+        self.clock = clock
+        self._by_key: Dict[str, dict] = {}
+        self._key_by_etag: Dict[str, str] = {}
+        self._max_key: Optional[str] = None
+        self._listed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def objects(self) -> List[dict]:
+        """All listed objects, refreshing first if the snapshot has expired."""
+        with self._lock:
+            if self._expired():
+                self._relist()
+            return list(self._by_key.values())
+
+    def replace(self, objects: Iterable[dict]) -> None:
+        """Installs a listing made elsewhere (e.g. by a bulk load) as the snapshot."""
+        with self._lock:
+            self._install(objects)
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._relist()
+
+    def find(self, doc_id: str) -> Optional[dict]:
+        """Returns the listing entry whose ETag or key is doc_id, or None."""
+        with self._lock:
+            if self._expired():
+                self._relist()
+            found = self._lookup(doc_id)
+            if found is not None:
+                return found
+            added = self._append_new()
+            if added:
+                found = self._lookup(doc_id)
+                if found is not None:
+                    return found
+            if self.clock() - self._listed_at >= self.min_relist_seconds:
+                self._relist()
+                return self._lookup(doc_id)
+            return None
+
+    def _expired(self) -> bool:
+        return (
+            self._listed_at is None
+            or self.clock() - self._listed_at >= self.ttl_seconds
+        )
+
+    def _lookup(self, doc_id: str) -> Optional[dict]:
+        key = self._key_by_etag.get(doc_id, doc_id)
+        return self._by_key.get(key)
+
+    def _relist(self) -> None:
+        start = time.perf_counter()
+        self._install(self.list_fn(None))
+        logging.info(
+            f"Listed {len(self._by_key)} S3 objects into the snapshot "
+            f"in {time.perf_counter() - start:.2f}s."
+        )
+
+    def _install(self, objects: Iterable[dict]) -> None:
+        self._by_key = {}
+        self._key_by_etag = {}
+        self._max_key = None
+        self._merge(objects)
+        self._listed_at = self.clock()
+
+    def _append_new(self) -> int:
+        before = len(self._by_key)
+        self._merge(self.list_fn(self._max_key))
+        return len(self._by_key) - before
+
+    def _merge(self, objects: Iterable[dict]) -> None:
+        for obj in objects:
+            key = obj["Key"]
+            previous = self._by_key.get(key)
+            if previous is not None:
+                self._key_by_etag.pop(_etag(previous), None)
+            self._by_key[key] = obj
+            etag = _etag(obj)
+            if etag:
+                self._key_by_etag[etag] = key
+            if self._max_key is None or key > self._max_key:
+                self._max_key = key
+
+
+def _etag(obj: dict) -> str:
+    return obj.get("ETag", "").strip('"')
@@ -0,0 +1,69 @@
+import codecs
+import mmap
+from typing import Any, Iterable, Iterator
+
+# Documents at least this large are streamed rather than read into one string.
+DEFAULT_STREAM_THRESHOLD_BYTES = 16 << 20
+
+# Bytes decoded per step: one mmap slice locally, one ranged GET on S3.
+STREAM_BLOCK_BYTES = 1 << 20
+S3_RANGE_BYTES = 8 << 20
+
+
+def iter_decoded(blocks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Incrementally decodes UTF-8 blocks with universal newlines, as text-mode open()
+    does. Multi-byte characters and CRLF pairs split across blocks are carried over.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    carry = ""
+    for block in blocks:
+        text = carry + decoder.decode(block)
+        # A trailing CR may be the first half of a CRLF that ends in the next block.
+        carry = "\r" if text.endswith("\r") else ""
+        text = text[: len(text) - len(carry)]
+        if text:
+            yield _universal_newlines(text)
+    text = carry + decoder.decode(b"", final=True)
+    if text:
+        yield _universal_newlines(text)
+
+
+def _universal_newlines(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def iter_mmap_blocks(
+    path: str, block_bytes: int = STREAM_BLOCK_BYTES
+) -> Iterator[bytes]:
+    """Yields a file's bytes in blocks through a read-only memory map."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), block_bytes):
+                yield mapped[start : start + block_bytes]
+
+
+def iter_s3_blocks(
+    client: Any,
+    bucket: str,
+    key: str,
+    size: int,
+    range_bytes: int = S3_RANGE_BYTES,
+    etag: str = "",
+) -> Iterator[bytes]:
+    """
+    Yields an object's bytes via ranged GETs, one range in memory at a time.
+    With an ETag, IfMatch makes S3 fail the read if the object is overwritten midway.
+    """
+    for start in range(0, size, range_bytes):
+        params = {
+            "Bucket": bucket,
+            "Key": key,
+            "Range": f"bytes={start}-{min(start + range_bytes, size) - 1}",
+        }
+        if etag:
+            params["IfMatch"] = etag
+        response = client.get_object(**params)
+        body = response["Body"]
+        for block in iter(lambda: body.read(STREAM_BLOCK_BYTES), b""):
+            yield block
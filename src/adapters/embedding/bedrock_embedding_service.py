@@ -2,39 +2,134 @@ import boto3  # type: ignore
 import json
 import logging
 import numpy as np
-from typing import List
+from botocore.config import Config  # type: ignore
+from botocore.exceptions import (  # type: ignore
+    ClientError,
+    ConnectionError as BotocoreConnectionError,
+    HTTPClientError,
+)
+from typing import Any, List, Optional
+from src.adapters.embedding.concurrent_embedding import (
+    ConcurrentEmbedder,
+    EmbeddingRunStats,
+    log_run_stats,
+)
 from src.domain.ports import IEmbeddingService
 from src.domain.entities import Chunk
 
+# Bedrock error codes that mean "slow down" rather than "this request is bad".
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
+
+# Server-side failures worth retrying; botocore's own retries are off (see below).
+TRANSIENT_ERROR_CODES = {
+    "InternalServerException",
+    "InternalFailure",
+    "ServiceFailure",
+}
+
+
+def is_throttling_error(error: Exception) -> bool:
+    return (
+        isinstance(error, ClientError)
+        and error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+    )
+
+
+def is_transient_error(error: Exception) -> bool:
+    """5xx responses, failed or dropped connections and timeouts (not throttles)."""
+    # EndpointConnectionError / ConnectTimeoutError, ConnectionClosedError /
+    # ReadTimeoutError: what botocore's standard retry mode retries.
+    if isinstance(error, (BotocoreConnectionError, HTTPClientError)):
+        return True
+    if not isinstance(error, ClientError) or is_throttling_error(error):
+        return False
+    status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+    code = error.response.get("Error", {}).get("Code")
+    return code in TRANSIENT_ERROR_CODES or status >= 500
+
 
 class BedrockEmbeddingService(IEmbeddingService):
     """
     An embedding service that uses AWS Bedrock to generate vector embeddings.
     This is the primary, production-grade implementation.
+    Titan embeds one text per request, so many requests are kept in flight at once;
+    concurrency adapts to Bedrock throttling (see ConcurrentEmbedder).
     """
 
-    def __init__(self, aws_region: str, model_id: str = "amazon.titan-embed-text-v1"):
+    def __init__(
+        self,
+        aws_region: str,
+        model_id: str = "amazon.titan-embed-text-v1",
+        max_concurrency: int = 16,
+        max_retries: int = 8,
+        client: Optional[Any] = None,
+    ):
         self.model_id = model_id
-        self.bedrock_runtime = boto3.client(
-            service_name="bedrock-runtime", region_name=aws_region
+        # 🟦 NOTE: `client` lets tests and local runs inject a stub bedrock-runtime client.
+        self.bedrock_runtime = client or boto3.client(
+            service_name="bedrock-runtime",
+            region_name=aws_region,
+            # One pooled connection per in-flight request. Retries are ours (below),
+            # for throttles and transient errors alike, so throttles can drive AIMD.
+            config=Config(
+                max_pool_connections=max_concurrency,
+                retries={"mode": "standard", "max_attempts": 1},
+            ),
         )  # type: ignore
+        self.embedder = ConcurrentEmbedder(
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            is_throttle=is_throttling_error,
+            is_transient=is_transient_error,
+        )
+        self.last_run_stats: Optional[EmbeddingRunStats] = None
         logging.info(
             f"Initialized BedrockEmbeddingService with model: {self.model_id} in region: {aws_region}"
         )
 
-    def embed_chunks(self, chunks: List[Chunk]) -> None:
+    def embed_chunks(
+        self, chunks: List[Chunk], out: Optional[np.ndarray] = None
+    ) -> None:
         """
         Generates embeddings for a list of chunks in-place using AWS Bedrock.
+        With `out`, each embedding is written into the caller's buffer row instead.
         """
-        for chunk in chunks:
-            if chunk.content:
-                chunk.embedding = self._get_embedding(chunk.content)
+        rows = [i for i, chunk in enumerate(chunks) if chunk.content]
+        embeddings = self._embed_concurrently([chunks[i].content for i in rows])
+        for i, embedding in zip(rows, embeddings):
+            if out is not None:
+                out[i] = embedding
+            else:
+                chunks[i].embedding = embedding
 
     def embed_query(self, query: str) -> np.ndarray:
         """
-        Generates an embedding for a single query string.
+        Generates an embedding for a single query string, with the same retries.
+        """
+        embeddings, _ = self.embedder.run([query], self._get_embedding)
+        return embeddings[0]
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Generates embeddings for many query strings with concurrent requests.
         """
-        return self._get_embedding(query)
+        if not queries:
+            return np.empty((0, self.get_dimension()), dtype=np.float32)
+        return np.vstack(self._embed_concurrently(queries))
+
+    def _embed_concurrently(self, texts: List[str]) -> List[np.ndarray]:
+        if not texts:
+            return []
+        embeddings, stats = self.embedder.run(texts, self._get_embedding)
+        self.last_run_stats = stats
+        log_run_stats(f"Bedrock {self.model_id}", stats)
+        return embeddings
 
     def _get_embedding(self, text: str) -> np.ndarray:
         """Invokes the Bedrock model to get an embedding for a single text."""
@@ -49,7 +144,10 @@ class BedrockEmbeddingService(IEmbeddingService):
             response_body = json.loads(response.get("body").read())
             return np.array(response_body.get("embedding"), dtype=np.float32)
         except Exception as e:
-            logging.error(f"Bedrock embedding failed for model {self.model_id}: {e}")
+            if not is_throttling_error(e) and not is_transient_error(e):
+                logging.error(
+                    f"Bedrock embedding failed for model {self.model_id}: {e}"
+                )
             raise
 
     def get_dimension(self) -> int:
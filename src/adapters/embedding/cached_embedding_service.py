@@ -0,0 +1,87 @@
+import logging
+from typing import List, Optional
+
+import numpy as np
+
+from src.adapters.embedding.embedding_cache import CacheStats, EmbeddingCache, cache_key
+from src.domain.entities import Chunk
+from src.domain.ports import IEmbeddingService
+
+
+class CachedEmbeddingService(IEmbeddingService):
+    """
+    Wraps any embedding service with a content-addressed cache.
+    Vectors are keyed by (model id, normalized text), so re-ingesting unchanged or
+    duplicated content, or repeating a query, never reaches the wrapped model.
+    """
+
+    def __init__(self, inner: IEmbeddingService, model_id: str, cache: EmbeddingCache):
+        self.inner = inner
+        self.model_id = model_id
+        self.cache = cache
+        self.stats = CacheStats()  # Cumulative over the life of the service
+        self.last_run_stats = CacheStats()
+
+    def embed_chunks(
+        self, chunks: List[Chunk], out: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Serves cached chunks from the cache and embeds only the misses, in one call
+        to the wrapped service. Chunks without content are skipped, as upstream.
+        """
+        rows = [i for i, chunk in enumerate(chunks) if chunk.content]
+        vectors = self._embed_cached(
+            [chunks[i].content for i in rows], self._embed_chunk_texts, "chunks"
+        )
+        for i, vector in zip(rows, vectors):
+            if out is not None:
+                out[i] = vector
+            else:
+                chunks[i].embedding = np.array(vector, dtype=np.float32)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return self.embed_queries([query])[0]
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        vectors = self._embed_cached(list(queries), self.inner.embed_queries, "queries")
+        if not vectors:
+            return np.empty((0, self.get_dimension()), dtype=np.float32)
+        return np.vstack(vectors).astype(np.float32, copy=False)
+
+    def get_dimension(self) -> int:
+        return self.inner.get_dimension()
+
+    def _embed_chunk_texts(self, texts: List[str]) -> np.ndarray:
+        buffer = np.zeros((len(texts), self.inner.get_dimension()), dtype=np.float32)
+        self.inner.embed_chunks(
+            [Chunk(id=str(i), document_id="", content=t) for i, t in enumerate(texts)],
+            out=buffer,
+        )
+        return buffer
+
+    def _embed_cached(self, texts: List[str], embed, label: str) -> List[np.ndarray]:
+        stats = CacheStats()
+        keys = [cache_key(self.model_id, text) for text in texts]
+        found = self.cache.get_many(keys, stats)
+
+        # Embed each distinct missing text once, even if it repeats within the call.
+        missing: dict = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            embedded = embed(list(missing.values()))
+            new = dict(zip(missing, embedded))
+            self.cache.put_many(new.items())
+            found.update(new)
+
+        self.last_run_stats = stats
+        self.stats.add(stats)
+        if texts:
+            logging.info(
+                f"Embedding cache ({label}): {stats.hits}/{stats.lookups} hits "
+                f"({stats.hit_ratio:.1%}; {stats.memory_hits} in memory), saved "
+                f"{stats.lookups - len(missing)} model calls; "
+                f"{self.stats.hit_ratio:.1%} hit ratio since start."
+            )
+        return [found[key] for key in keys]
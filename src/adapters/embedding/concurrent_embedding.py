@@ -0,0 +1,175 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class ThrottledError(Exception):
+    """Raised by a request function to signal the remote service throttled it."""
+
+
+class AIMDConcurrencyLimiter:
+    """
+    Caps in-flight requests with a limit adapted AIMD-style (as in TCP congestion
+    control): +1 per limit's worth of successes, halved on throttling. Only one
+    decrease is applied per cooldown window, so a burst of throttles from requests
+    already in flight counts as a single congestion signal.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease_factor: float = 0.5,
+        cooldown_seconds: float = 1.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self) -> None:
+        with self._cond:
+            if self._limit < self.max_limit:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+                self._cond.notify()
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown_seconds:
+                return
+            self._last_decrease = now
+            self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+
+
+@dataclass
+class EmbeddingRunStats:
+    """Outcome of one concurrent embedding run."""
+
+    requests: int = 0
+    seconds: float = 0.0
+    throttles: int = 0
+    transient_errors: int = 0
+    final_concurrency: int = 0
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+
+class ConcurrentEmbedder:
+    """
+    Runs a per-text request function over many texts with bounded, adaptive
+    concurrency. Throttled requests are retried with exponential backoff and full
+    jitter; results are returned in input order. Transient failures (`is_transient`:
+    5xx, dropped connections, timeouts) are retried the same way, but only throttles
+    lower the concurrency limit: they are the service's congestion signal.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_retries: int = 8,
+        base_backoff_seconds: float = 0.2,
+        max_backoff_seconds: float = 20.0,
+        is_throttle: Optional[Callable[[Exception], bool]] = None,
+        is_transient: Optional[Callable[[Exception], bool]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.is_throttle = is_throttle or (lambda e: isinstance(e, ThrottledError))
+        self.is_transient = is_transient or (lambda e: False)
+        self.sleep = sleep
+        # Start at half the cap and let AIMD probe upwards.
+        self.limiter = AIMDConcurrencyLimiter(
+            initial_limit=max(min_concurrency, max_concurrency // 2),
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+        )
+        self._stats_lock = threading.Lock()
+
+    def run(
+        self, texts: Sequence[str], request: Callable[[str], T]
+    ) -> Tuple[List[T], EmbeddingRunStats]:
+        stats = EmbeddingRunStats(requests=len(texts))
+        if not texts:
+            return [], stats
+        start = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(texts)),
+            thread_name_prefix="embed",
+        ) as pool:
+            results = list(
+                pool.map(lambda text: self._call(text, request, stats), texts)
+            )
+        stats.seconds = time.perf_counter() - start
+        stats.final_concurrency = self.limiter.limit
+        return results, stats
+
+    def _call(self, text: str, request: Callable[[str], T], stats: EmbeddingRunStats):
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                result = request(text)
+            except Exception as e:
+                throttled = self.is_throttle(e)
+                if attempt >= self.max_retries or not (
+                    throttled or self.is_transient(e)
+                ):
+                    raise
+                with self._stats_lock:
+                    if throttled:
+                        stats.throttles += 1
+                    else:
+                        stats.transient_errors += 1
+                if throttled:
+                    self.limiter.on_throttle()
+            else:
+                self.limiter.on_success()
+                return result
+            finally:
+                self.limiter.release()
+            # Full jitter keeps retries from throttled workers from re-synchronizing.
+            cap = min(self.max_backoff_seconds, self.base_backoff_seconds * 2**attempt)
+            self.sleep(random.uniform(0, cap))
+            attempt += 1
+
+
+def log_run_stats(label: str, stats: EmbeddingRunStats) -> None:
+    logging.info(
+        f"{label}: embedded {stats.requests} texts in {stats.seconds:.2f}s "
+        f"({stats.throughput:.1f}/s); {stats.throttles} throttled and "
+        f"{stats.transient_errors} failed requests retried, "
+        f"final concurrency {stats.final_concurrency}."
+    )
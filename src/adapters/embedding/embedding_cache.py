@@ -0,0 +1,227 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalizes and collapses whitespace, so trivially different copies share a key."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model_id: str, text: str) -> bytes:
+    return hashlib.sha256(
+        f"{model_id}\0{normalize_text(text)}".encode("utf-8")
+    ).digest()
+
+
+@dataclass
+class CacheStats:
+    """Lookups served by one cached embedding call (or accumulated over many)."""
+
+    lookups: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def add(self, other: "CacheStats") -> None:
+        self.lookups += other.lookups
+        self.memory_hits += other.memory_hits
+        self.disk_hits += other.disk_hits
+
+
+class EmbeddingCache:
+    """
+    Two-tier, content-addressed embedding cache.
+    An in-process LRU sits in front of a SQLite file; both tiers are bounded by a
+    byte budget and evict least-recently-used vectors first. Safe to share between
+    threads; the SQLite file can also be shared by processes on the same host.
+    A disk hit refreshes its row's last-used time at most every
+    `touch_interval_seconds`, so repeated lookups do not turn into writes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 1 << 30,
+        memory_max_bytes: int = 64 << 20,
+        touch_interval_seconds: float = 60.0,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.memory_max_bytes = memory_max_bytes
+        self.touch_interval_seconds = touch_interval_seconds
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key BLOB PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)"
+        )
+        # The size on disk is kept in the file, updated with every write, so each
+        # process sharing it evicts against the true total. Counted once per file.
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache_size ("
+            " id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)"
+        )
+        self._db.execute(
+            "INSERT OR IGNORE INTO cache_size (id, bytes)"
+            " SELECT 0, COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        )
+        self._db.commit()
+
+    @property
+    def disk_bytes(self) -> int:
+        with self._lock:
+            return self._read_disk_bytes()
+
+    def get_many(
+        self, keys: List[bytes], stats: Optional[CacheStats] = None
+    ) -> Dict[bytes, np.ndarray]:
+        """Returns the cached vectors for the keys that have one."""
+        found: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                vector = self._memory.get(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            from_memory = set(found)
+            now = time.time()
+            stale = []
+            for start in range(0, len(missing), 500):
+                part = missing[start : start + 500]
+                rows = self._db.execute(
+                    "SELECT key, vector, last_used FROM embeddings WHERE key IN "
+                    f"({','.join('?' * len(part))})",
+                    part,
+                ).fetchall()
+                for key, blob, last_used in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    found[key] = vector
+                    self._remember(key, vector)
+                    if now - last_used >= self.touch_interval_seconds:
+                        stale.append(key)
+            if stale:
+                self._touch(stale, now)
+                self._db.commit()
+        if stats is not None:
+            stats.lookups += len(keys)
+            for key in keys:
+                if key in from_memory:
+                    stats.memory_hits += 1
+                elif key in found:
+                    stats.disk_hits += 1
+        return found
+
+    def put_many(self, items: Iterable[tuple]) -> None:
+        """Stores (key, vector) pairs, then evicts down to the byte budgets."""
+        now = time.time()
+        rows: Dict[bytes, tuple] = {}
+        with self._lock:
+            for key, vector in items:
+                vector = np.ascontiguousarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows[key] = (key, vector.tobytes(), now)
+            if not rows:
+                return
+            # Holds the write lock from the size reads on, so a process writing the
+            # same keys meanwhile cannot skew the shared size.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                added = 0
+                for key, blob, _ in rows.values():
+                    old = self._db.execute(
+                        "SELECT LENGTH(vector) FROM embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                    added += len(blob) - (old[0] if old else 0)
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                    list(rows.values()),
+                )
+                self._add_disk_bytes(added)
+                self._evict_disk()
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _touch(self, keys: List[bytes], now: float) -> None:
+        for start in range(0, len(keys), 500):
+            part = keys[start : start + 500]
+            self._db.execute(
+                f"UPDATE embeddings SET last_used = ? WHERE key IN ({','.join('?' * len(part))})",
+                [now, *part],
+            )
+
+    def _read_disk_bytes(self) -> int:
+        return self._db.execute("SELECT bytes FROM cache_size").fetchone()[0]
+
+    def _add_disk_bytes(self, delta: int) -> None:
+        self._db.execute("UPDATE cache_size SET bytes = bytes + ?", (delta,))
+
+    def _remember(self, key: bytes, vector: np.ndarray) -> None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = vector
+        self._memory_bytes += vector.nbytes
+        while self._memory_bytes > self.memory_max_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def _evict_disk(self) -> None:
+        # Re-read within the write transaction: other processes may have added rows.
+        disk_bytes = self._read_disk_bytes()
+        if disk_bytes <= self.max_bytes:
+            return
+        # Evict down to 90% of the budget so inserts do not evict on every call.
+        target = int(self.max_bytes * 0.9)
+        freed = evicted = 0
+        while disk_bytes - freed > target:
+            rows = self._db.execute(
+                "SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_used LIMIT 1000"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if disk_bytes - freed <= target:
+                    break
+                self._db.execute("DELETE FROM embeddings WHERE key = ?", (key,))
+                freed += size
+                evicted += 1
+        self._add_disk_bytes(-freed)
+        logging.info(
+            f"Embedding cache evicted {evicted} vectors; {disk_bytes - freed} bytes on disk."
+        )
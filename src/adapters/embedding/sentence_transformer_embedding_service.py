@@ -1,6 +1,6 @@
 import logging
 import numpy as np
-from typing import List
+from typing import List, Optional
 from sentence_transformers import SentenceTransformer  # type: ignore
 from src.domain.ports import IEmbeddingService
 from src.domain.entities import Chunk
@@ -13,7 +13,9 @@ class SentenceTransformerEmbeddingService(IEmbeddingService):
     like Bedrock are unavailable.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 64):
+        self.model_name = model_name
+        self.batch_size = batch_size
         try:
             self.model = SentenceTransformer(model_name)
             logging.info(
@@ -25,14 +27,30 @@ class SentenceTransformerEmbeddingService(IEmbeddingService):
             )
             raise
 
-    def embed_chunks(self, chunks: List[Chunk]) -> None:
+    def embed_chunks(
+        self, chunks: List[Chunk], out: Optional[np.ndarray] = None
+    ) -> None:
         """
         Generates embeddings for a list of chunks in-place using the local model.
         This implementation processes chunks in a batch for efficiency.
+        With `out`, each model batch is written straight into the caller's buffer.
         """
         if not chunks:
             return
 
+        if out is not None:
+            for start in range(0, len(chunks), self.batch_size):
+                batch = chunks[start : start + self.batch_size]
+                rows = [i for i, chunk in enumerate(batch, start) if chunk.content]
+                if not rows:
+                    continue
+                out[rows] = self.model.encode(
+                    [chunks[i].content for i in rows],
+                    batch_size=self.batch_size,
+                    show_progress_bar=False,
+                )
+            return
+
         contents = [chunk.content for chunk in chunks if chunk.content]
         if not contents:
             return
@@ -53,6 +71,15 @@ class SentenceTransformerEmbeddingService(IEmbeddingService):
         embedding = self.model.encode(query, show_progress_bar=False)
         return np.array(embedding, dtype=np.float32)
 
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Generates embeddings for many query strings in one batched model call.
+        """
+        embeddings = self.model.encode(
+            queries, batch_size=self.batch_size, show_progress_bar=False
+        )
+        return np.asarray(embeddings, dtype=np.float32).reshape(len(queries), -1)
+
     def get_dimension(self) -> int:
         """
         Returns the dimensionality of the embeddings produced by this service.
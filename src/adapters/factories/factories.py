@@ -1,37 +1,104 @@
 from typing import Optional, Literal, Any
 from src.adapters.data_sources.file_system_data_source import FileSystemDataSource
 from src.adapters.data_sources.s3_data_source import S3DataSource
-from src.adapters.chunking.langchain_chunking_strategy import LangchainChunkingStrategy
+from src.adapters.chunking.recursive_chunking_strategy import RecursiveChunkingStrategy
+from src.adapters.chunking.token_budget_chunking_strategy import (
+    TokenBudgetChunkingStrategy,
+)
 from src.adapters.vector_storage.faiss_vector_repository import FaissVectorRepository
-from src.domain.ports import IEmbeddingService
+from src.adapters.vector_storage.semantic_query_cache import SemanticQueryCache
+from src.domain.ports import IChunkingStrategy, IEmbeddingService
 from src.adapters.embedding.bedrock_embedding_service import BedrockEmbeddingService
+from src.adapters.embedding.cached_embedding_service import CachedEmbeddingService
+from src.adapters.embedding.embedding_cache import EmbeddingCache
 from src.adapters.embedding.sentence_transformer_embedding_service import (
     SentenceTransformerEmbeddingService,
 )
 
 
-def create_file_system_data_source(path: str) -> FileSystemDataSource:
+def create_file_system_data_source(path: str, **kwargs: Any) -> FileSystemDataSource:
     if not isinstance(path, str) or not path:
         raise ValueError("FileSystemDataSource requires a non-empty string path.")
-    return FileSystemDataSource(path=path)
+    # Optional walk settings from the data_source config block (include, exclude,
+    # manifest_path, stream_threshold_bytes).
+    return FileSystemDataSource(path=path, **kwargs)
+
+
+# Settings accepted from a file_system data_source config block.
+FILE_SYSTEM_DATA_SOURCE_PARAM_KEYS = (
+    "include",
+    "exclude",
+    "manifest_path",
+    "stream_threshold_bytes",
+)
+
+# Tuning keys accepted from an s3 data_source config block.
+S3_DATA_SOURCE_PARAM_KEYS = (
+    "max_workers",
+    "ordered",
+    "listing_ttl_seconds",
+    "stream_threshold_bytes",
+)
 
 
-def create_s3_data_source(bucket: str, prefix: str) -> S3DataSource:
+def create_s3_data_source(bucket: str, prefix: str, **kwargs: Any) -> S3DataSource:
     if not isinstance(bucket, str) or not bucket:
         raise ValueError("S3DataSource requires a non-empty string bucket.")
     if not isinstance(prefix, str):
         raise ValueError("S3DataSource requires a string prefix.")
-    return S3DataSource(bucket=bucket, prefix=prefix)
+    # Optional tuning from the data_source config block (max_workers, ordered,
+    # listing_ttl_seconds, stream_threshold_bytes).
+    return S3DataSource(bucket=bucket, prefix=prefix, **kwargs)
 
 
 def create_chunking_strategy(
-    chunk_size: int, chunk_overlap: int
-) -> LangchainChunkingStrategy:
+    chunk_size: int,
+    chunk_overlap: int,
+    strategy_type: str = "langchain",
+    tokenizer: Optional[str] = None,
+) -> IChunkingStrategy:
+    """
+    Creates the chunking strategy named by `chunking_strategy.type`: "langchain"
+    (RecursiveCharacterTextSplitter) or "recursive", the built-in splitter producing
+    the same chunks plus their character spans, without importing LangChain; both
+    size chunks in characters. "token_budget" sizes them in `tokenizer` tokens
+    (chunk_size and chunk_overlap are then token counts) and splits Python by syntax.
+    """
     if not isinstance(chunk_size, int):
         raise ValueError("chunk_size must be an integer.")
     if not isinstance(chunk_overlap, int):
         raise ValueError("chunk_overlap must be an integer.")
-    return LangchainChunkingStrategy(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    if strategy_type == "token_budget":
+        return TokenBudgetChunkingStrategy(
+            max_tokens=chunk_size, overlap_tokens=chunk_overlap, tokenizer=tokenizer
+        )
+    if strategy_type == "recursive":
+        return RecursiveChunkingStrategy(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        )
+    if strategy_type == "langchain":
+        # Imported here so the "recursive" strategy never pays LangChain's import cost.
+        from src.adapters.chunking.langchain_chunking_strategy import (
+            LangchainChunkingStrategy,
+        )
+
+        return LangchainChunkingStrategy(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        )
+    raise ValueError(f"Unsupported chunking strategy type: {strategy_type}")
+
+
+# Index tuning keys accepted from the vector_repository config block.
+FAISS_INDEX_PARAM_KEYS = (
+    "index_type",
+    "hnsw_m",
+    "hnsw_ef_construction",
+    "hnsw_ef_search",
+    "ivf_nlist",
+    "ivf_nprobe",
+    "pq_m",
+    "pq_nbits",
+)
 
 
 def create_faiss_vector_repository(
@@ -39,16 +106,26 @@ def create_faiss_vector_repository(
     embedding_service: IEmbeddingService | dict,
     s3_bucket: Optional[str] = None,
     s3_key: Optional[str] = None,
+    **index_params: Any,
 ) -> FaissVectorRepository:
     """
     Accepts either a string or a config dict for persist_path for flexibility with config-driven setups.
     Accepts either an embedding service instance or a config dict for embedding_service.
+    Index family and tuning (index_type, hnsw_*, ivf_*, pq_*) come from the config dict or kwargs.
     """
     # If persist_path is a dict (from config), extract the actual path and S3 info
     if isinstance(persist_path, dict):
         path = persist_path.get("path") or persist_path.get("persist_path")
         s3_bucket = persist_path.get("s3_bucket", s3_bucket)
         s3_key = persist_path.get("s3_key", s3_key)
+        index_params = {
+            **{
+                key: persist_path[key]
+                for key in FAISS_INDEX_PARAM_KEYS
+                if persist_path.get(key) is not None
+            },
+            **index_params,
+        }
     else:
         path = persist_path
 
@@ -83,6 +160,7 @@ def create_faiss_vector_repository(
         persist_path=path,
         s3_bucket=s3_bucket,
         s3_key=s3_key,
+        **index_params,
     )
 
 
@@ -90,6 +168,25 @@ def create_faiss_vector_repository(
 create_vector_repository = create_faiss_vector_repository
 
 
+def create_semantic_query_cache(
+    query_config: Optional[dict], embedding_service: IEmbeddingService
+) -> Optional[SemanticQueryCache]:
+    """
+    Creates the semantic /query cache from the `query` config block, sized to the
+    embedding service's dimension. Opt-in: returns None unless
+    semantic_cache_max_entries is set above 0.
+    """
+    query_config = query_config or {}
+    max_entries = int(query_config.get("semantic_cache_max_entries", 0))
+    if max_entries <= 0:
+        return None
+    return SemanticQueryCache(
+        dimension=embedding_service.get_dimension(),
+        threshold=float(query_config.get("semantic_cache_threshold", 0.95)),
+        max_entries=max_entries,
+    )
+
+
 def create_embedding_service(provider: str | dict, **kwargs) -> IEmbeddingService:
     """
     Factory for embedding services. Accepts either a provider string or a config dict.
@@ -105,12 +202,22 @@ def create_embedding_service(provider: str | dict, **kwargs) -> IEmbeddingServic
         config = {**provider}
         config.pop("type", None)
         return create_embedding_service(provider_type, **config)
+    cache_config = kwargs.pop("cache", None)
     if provider == "bedrock":
-        return BedrockEmbeddingService(**kwargs)
+        service: IEmbeddingService = BedrockEmbeddingService(**kwargs)
+        model_id = service.model_id
     elif provider == "sentence_transformer":
-        return SentenceTransformerEmbeddingService(**kwargs)
+        service = SentenceTransformerEmbeddingService(**kwargs)
+        model_id = service.model_name
     else:
         raise ValueError(f"Unknown embedding service provider: {provider}")
+    if cache_config and cache_config.get("enabled", True):
+        cache = EmbeddingCache(
+            **{k: v for k, v in cache_config.items() if k != "enabled"}
+        )
+        # The provider is part of the key, so two backends never share vectors.
+        return CachedEmbeddingService(service, f"{provider}:{model_id}", cache)
+    return service
 
 
 def create_data_source(source_type: Literal["file_system", "s3"], **kwargs: Any):
@@ -121,8 +228,19 @@ def create_data_source(source_type: Literal["file_system", "s3"], **kwargs: Any)
         create_data_source("s3", bucket="my-bucket", prefix="my-prefix/")
     """
     if source_type == "file_system":
-        return create_file_system_data_source(kwargs["path"])
+        return create_file_system_data_source(
+            kwargs["path"],
+            **{
+                k: kwargs[k]
+                for k in FILE_SYSTEM_DATA_SOURCE_PARAM_KEYS
+                if kwargs.get(k) is not None
+            },
+        )
     elif source_type == "s3":
-        return create_s3_data_source(kwargs["bucket"], kwargs["prefix"])
+        return create_s3_data_source(
+            kwargs["bucket"],
+            kwargs["prefix"],
+            **{k: kwargs[k] for k in S3_DATA_SOURCE_PARAM_KEYS if k in kwargs},
+        )
     else:
         raise ValueError(f"Unknown data source type: {source_type}")
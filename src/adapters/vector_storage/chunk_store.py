@@ -0,0 +1,268 @@
+import heapq
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from src.domain.entities.chunk import Chunk
+
+# --- On-disk format ---
+# header      : magic (8s) | format version (u32) | column count (u32) | row count (u64)
+# section tbl : (offset u64, length u64) per section
+# sections    : vector_ids int64[n], then per string column: offsets u64[n+1], utf-8 blob
+# Sections are 8-byte aligned so the numeric ones can be viewed in place with numpy.
+MAGIC = b"CCAICHNK"
+FORMAT_VERSION = 1
+STRING_COLUMNS = ("id", "document_id", "content", "metadata")
+_HEADER = struct.Struct("<8sIIQ")
+_SECTION = struct.Struct("<QQ")
+_N_SECTIONS = 1 + 2 * len(STRING_COLUMNS)
+
+Text = Union[str, bytes]
+# (vector_id, chunk id, document id, content, metadata JSON)
+ChunkRow = Tuple[int, Text, Text, Text, Text]
+
+
+def _as_bytes(value: Text) -> bytes:
+    return value if isinstance(value, bytes) else value.encode("utf-8")
+
+
+def _pad(f) -> None:
+    f.write(b"\0" * (-f.tell() % 8))
+
+
+def write_chunk_store(path: Union[str, os.PathLike], rows: Iterable[ChunkRow]) -> int:
+    """
+    Writes chunk rows (ascending vector_id) in the columnar format read by ChunkStore.
+    Returns the number of rows written.
+    """
+    vector_ids = []
+    blobs = {column: bytearray() for column in STRING_COLUMNS}
+    offsets: Dict[str, list] = {column: [0] for column in STRING_COLUMNS}
+    for vector_id, *values in rows:
+        if vector_ids and vector_id <= vector_ids[-1]:
+            raise ValueError("Chunk rows must be written in ascending vector_id order.")
+        vector_ids.append(vector_id)
+        for column, value in zip(STRING_COLUMNS, values):
+            blobs[column] += _as_bytes(value)
+            offsets[column].append(len(blobs[column]))
+
+    sections = [np.asarray(vector_ids, dtype="<i8").tobytes()]
+    for column in STRING_COLUMNS:
+        sections.append(np.asarray(offsets[column], dtype="<u8").tobytes())
+        sections.append(bytes(blobs[column]))
+
+    with open(path, "wb") as f:
+        f.write(
+            _HEADER.pack(MAGIC, FORMAT_VERSION, len(STRING_COLUMNS), len(vector_ids))
+        )
+        table_at = f.tell()
+        f.write(b"\0" * _SECTION.size * _N_SECTIONS)
+        table = []
+        for section in sections:
+            _pad(f)
+            table.append((f.tell(), len(section)))
+            f.write(section)
+        f.seek(table_at)
+        for entry in table:
+            f.write(_SECTION.pack(*entry))
+    return len(vector_ids)
+
+
+class ChunkStore:
+    """
+    Read-only, memory-mapped view of a chunk store file.
+    Opening only parses the header and section table; chunk text is paged in by the OS
+    when a row is actually read, so start-up cost does not grow with corpus size.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_columns, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a chunk store file.")
+        if version != FORMAT_VERSION or n_columns != len(STRING_COLUMNS):
+            self.close()
+            raise ValueError(
+                f"Unsupported chunk store format version {version} in {path} "
+                f"(expected {FORMAT_VERSION})."
+            )
+        table = [
+            _SECTION.unpack_from(self._mm, _HEADER.size + i * _SECTION.size)
+            for i in range(_N_SECTIONS)
+        ]
+        self._count = count
+        self.vector_ids = np.frombuffer(
+            self._mm, dtype="<i8", count=count, offset=table[0][0]
+        )
+        self._offsets = {}
+        self._blob_starts = {}
+        for i, column in enumerate(STRING_COLUMNS):
+            offsets_at, _ = table[1 + 2 * i]
+            blob_at, _ = table[2 + 2 * i]
+            self._offsets[column] = np.frombuffer(
+                self._mm, dtype="<u8", count=count + 1, offset=offsets_at
+            )
+            self._blob_starts[column] = blob_at
+
+    def __len__(self) -> int:
+        return self._count
+
+    def row_of(self, vector_id: int) -> Optional[int]:
+        row = int(np.searchsorted(self.vector_ids, vector_id))
+        if row < self._count and self.vector_ids[row] == vector_id:
+            return row
+        return None
+
+    def raw(self, row: int, column: str) -> bytes:
+        offsets = self._offsets[column]
+        start = self._blob_starts[column]
+        return self._mm[start + int(offsets[row]) : start + int(offsets[row + 1])]
+
+    def text(self, row: int, column: str) -> str:
+        return self.raw(row, column).decode("utf-8")
+
+    def chunk(self, row: int) -> Chunk:
+        return Chunk(
+            id=self.text(row, "id"),
+            document_id=self.text(row, "document_id"),
+            content=self.text(row, "content"),
+            metadata=json.loads(self.raw(row, "metadata")),
+        )
+
+    def close(self) -> None:
+        # numpy views pin the mapping; drop them before closing it.
+        self.vector_ids = np.empty(0, dtype="<i8")
+        self._offsets = {}
+        try:
+            self._mm.close()
+        except (BufferError, AttributeError):
+            pass
+        self._file.close()
+
+
+class ChunkMap(MutableMapping):
+    """
+    vector_id -> Chunk mapping layered over an optional read-only ChunkStore.
+    Additions and deletions are kept in memory until the next save rewrites the store.
+    Chunks read from the store are materialized on access and are read-only copies.
+    """
+
+    def __init__(self, base: Optional[ChunkStore] = None):
+        self.base = base
+        self._added: Dict[int, Chunk] = {}
+        self._deleted: Set[int] = set()
+
+    def _base_row(self, vector_id: int) -> Optional[int]:
+        if self.base is None or vector_id in self._deleted:
+            return None
+        return self.base.row_of(vector_id)
+
+    def __getitem__(self, vector_id: int) -> Chunk:
+        chunk = self._added.get(vector_id)
+        if chunk is not None:
+            return chunk
+        row = self._base_row(vector_id)
+        if row is None:
+            raise KeyError(vector_id)
+        return self.base.chunk(row)
+
+    def __contains__(self, vector_id) -> bool:
+        return vector_id in self._added or self._base_row(vector_id) is not None
+
+    def __setitem__(self, vector_id: int, chunk: Chunk) -> None:
+        self._added[vector_id] = chunk
+
+    def __delitem__(self, vector_id: int) -> None:
+        if self._added.pop(vector_id, None) is not None:
+            return
+        if self._base_row(vector_id) is None:
+            raise KeyError(vector_id)
+        self._deleted.add(vector_id)
+
+    def __iter__(self) -> Iterator[int]:
+        if self.base is not None:
+            for vector_id in self.base.vector_ids.tolist():
+                if vector_id not in self._deleted:
+                    yield vector_id
+        yield from self._added
+
+    def __len__(self) -> int:
+        base_count = len(self.base) - len(self._deleted) if self.base else 0
+        return base_count + len(self._added)
+
+    def field(self, vector_id: int, column: str) -> str:
+        """Reads one string field without materializing the whole chunk."""
+        chunk = self._added.get(vector_id)
+        if chunk is not None:
+            return getattr(chunk, column)
+        row = self._base_row(vector_id)
+        if row is None:
+            raise KeyError(vector_id)
+        return self.base.text(row, column)
+
+    def iter_field(self, column: str) -> Iterator[Tuple[int, str]]:
+        """Yields (vector_id, field) pairs for all live chunks."""
+        if self.base is not None:
+            for row, vector_id in enumerate(self.base.vector_ids.tolist()):
+                if vector_id not in self._deleted:
+                    yield vector_id, self.base.text(row, column)
+        for vector_id, chunk in self._added.items():
+            yield vector_id, getattr(chunk, column)
+
+    def rows(self) -> Iterator[ChunkRow]:
+        """
+        Yields persistable rows in ascending vector_id order; stored rows are passed
+        through as raw bytes. A stored vector id re-assigned a new chunk (see
+        FaissVectorRepository.carry_over) is in memory, so the two are merged.
+        """
+        stored: Iterator[ChunkRow] = iter(())
+        if self.base is not None:
+            base = self.base
+            stored = (
+                (vector_id, *(base.raw(row, c) for c in STRING_COLUMNS))
+                for row, vector_id in enumerate(base.vector_ids.tolist())
+                if vector_id not in self._deleted
+            )
+        added = (
+            (
+                vector_id,
+                chunk.id,
+                chunk.document_id,
+                chunk.content,
+                json.dumps(chunk.metadata),
+            )
+            for vector_id, chunk in sorted(self._added.items())
+        )
+        yield from heapq.merge(stored, added, key=lambda row: row[0])
+
+    def close(self) -> None:
+        if self.base is not None:
+            self.base.close()
+            self.base = None
+
+
+class ChunkIdView(Mapping):
+    """Read-only vector_id -> chunk id view over a ChunkMap."""
+
+    def __init__(self, chunks: ChunkMap):
+        self._chunks = chunks
+
+    def __getitem__(self, vector_id: int) -> str:
+        return self._chunks.field(vector_id, "id")
+
+    def __contains__(self, vector_id) -> bool:
+        return vector_id in self._chunks
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._chunks)
+
+    def __len__(self) -> int:
+        return len(self._chunks)
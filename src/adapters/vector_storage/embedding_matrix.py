@@ -0,0 +1,65 @@
+import numpy as np
+from typing import Tuple
+
+
+class EmbeddingMatrix:
+    """
+    A single contiguous, growable float32 matrix of embeddings.
+    Rows are appended at the end and capacity doubles when exhausted, so appends are
+    amortized O(1) and callers can write embeddings straight into a reserved view
+    instead of allocating one ndarray per chunk and restacking them later.
+    """
+
+    def __init__(self, dim: int, initial_capacity: int = 1024):
+        self.dim = dim
+        self.initial_capacity = max(1, initial_capacity)
+        self._data = np.empty((0, dim), dtype=np.float32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def reserve(self, n: int) -> Tuple[int, np.ndarray]:
+        """
+        Appends n zeroed rows and returns (first_row, writable view of those rows).
+        🟨 CAUTION: The view is only valid until the next reserve(), which may reallocate.
+        """
+        start = self._size
+        self._ensure_capacity(start + n)
+        self._size += n
+        view = self._data[start : self._size]
+        view.fill(0.0)
+        return start, view
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        """Returns the given rows, as a zero-copy view when they are contiguous."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+            if len(rows) == 1 or np.all(np.diff(rows) == 1):
+                return self._data[rows[0] : rows[-1] + 1]
+        return self._data[rows]
+
+    def clear(self) -> None:
+        """Forgets all rows but keeps the allocation for the next batch."""
+        self._size = 0
+
+    def release(self) -> None:
+        """Forgets all rows and frees the allocation."""
+        self._data = np.empty((0, self.dim), dtype=np.float32)
+        self._size = 0
+
+    def _ensure_capacity(self, required: int) -> None:
+        if required <= len(self._data):
+            return
+        capacity = max(required, 2 * len(self._data), self.initial_capacity)
+        grown = np.empty((capacity, self.dim), dtype=np.float32)
+        grown[: self._size] = self._data[: self._size]
+        self._data = grown
@@ -1,19 +1,103 @@
-import os  # noqa: F401
+import os
+import itertools
+import json
+import math
 import faiss  # type: ignore
 import numpy as np
 import logging
 import boto3  # type: ignore
-import json
 import threading
 from botocore.exceptions import ClientError  # type: ignore
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Mapping, Set
 from src.domain.entities.chunk import Chunk
 from src.domain.ports import IVectorRepository
+from src.adapters.vector_storage.embedding_matrix import EmbeddingMatrix
+from src.adapters.vector_storage.metadata_index import (
+    BITMAP_DENSITY_THRESHOLD,
+    EXACT_FILTER_MAX_IDS,
+    MetadataIndex,
+    id_bitmap,
+    log_selectivity,
+)
+from src.adapters.vector_storage.chunk_store import (
+    ChunkIdView,
+    ChunkMap,
+    ChunkStore,
+    write_chunk_store,
+)
+
+INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+
+# 🟦 NOTE: FAISS' k-means warns below 39 training points per centroid; we use the
+# same threshold to decide when enough vectors have been buffered to train an IVF index.
+MIN_POINTS_PER_CENTROID = 39
+
+# 🟦 NOTE: FAISS answers an exhaustive (flat) search with per-query SIMD scans, or with
+# one GEMM for the whole query batch once queries x dim reaches
+# distance_compute_blas_threshold. faiss-cpu 1.15 defaults it to 128000 (~330 queries
+# at 384 dims), so micro-batches never take the GEMM path. Measured at 96-768 dims on
+# 50k-200k vectors, GEMM wins from about 1536 (4 queries at 384 dims): 2.2-2.7x faster
+# at 16 queries. Only lowered, never raised: older releases compare the query count
+# alone (default 20).
+FLAT_BLAS_THRESHOLD = 1536
+
+
+def _lower_flat_blas_threshold() -> None:
+    threshold = getattr(faiss.cvar, "distance_compute_blas_threshold", None)
+    if isinstance(threshold, int) and threshold > FLAT_BLAS_THRESHOLD:
+        faiss.cvar.distance_compute_blas_threshold = FLAT_BLAS_THRESHOLD
+
+
+_lower_flat_blas_threshold()
+
+# Index versions are drawn from one process-wide counter, so a repository swapped in
+# by a hot reload never reuses the version of the one it replaces.
+_index_versions = itertools.count(1)
+
+# HNSW graphs cannot remove vectors, so deletions are tombstoned and filtered at search
+# time; the graph is rebuilt on save() once tombstones exceed this share of the index.
+HNSW_COMPACTION_RATIO = 0.2
+
+# S3 prefix for mid-run ingestion checkpoints (see checkpoint()).
+CHECKPOINT_PREFIX = "checkpoints/"
+
+
+def build_faiss_index(
+    index_type: str,
+    embedding_dim: int,
+    hnsw_m: int = 32,
+    hnsw_ef_construction: int = 200,
+    ivf_nlist: int = 1024,
+    pq_m: int = 16,
+    pq_nbits: int = 8,
+) -> "faiss.Index":
+    """
+    Builds an empty FAISS index of the requested family.
+    All families use L2 distance so scores stay comparable with the flat baseline.
+    IVF variants are returned untrained and must be trained before vectors are added.
+    """
+    if index_type == "flat":
+        return faiss.IndexFlatL2(embedding_dim)
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(embedding_dim, hnsw_m)
+        index.hnsw.efConstruction = hnsw_ef_construction
+        return index
+    if index_type in ("ivf_flat", "ivf_pq"):
+        quantizer = faiss.IndexFlatL2(embedding_dim)
+        if index_type == "ivf_flat":
+            return faiss.IndexIVFFlat(quantizer, embedding_dim, ivf_nlist)
+        return faiss.IndexIVFPQ(quantizer, embedding_dim, ivf_nlist, pq_m, pq_nbits)
+    raise ValueError(
+        f"Unknown FAISS index_type: {index_type!r}. Expected one of {INDEX_TYPES}."
+    )
 
 
 class FaissVectorRepository(IVectorRepository):
-    """A vector repository using FAISS that can persist to S3."""
+    """
+    A vector repository using FAISS that can persist to S3.
+    Supports flat (exact), HNSW and IVF (flat / PQ) index families via `index_type`.
+    """
 
     def __init__(
         self,
@@ -21,39 +105,177 @@ class FaissVectorRepository(IVectorRepository):
         persist_path: str,
         s3_bucket: Optional[str] = None,
         s3_key: Optional[str] = None,
+        index_type: str = "flat",
+        hnsw_m: int = 32,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_search: int = 64,
+        ivf_nlist: int = 1024,
+        ivf_nprobe: int = 16,
+        pq_m: int = 16,
+        pq_nbits: int = 8,
     ):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(
+                f"Unknown FAISS index_type: {index_type!r}. Expected one of {INDEX_TYPES}."
+            )
+        if index_type == "ivf_pq" and embedding_dim % pq_m != 0:
+            raise ValueError(
+                f"pq_m ({pq_m}) must divide the embedding dimension ({embedding_dim})."
+            )
         self.embedding_dim = embedding_dim
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.pq_m = pq_m
+        self.pq_nbits = pq_nbits
         self.persist_path = Path(persist_path)
         self.index_path = self.persist_path
-        self.metadata_path = self.persist_path.with_suffix(".meta.json")
+        self.metadata_path = self.persist_path.with_suffix(".chunks")
         self.s3_bucket = s3_bucket
         self.s3_key = s3_key
-        self.s3_metadata_key = (
-            f"{s3_key.rsplit('.', 1)[0]}.meta.json" if s3_key else None
+        self.s3_metadata_key = f"{s3_key.rsplit('.', 1)[0]}.chunks" if s3_key else None
+        # Mid-run checkpoints go under their own prefix: the live keys (polled by the
+        # API's refresher) only ever receive a finished index.
+        self.s3_checkpoint_keys = (
+            (
+                f"{CHECKPOINT_PREFIX}{s3_key}",
+                f"{CHECKPOINT_PREFIX}{self.s3_metadata_key}",
+            )
+            if s3_key
+            else None
         )
         self.index: Optional[faiss.Index] = None
-        self.chunks: List[Chunk] = []
-        self.id_map: List[str] = []
+        # Stable int64 vector ids are the FAISS ids; they never shift on delete.
+        # Chunk metadata lives in a memory-mapped ChunkStore once loaded or saved.
+        self.chunks: ChunkMap = ChunkMap()
+        self.id_map: Mapping[int, str] = ChunkIdView(self.chunks)
+        self._doc_vector_ids: Optional[Dict[str, List[int]]] = {}
+        self._metadata_index: Optional[MetadataIndex] = MetadataIndex()
+        self._next_vector_id = 0
+        self._tombstones: Set[int] = set()
+        self._tombstone_params: Optional[Any] = None
+        # Staging matrix for vectors buffered while an IVF index awaits training.
+        self.embeddings = EmbeddingMatrix(embedding_dim)
+        self._pending_rows: List[np.ndarray] = []
+        self._pending_ids: List[np.ndarray] = []
         self.s3_client = boto3.client("s3") if s3_bucket and s3_key else None  # type: ignore
         self.last_known_s3_version_id: Optional[str] = None
         self.reload_lock = threading.Lock()
+        self._index_version = next(_index_versions)
         self._ensure_index()
 
     def _ensure_index(self):
         if self.index is None:
-            self.index = faiss.IndexFlatL2(self.embedding_dim)
+            self.index = self._new_index()
+
+    def _new_index(
+        self, ivf_nlist: Optional[int] = None, pq_nbits: Optional[int] = None
+    ):
+        index = build_faiss_index(
+            self.index_type,
+            self.embedding_dim,
+            hnsw_m=self.hnsw_m,
+            hnsw_ef_construction=self.hnsw_ef_construction,
+            ivf_nlist=ivf_nlist or self.ivf_nlist,
+            pq_m=self.pq_m,
+            pq_nbits=pq_nbits or self.pq_nbits,
+        )
+        if self.index_type in ("ivf_flat", "ivf_pq"):
+            # IVF stores ids natively; the hashtable makes remove_ids O(removed)
+            # and lets filtered search reconstruct vectors by id.
+            index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        else:
+            # IDMap2 keeps an id -> position map so vectors can be reconstructed by id.
+            index = faiss.IndexIDMap2(index)
+        self._apply_search_params(index)
+        return index
+
+    def _apply_search_params(self, index) -> None:
+        """Applies query-time knobs (efSearch / nprobe), which are not fixed at build time."""
+        if self.index_type == "hnsw":
+            faiss.ParameterSpace().set_index_parameter(
+                index, "efSearch", self.hnsw_ef_search
+            )
+        elif self.index_type in ("ivf_flat", "ivf_pq"):
+            faiss.ParameterSpace().set_index_parameter(index, "nprobe", self.ivf_nprobe)
+
+    def _min_training_points(self) -> int:
+        n_centroids = self.ivf_nlist
+        if self.index_type == "ivf_pq":
+            n_centroids = max(n_centroids, 2**self.pq_nbits)
+        return n_centroids * MIN_POINTS_PER_CENTROID
+
+    def _train_if_needed(self, force: bool = False) -> None:
+        """
+        Trains an IVF index on the buffered vectors once enough have accumulated.
+        With force=True (final save) training happens on whatever is buffered,
+        shrinking nlist / PQ bits so the k-means step has enough points.
+        """
+        if not self._pending_rows:
+            return
+        vectors = self.embeddings.take(np.concatenate(self._pending_rows))
+        ids = np.concatenate(self._pending_ids)
+        if not self.index.is_trained:
+            n = len(vectors)
+            if n < self._min_training_points():
+                if not force:
+                    return
+                points_per_cell = max(1, n // MIN_POINTS_PER_CENTROID)
+                nlist = min(self.ivf_nlist, points_per_cell)
+                pq_nbits = max(1, min(self.pq_nbits, int(math.log2(points_per_cell))))
+                logging.warning(
+                    f"Training {self.index_type} index on only {n} vectors "
+                    f"(nlist={nlist}, pq_nbits={pq_nbits}); rebuild once the corpus grows."
+                )
+                self.index = self._new_index(ivf_nlist=nlist, pq_nbits=pq_nbits)
+            logging.info(f"Training {self.index_type} index on {n} vectors.")
+            self.index.train(vectors)
+        self.index.add_with_ids(vectors, ids)
+        self._pending_rows = []
+        self._pending_ids = []
+        self._clear_staging_if_idle()
+
+    def _clear_staging_if_idle(self) -> None:
+        if not self._pending_rows:
+            self.embeddings.clear()
 
     def add(self, chunks: List[Chunk]) -> None:
         self._ensure_index()
         if not chunks:
             return
-        vectors = np.array([chunk.embedding for chunk in chunks]).astype("float32")
+        ids = np.arange(
+            self._next_vector_id, self._next_vector_id + len(chunks), dtype="int64"
+        )
+        self._next_vector_id += len(chunks)
         if self.index is not None:
-            self.index.add(vectors)
-        self.chunks.extend(chunks)
-        self.id_map.extend(chunk.id for chunk in chunks)
+            # One copy of the batch: straight into the index, or into staging while
+            # an IVF index awaits training.
+            if self.index.is_trained and not self._pending_rows:
+                vectors = np.stack([chunk.embedding for chunk in chunks]).astype(
+                    np.float32, copy=False
+                )
+                self.index.add_with_ids(vectors, ids)
+            else:
+                start, view = self.embeddings.reserve(len(chunks))
+                np.stack([chunk.embedding for chunk in chunks], out=view)
+                self._pending_rows.append(np.arange(start, start + len(chunks)))
+                self._pending_ids.append(ids)
+        for vector_id, chunk in zip(ids.tolist(), chunks):
+            # The vector lives on in staging or the index; dropping the chunk's copy
+            # (often a view pinning a whole batch buffer) keeps it from being held twice.
+            chunk.embedding = None
+            self.chunks[vector_id] = chunk
+            self.doc_vector_ids.setdefault(chunk.document_id, []).append(vector_id)
+            if self._metadata_index is not None:
+                self._metadata_index.add(vector_id, chunk.metadata)
+        self._train_if_needed()
+        self._clear_staging_if_idle()
+        self.bump_index_version()
         logging.info(
-            f"Added {len(chunks)} vectors. Index now has {self.index.ntotal if self.index else 0} total vectors."
+            f"Added {len(chunks)} vectors. Index now has {len(self.chunks)} total vectors."
         )
 
     def search(
@@ -62,101 +284,453 @@ class FaissVectorRepository(IVectorRepository):
         top_k: int,
         metadata_filter: Optional[Dict[str, Any]] = None,
     ) -> List[Tuple[Chunk, float]]:
+        return self.search_batch(
+            query_embedding.reshape(1, -1), top_k, metadata_filter
+        )[0]
+
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[Chunk, float]]]:
+        """
+        Searches all rows of an (n, d) query matrix in one FAISS call, so BLAS work
+        and the filter lookup are shared. Returns one result list per query row.
+        Searching never trains: vectors an IVF index still buffers for training are
+        not searchable until ingestion or save() trains it.
+        """
+        queries = np.ascontiguousarray(np.atleast_2d(query_embeddings), dtype="float32")
+        no_results: List[List[Tuple[Chunk, float]]] = [[] for _ in range(len(queries))]
         self._ensure_index()
-        if self.index is None or self.index.ntotal == 0:
-            return []
-        k_for_search = max(top_k * 4, 100) if metadata_filter else top_k
-        if query_embedding.ndim == 1:
-            query_embedding = np.expand_dims(query_embedding, axis=0)
-        distances, indices = self.index.search(
-            query_embedding.astype("float32"), k_for_search
-        )
+        if (
+            self.index is None
+            or not self.index.is_trained
+            or self.index.ntotal == 0
+            or not len(queries)
+        ):
+            return no_results
+        params = self._tombstone_params
+        if metadata_filter:
+            ids = self.metadata_index.match(metadata_filter)
+            log_selectivity(metadata_filter, len(ids), len(self.chunks))
+            if not len(ids):
+                return no_results
+            # Deleted ids are no longer in the postings, so this also hides tombstones.
+            if len(ids) <= EXACT_FILTER_MAX_IDS:
+                return self._search_ids(queries, ids, top_k)
+            params = self._selector_params(ids, top_k)
+        distances, indices = self.index.search(queries, top_k, params=params)
+        return [self._to_results(i, d) for i, d in zip(indices, distances)]
+
+    def _search_ids(
+        self, queries: np.ndarray, ids: np.ndarray, top_k: int
+    ) -> List[List[Tuple[Chunk, float]]]:
+        """Exact search over just the given ids, for filters too narrow to walk the index."""
+        vectors = self.index.reconstruct_batch(ids)
+        distances, positions = faiss.knn(queries, vectors, min(top_k, len(ids)))
+        return [self._to_results(ids[p], d) for p, d in zip(positions, distances)]
+
+    def _to_results(
+        self, indices: np.ndarray, distances: np.ndarray
+    ) -> List[Tuple[Chunk, float]]:
         results = []
-        for i, dist in zip(indices[0], distances[0]):
-            if i == -1 or i >= len(self.chunks):
+        for i, dist in zip(indices, distances):
+            chunk = self.chunks.get(int(i))
+            if chunk is None:
                 continue
-            chunk = self.chunks[i]
-            if metadata_filter:
-                match = all(
-                    chunk.metadata.get(key) == value
-                    for key, value in metadata_filter.items()
-                )
-                if not match:
-                    continue
             results.append((chunk, float(dist)))
-            if len(results) >= top_k:
-                break
         return results
 
+    def _selector_params(self, ids: np.ndarray, top_k: int) -> Any:
+        """Search parameters restricting FAISS to the given vector ids."""
+        if len(ids) * BITMAP_DENSITY_THRESHOLD < self._next_vector_id:
+            selector = faiss.IDSelectorBatch(ids)
+        else:
+            selector = faiss.IDSelectorBitmap(id_bitmap(ids, self._next_vector_id))
+        if self.index_type in ("ivf_flat", "ivf_pq"):
+            # IVF rejects generic parameters, and these replace the index's nprobe.
+            return faiss.SearchParametersIVF(sel=selector, nprobe=self.index.nprobe)
+        if self.index_type == "hnsw":
+            # The graph walk only yields members it meets, so widen the beam as the
+            # filter narrows or selective filters come back short of top_k.
+            ef_search = min(
+                self.index.ntotal,
+                max(self.hnsw_ef_search, top_k * self.index.ntotal // len(ids)),
+            )
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=ef_search)
+        return faiss.SearchParameters(sel=selector)
+
+    @property
+    def metadata_index(self) -> MetadataIndex:
+        """(metadata key, value) -> vector ids inverted index, built lazily after load()."""
+        if self._metadata_index is None:
+            index = MetadataIndex()
+            for vector_id, metadata in self.chunks.iter_field("metadata"):
+                index.add(
+                    vector_id,
+                    json.loads(metadata) if isinstance(metadata, str) else metadata,
+                )
+            self._metadata_index = index
+        return self._metadata_index
+
+    @property
+    def doc_vector_ids(self) -> Dict[str, List[int]]:
+        """document_id -> vector ids posting map, built lazily after load()."""
+        if self._doc_vector_ids is None:
+            postings: Dict[str, List[int]] = {}
+            for vector_id, doc_id in self.chunks.iter_field("document_id"):
+                postings.setdefault(doc_id, []).append(vector_id)
+            self._doc_vector_ids = postings
+        return self._doc_vector_ids
+
+    def live_vector_count(self) -> int:
+        """Vectors in the index that are not tombstoned."""
+        ntotal = self.index.ntotal if self.index is not None else 0
+        return ntotal - len(self._tombstones)
+
+    def index_version(self) -> int:
+        return self._index_version
+
+    def bump_index_version(self) -> None:
+        """
+        Marks results cached for this index stale, e.g. when the vectors are not
+        changed but the model embedding the queries is.
+        """
+        self._index_version = next(_index_versions)
+
     def get_all_document_identifiers(self) -> List[str]:
-        if not self.chunks:
-            return []
-        return list({chunk.document_id for chunk in self.chunks})
+        return list(self.doc_vector_ids)
 
     def delete_by_document_id(self, doc_ids_to_delete: List[str]) -> None:
         if not doc_ids_to_delete:
             return
-        initial_chunk_count = len(self.chunks)
-        chunks_to_keep = [
-            chunk for chunk in self.chunks if chunk.document_id not in doc_ids_to_delete
+        vector_ids = [
+            vector_id
+            for doc_id in set(doc_ids_to_delete)
+            for vector_id in self.doc_vector_ids.pop(doc_id, [])
         ]
-        if len(chunks_to_keep) == initial_chunk_count:
+        if not vector_ids:
             logging.info(
                 "No documents found in the index that match the deletion request."
             )
             return
         logging.info(
-            f"Deleting {initial_chunk_count - len(chunks_to_keep)} chunks for {len(doc_ids_to_delete)} documents."
+            f"Deleting {len(vector_ids)} chunks for {len(doc_ids_to_delete)} documents."
+        )
+        self._delete_vector_ids(vector_ids)
+        logging.info(
+            f"Deleted in place. Index now has {len(self.chunks)} live vectors."
+        )
+
+    def get_chunks_by_document_id(self, doc_ids) -> Dict[str, List[Chunk]]:
+        return {
+            doc_id: [
+                self.chunks[vector_id] for vector_id in self.doc_vector_ids[doc_id]
+            ]
+            for doc_id in doc_ids
+            if doc_id in self.doc_vector_ids
+        }
+
+    def carry_over(self, previous_document_id: str, chunks: List[Chunk]) -> None:
+        """
+        Re-homes the previous version's vectors onto the matching new chunks in place:
+        the FAISS index is untouched, only chunk metadata and postings change.
+        """
+        vector_ids_by_chunk_id: Dict[str, List[int]] = {}
+        for vector_id in self.doc_vector_ids.pop(previous_document_id, []):
+            chunk_id = self.chunks.field(vector_id, "id")
+            vector_ids_by_chunk_id.setdefault(chunk_id, []).append(vector_id)
+        for chunk in chunks:
+            matches = vector_ids_by_chunk_id.get(chunk.id)
+            if not matches:
+                raise KeyError(
+                    f"No stored chunk {chunk.id} in document {previous_document_id}."
+                )
+            vector_id = matches.pop(0)
+            if self._metadata_index is not None:
+                self._metadata_index.remove(vector_id, self.chunks[vector_id].metadata)
+                self._metadata_index.add(vector_id, chunk.metadata)
+            del self.chunks[vector_id]
+            self.chunks[vector_id] = chunk
+            self.doc_vector_ids.setdefault(chunk.document_id, []).append(vector_id)
+        leftovers = [v for ids in vector_ids_by_chunk_id.values() for v in ids]
+        if leftovers:
+            self._delete_vector_ids(leftovers)
+        self.bump_index_version()
+        logging.info(
+            f"Carried {len(chunks)} chunks of {previous_document_id} over to the new "
+            f"version; deleted {len(leftovers)} changed chunks."
+        )
+
+    def _delete_vector_ids(self, vector_ids: List[int]) -> None:
+        ids = np.array(vector_ids, dtype="int64")
+        indexed_ids = self._drop_pending(ids)
+        if self.index_type == "hnsw":
+            self._tombstones.update(indexed_ids.tolist())
+            self._refresh_tombstone_filter()
+        elif len(indexed_ids):
+            self.index.remove_ids(indexed_ids)
+        for vector_id in vector_ids:
+            if self._metadata_index is not None:
+                self._metadata_index.remove(vector_id, self.chunks[vector_id].metadata)
+            del self.chunks[vector_id]
+        self.bump_index_version()
+
+    def _refresh_tombstone_filter(self) -> None:
+        """Caches the search-time selector that hides tombstoned HNSW vectors."""
+        if not self._tombstones:
+            self._tombstone_params = None
+            return
+        self._tombstone_params = faiss.SearchParameters(
+            sel=faiss.IDSelectorNot(
+                faiss.IDSelectorBatch(np.fromiter(self._tombstones, dtype="int64"))
+            )
+        )
+
+    def _drop_pending(self, ids: np.ndarray) -> np.ndarray:
+        """Removes ids still buffered for IVF training; returns the ids already indexed."""
+        if not self._pending_ids:
+            return ids
+        for n, pending_ids in enumerate(self._pending_ids):
+            keep = ~np.isin(pending_ids, ids)
+            self._pending_ids[n] = pending_ids[keep]
+            self._pending_rows[n] = self._pending_rows[n][keep]
+        return ids[~np.isin(ids, np.concatenate(self._pending_ids))]
+
+    def _compact_if_needed(self) -> None:
+        """Rebuilds an HNSW graph without its tombstoned vectors once they pile up."""
+        if not self._tombstones or len(self._tombstones) < (
+            HNSW_COMPACTION_RATIO * self.index.ntotal
+        ):
+            return
+        logging.info(
+            f"Compacting HNSW index: dropping {len(self._tombstones)} tombstoned vectors."
         )
-        new_index = faiss.IndexFlatL2(self.embedding_dim)
-        if chunks_to_keep:
-            vectors_to_keep = np.array(
-                [chunk.embedding for chunk in chunks_to_keep]
-            ).astype("float32")
-            new_index.add(vectors_to_keep)
-        self.index = new_index
-        self.chunks = chunks_to_keep
-        logging.info(f"Index rebuilt. New size: {self.index.ntotal} vectors.")
+        all_ids = faiss.vector_to_array(self.index.id_map)
+        keep = ~np.isin(all_ids, np.fromiter(self._tombstones, dtype="int64"))
+        vectors = faiss.downcast_index(self.index.index).reconstruct_n(
+            0, self.index.ntotal
+        )
+        index = self._new_index()
+        index.add_with_ids(vectors[keep], all_ids[keep])
+        self.index = index
+        self._tombstones = set()
+        self._refresh_tombstone_filter()
 
     def save(self) -> None:
         self._ensure_index()
-        if self.index is None or self.index.ntotal == 0:
-            faiss.write_index(self.index, str(self.persist_path))
+        self._train_if_needed(force=True)
+        self._persist()
+        self._save_to_s3()
+
+    def checkpoint(self) -> bool:
+        """
+        Saves locally and to the S3 checkpoint prefix, never to the live keys, so a
+        partial index is not hot-swapped into the API. Does not force IVF training:
+        an index trained on a partial corpus would be stuck with its too-small nlist,
+        so while vectors still wait for training nothing is saved (they live only in
+        staging) and False is returned.
+        """
+        self._ensure_index()
+        if self._pending_rows and not self.index.is_trained:
             logging.info(
-                "Index is empty. Nothing to save, but write_index called for test compatibility."
+                f"Skipping checkpoint: {self.index_type} index is not trained yet "
+                f"({sum(map(len, self._pending_rows))} of "
+                f"{self._min_training_points()} training vectors buffered)."
             )
-            return
+            return False
+        self._train_if_needed()
+        self._persist()
+        self._save_to_s3(checkpoint=True)
+        return True
+
+    def _persist(self) -> None:
+        self._compact_if_needed()
+        if not self._pending_rows:
+            self.embeddings.release()
+        # An empty index is saved like any other: its (empty) chunk store and the S3
+        # upload replace a previous version, e.g. after every document was deleted.
         self.persist_path.parent.mkdir(parents=True, exist_ok=True)
-        logging.info(f"Saving FAISS index to {self.persist_path}")
+        logging.info(f"Saving {self.index_type} FAISS index to {self.persist_path}")
         faiss.write_index(self.index, str(self.persist_path))
         logging.info(f"Saving chunk metadata to {self.metadata_path}")
-        with open(self.metadata_path, "w") as f:
-            chunks_data = [chunk.__dict__ for chunk in self.chunks]
-            json.dump(chunks_data, f)
-        self._save_to_s3()
+        # Write beside the live store, then swap, so the current mapping stays readable.
+        tmp_path = self.metadata_path.with_suffix(".chunks.tmp")
+        write_chunk_store(tmp_path, self.chunks.rows())
+        self.chunks.close()
+        os.replace(tmp_path, self.metadata_path)
+        self._open_chunk_store()
 
-    def _save_to_s3(self):
+    def load(self) -> None:
+        """
+        Restores the index and chunk metadata written by save().
+        The index family is whatever was persisted (FAISS serializes it); only the
+        query-time parameters from the current config are re-applied.
+        """
+        if not os.path.exists(self.persist_path):
+            logging.info(f"No persisted index at {self.persist_path}; starting empty.")
+            return
+        index = faiss.read_index(str(self.persist_path))
+        loaded_type = self._detect_index_type(index)
+        if loaded_type != self.index_type:
+            logging.warning(
+                f"Persisted index is '{loaded_type}' but config requests '{self.index_type}'. "
+                "Keeping the persisted index; re-ingest to change the index type."
+            )
+            self.index_type = loaded_type
+        self._apply_search_params(index)
+        self.index = index
+        self.embeddings.release()
+        self._pending_rows = []
+        self._pending_ids = []
+        self._open_chunk_store()
+        self._next_vector_id = (
+            int(self.chunks.base.vector_ids[-1]) + 1 if len(self.chunks) else 0
+        )
+        self._tombstones = set()
+        self._tombstone_params = None
+        self.bump_index_version()
+        if loaded_type == "hnsw":
+            # Vectors in the graph without metadata were deleted before the last save.
+            indexed_ids = faiss.vector_to_array(index.id_map)
+            self._next_vector_id = max(
+                self._next_vector_id, int(indexed_ids.max(initial=-1)) + 1
+            )
+            live_ids = self.chunks.base.vector_ids if self.chunks.base else []
+            self._tombstones = set(
+                indexed_ids[np.isin(indexed_ids, live_ids, invert=True)].tolist()
+            )
+            self._refresh_tombstone_filter()
+        logging.info(
+            f"Loaded {loaded_type} index with {index.ntotal} vectors and {len(self.chunks)} chunks."
+        )
+
+    def _open_chunk_store(self) -> None:
+        """Maps the persisted chunk store (if any) and resets in-memory edits."""
+        self.chunks.close()
+        base = (
+            ChunkStore(self.metadata_path)
+            if os.path.exists(self.metadata_path)
+            else None
+        )
+        self.chunks = ChunkMap(base)
+        self.id_map = ChunkIdView(self.chunks)
+        self._doc_vector_ids = None
+        self._metadata_index = None
+
+    @staticmethod
+    def _detect_index_type(index) -> str:
+        index = faiss.downcast_index(index)
+        if isinstance(index, faiss.IndexIDMap):
+            index = faiss.downcast_index(index.index)
+        if isinstance(index, faiss.IndexHNSW):
+            return "hnsw"
+        if isinstance(index, faiss.IndexIVFPQ):
+            return "ivf_pq"
+        if isinstance(index, faiss.IndexIVF):
+            return "ivf_flat"
+        return "flat"
+
+    def _s3_keys(self, checkpoint: bool = False) -> Tuple[str, str]:
+        if checkpoint:
+            return self.s3_checkpoint_keys
+        return self.s3_key, self.s3_metadata_key
+
+    def _save_to_s3(self, checkpoint: bool = False):
         if not self.s3_bucket or not self.s3_key:
             return
+        index_key, metadata_key = self._s3_keys(checkpoint)
         s3 = boto3.client("s3")
         try:
-            logging.info(f"Uploading index to s3://{self.s3_bucket}/{self.s3_key}")
-            s3.upload_file(str(self.persist_path), self.s3_bucket, self.s3_key)
-            logging.info(
-                f"Uploading metadata to s3://{self.s3_bucket}/{self.s3_metadata_key}"
-            )
-            s3.upload_file(
-                str(self.metadata_path), self.s3_bucket, self.s3_metadata_key
-            )
-            response = s3.head_object(Bucket=self.s3_bucket, Key=self.s3_metadata_key)
-            self.last_known_s3_version_id = response.get("VersionId")
+            logging.info(f"Uploading index to s3://{self.s3_bucket}/{index_key}")
+            s3.upload_file(str(self.persist_path), self.s3_bucket, index_key)
+            logging.info(f"Uploading metadata to s3://{self.s3_bucket}/{metadata_key}")
+            s3.upload_file(str(self.metadata_path), self.s3_bucket, metadata_key)
+            if checkpoint:
+                logging.info("Uploaded checkpoint to S3.")
+                return
+            response = s3.head_object(Bucket=self.s3_bucket, Key=metadata_key)
+            self.last_known_s3_version_id = self._s3_version_of(response)
             logging.info(
                 f"Successfully uploaded index and metadata to S3. New version: {self.last_known_s3_version_id}"
             )
+            # The run is complete; a later resume must not pick up its checkpoint.
+            for key in self.s3_checkpoint_keys:
+                s3.delete_object(Bucket=self.s3_bucket, Key=key)
         except ClientError as e:
             logging.error(f"Failed to upload index or metadata to S3: {e}")
             raise
 
+    def s3_versions(self, checkpoint: bool = False) -> Optional[Tuple[str, str]]:
+        """
+        Returns the current (index, chunk store) S3 versions, or None if S3 is not
+        configured or either object is missing. Falls back to the ETag when the
+        bucket is not versioned. With `checkpoint`, looks at the checkpoint keys.
+        """
+        if not self.s3_client:
+            return None
+        versions = []
+        for key in self._s3_keys(checkpoint):
+            try:
+                response = self.s3_client.head_object(Bucket=self.s3_bucket, Key=key)
+            except ClientError as e:
+                logging.warning(f"Cannot stat s3://{self.s3_bucket}/{key}: {e}")
+                return None
+            versions.append(self._s3_version_of(response))
+        return versions[0], versions[1]
+
+    @staticmethod
+    def _s3_version_of(head_response: Dict[str, Any]) -> str:
+        # Unversioned buckets report no VersionId; the ETag still changes per upload.
+        version_id = head_response.get("VersionId")
+        if version_id and version_id != "null":
+            return version_id
+        etag = head_response.get("ETag", "").strip('"')
+        return f"etag:{etag}"
+
+    def download_from_s3(
+        self, versions: Tuple[str, str], checkpoint: bool = False
+    ) -> None:
+        """
+        Downloads the given (index, chunk store) versions to this repository's
+        persist_path / metadata_path. Pinning the versions keeps the pair consistent
+        even if a new save lands mid-download. With `checkpoint`, downloads from the
+        checkpoint keys.
+        """
+        index_key, metadata_key = self._s3_keys(checkpoint)
+        self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+        for key, version, dest in (
+            (index_key, versions[0], self.persist_path),
+            (metadata_key, versions[1], self.metadata_path),
+        ):
+            extra_args = None if version.startswith("etag:") else {"VersionId": version}
+            logging.info(
+                f"Downloading s3://{self.s3_bucket}/{key} ({version}) to {dest}"
+            )
+            self.s3_client.download_file(
+                self.s3_bucket, key, str(dest), ExtraArgs=extra_args
+            )
+        if not checkpoint:
+            self.last_known_s3_version_id = versions[1]
+
+    def replica(self, persist_path: str) -> "FaissVectorRepository":
+        """Returns an empty repository with the same index and S3 settings at persist_path."""
+        return FaissVectorRepository(
+            embedding_dim=self.embedding_dim,
+            persist_path=persist_path,
+            s3_bucket=self.s3_bucket,
+            s3_key=self.s3_key,
+            index_type=self.index_type,
+            hnsw_m=self.hnsw_m,
+            hnsw_ef_construction=self.hnsw_ef_construction,
+            hnsw_ef_search=self.hnsw_ef_search,
+            ivf_nlist=self.ivf_nlist,
+            ivf_nprobe=self.ivf_nprobe,
+            pq_m=self.pq_m,
+            pq_nbits=self.pq_nbits,
+        )
+
     # Alias for legacy/test compatibility
     def persist(self) -> None:
         """
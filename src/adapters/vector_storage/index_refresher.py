@@ -0,0 +1,178 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from src.adapters.vector_storage.faiss_vector_repository import FaissVectorRepository
+
+
+class S3IndexRefresher:
+    """
+    Polls S3 for a new (index, chunk store) version and hot-swaps it in, RCU style.
+
+    A new version is downloaded to side files and loaded into a fresh repository on a
+    background thread; only then is it published through `on_swap` with a single
+    reference assignment. In-flight searches keep the repository they started with, and
+    the old one is reclaimed once the last of them drops its reference.
+    """
+
+    def __init__(
+        self,
+        repository: FaissVectorRepository,
+        on_swap: Callable[[FaissVectorRepository], None],
+        poll_interval_seconds: float = 30.0,
+    ):
+        self.repository = repository
+        self.on_swap = on_swap
+        self.poll_interval_seconds = poll_interval_seconds
+        self._base_path = Path(repository.persist_path)
+        self._generation = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.active_version: Optional[str] = repository.last_known_s3_version_id
+        self.swap_count = 0
+        self.last_swap_seconds: Optional[float] = None
+        self.last_swap_at: Optional[str] = None
+        self.last_check_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="s3-index-refresher", daemon=True
+        )
+        self._thread.start()
+        logging.info(
+            f"S3 index refresher started (every {self.poll_interval_seconds}s)."
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self) -> None:
+        """Stops polling and deletes the live version's side files, once it is retired."""
+        self.stop()
+        self._discard(self.repository)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.check_once()
+            except Exception as e:
+                self.last_error = str(e)
+                logging.error(f"S3 index refresh failed: {e}", exc_info=True)
+            if self._stop_event.wait(self.poll_interval_seconds):
+                return
+
+    def check_once(self) -> bool:
+        """
+        Checks S3 once and swaps in a newer version if there is one.
+        Returns True if a swap happened.
+        """
+        current = self.repository
+        # 🟦 NOTE: reload_lock only serializes refreshers; searches never take it.
+        if not current.reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self.last_check_at = _now()
+            versions = current.s3_versions()
+            # The chunk store is uploaded last, so its version marks a complete save.
+            if versions is None or versions[1] == self.active_version:
+                return False
+
+            start = time.perf_counter()
+            replica = current.replica(str(self._side_path()))
+            try:
+                replica.download_from_s3(versions)
+                replica.load()
+                live_vectors = replica.live_vector_count()
+                if live_vectors != len(replica.chunks):
+                    raise ValueError(
+                        f"S3 version {versions} is inconsistent: {live_vectors} "
+                        f"vectors vs. {len(replica.chunks)} chunks; will retry on "
+                        "the next poll."
+                    )
+            except Exception:
+                # Never published: its side files (complete or not) are ours to delete.
+                self._discard(replica)
+                raise
+
+            self.on_swap(replica)
+            self.repository = replica
+            self.active_version = versions[1]
+            self.last_swap_seconds = time.perf_counter() - start
+            self.last_swap_at = _now()
+            self.swap_count += 1
+            self.last_error = None
+            logging.info(
+                f"Swapped in S3 index version {self.active_version} "
+                f"({replica.index.ntotal} vectors) in {self.last_swap_seconds:.3f}s."
+            )
+            self._discard(current)
+            return True
+        finally:
+            current.reload_lock.release()
+
+    def redirect(
+        self, on_swap: Callable[[FaissVectorRepository], None]
+    ) -> FaissVectorRepository:
+        """
+        Sends later swaps to `on_swap` and returns the repository now live, for a new
+        service that takes over this index. Waits out a swap in progress, so the
+        returned repository is never one that swap is about to retire.
+        """
+        while True:
+            repository = self.repository
+            with repository.reload_lock:
+                if self.repository is repository:
+                    self.on_swap = on_swap
+                    return repository
+
+    def status(self) -> Dict[str, Any]:
+        repository = self.repository
+        return {
+            "active_version": self.active_version,
+            "index_type": repository.index_type,
+            "vectors": repository.index.ntotal if repository.index is not None else 0,
+            "swap_count": self.swap_count,
+            "last_swap_seconds": self.last_swap_seconds,
+            "last_swap_at": self.last_swap_at,
+            "last_check_at": self.last_check_at,
+            "last_error": self.last_error,
+            "poll_interval_seconds": self.poll_interval_seconds,
+        }
+
+    def _side_path(self) -> Path:
+        # Skips names still in use, e.g. by the refresher of the service being replaced.
+        base = self._base_path
+        while True:
+            self._generation += 1
+            path = base.with_name(f"{base.stem}.s3-{self._generation}{base.suffix}")
+            if not path.exists() and not path.with_suffix(".chunks").exists():
+                return path
+
+    def _discard(self, repository: FaissVectorRepository) -> None:
+        """Deletes a retired version's side files; the configured path is kept."""
+        if Path(repository.persist_path) == self._base_path:
+            return
+        # 🟨 CAUTION: Readers may still hold the old chunk store's mmap. Unlinking a
+        # mapped file is safe on POSIX; the pages stay valid until it is unmapped.
+        for path in (repository.persist_path, repository.metadata_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # A failed download may not have written it.
+            except OSError as e:
+                logging.warning(f"Could not remove retired index file {path}: {e}")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
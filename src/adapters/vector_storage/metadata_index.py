@@ -0,0 +1,131 @@
+import bisect
+import itertools
+import json
+import logging
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Set
+
+import numpy as np
+
+# Filters matching at most this many ids are answered by an exact scan of just those
+# vectors, which beats walking the whole index (and HNSW's recall drops on them).
+EXACT_FILTER_MAX_IDS = 4096
+
+# Filters with fewer matching ids than (id space / this) are passed to FAISS as an id
+# hash set; broader ones as a bitmap over the id space, which costs id_space / 8 bytes.
+BITMAP_DENSITY_THRESHOLD = 128
+
+
+def _value_key(value: Any) -> Hashable:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        # Lists / dicts in metadata are matched by their canonical JSON form.
+        return json.dumps(value, sort_keys=True)
+
+
+def _prefix_successor(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class MetadataIndex:
+    """
+    Inverted index from (metadata key, value) to the set of vector ids carrying it.
+
+    Filters are dicts of key -> condition, AND-ed across keys:
+      - a scalar matches by equality: {"source": "s3://bucket/a.md"}
+      - a list / tuple / set matches any of its values: {"lang": ["py", "ts"]}
+      - {"prefix": str} matches string values with that prefix:
+        {"source": {"prefix": "s3://bucket/contracts/"}}
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Hashable, Set[int]]] = {}
+        # Sorted string values per key for prefix lookups; rebuilt after value churn.
+        self._sorted_values: Dict[str, List[str]] = {}
+
+    def add(self, vector_id: int, metadata: Mapping[str, Any]) -> None:
+        for key, value in metadata.items():
+            values = self._postings.setdefault(key, {})
+            value_key = _value_key(value)
+            ids = values.get(value_key)
+            if ids is None:
+                ids = values[value_key] = set()
+                self._sorted_values.pop(key, None)
+            ids.add(vector_id)
+
+    def remove(self, vector_id: int, metadata: Mapping[str, Any]) -> None:
+        for key, value in metadata.items():
+            values = self._postings.get(key)
+            if values is None:
+                continue
+            value_key = _value_key(value)
+            ids = values.get(value_key)
+            if ids is None:
+                continue
+            ids.discard(vector_id)
+            if not ids:
+                del values[value_key]
+                self._sorted_values.pop(key, None)
+                if not values:
+                    del self._postings[key]
+
+    def match(self, metadata_filter: Mapping[str, Any]) -> np.ndarray:
+        """Returns the sorted int64 vector ids matching every condition of the filter."""
+        result: Optional[np.ndarray] = None
+        # Intersect the most selective conditions first.
+        for ids in sorted(
+            (self._match_condition(k, c) for k, c in metadata_filter.items()), key=len
+        ):
+            result = (
+                ids
+                if result is None
+                else np.intersect1d(result, ids, assume_unique=True)
+            )
+            if not len(result):
+                break
+        return result if result is not None else np.empty(0, dtype="int64")
+
+    def _match_condition(self, key: str, condition: Any) -> np.ndarray:
+        values = self._postings.get(key, {})
+        if isinstance(condition, Mapping) and set(condition) == {"prefix"}:
+            prefix = condition["prefix"]
+            sorted_values = self._sorted_values.get(key)
+            if sorted_values is None:
+                sorted_values = sorted(v for v in values if isinstance(v, str))
+                self._sorted_values[key] = sorted_values
+            start = bisect.bisect_left(sorted_values, prefix)
+            end = (
+                bisect.bisect_left(sorted_values, _prefix_successor(prefix), start)
+                if prefix
+                else len(sorted_values)
+            )
+            id_sets: Iterable[Iterable[int]] = map(
+                values.__getitem__, sorted_values[start:end]
+            )
+        elif isinstance(condition, (list, tuple, set, frozenset)):
+            value_keys = dict.fromkeys(_value_key(v) for v in condition)
+            id_sets = (values.get(v, ()) for v in value_keys)
+        else:
+            id_sets = (values.get(_value_key(condition), ()),)
+        # A vector has one value per key, so the id sets of distinct values are disjoint.
+        ids = np.fromiter(itertools.chain.from_iterable(id_sets), dtype="int64")
+        ids.sort()
+        return ids
+
+
+def id_bitmap(ids: np.ndarray, id_space: int) -> np.ndarray:
+    """Packs ids < id_space into the little-endian bitmap layout of faiss.IDSelectorBitmap."""
+    bits = np.zeros(id_space, dtype=bool)
+    bits[ids] = True
+    return np.packbits(bits, bitorder="little")
+
+
+def log_selectivity(
+    metadata_filter: Mapping[str, Any], matched: int, total: int
+) -> None:
+    share = matched / total if total else 0.0
+    logging.info(
+        f"Metadata filter {metadata_filter} matches {matched}/{total} vectors ({share:.2%})."
+    )
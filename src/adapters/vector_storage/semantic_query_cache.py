@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+import faiss  # type: ignore
+import numpy as np
+
+from src.domain.entities import Chunk
+from src.domain.ports import ISemanticQueryCache
+
+
+@dataclass
+class _Entry:
+    top_k: int
+    chunks: List[Chunk]
+
+
+class SemanticQueryCache(ISemanticQueryCache):
+    """
+    Caches search results by query embedding in a small in-memory FAISS index, so a
+    paraphrase of a recent query skips the main index search.
+
+    A query hits when a cached query's embedding has cosine similarity >= `threshold`
+    with it and was searched with at least its top_k (the cached list is cut to fit).
+    The query is still embedded; a hit saves the vector repository search. Like
+    QueryResultCache, entries belong to one index version and are dropped when a newer
+    one is seen. The oldest of more than `max_entries` queries are evicted first.
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        threshold: float = 0.95,
+        max_entries: int = 1000,
+        neighbours: int = 4,
+    ):
+        self.dimension = dimension
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.neighbours = neighbours
+        # Inner product over L2-normalized vectors is cosine similarity.
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+        self._entries: Dict[int, _Entry] = {}
+        self._order: Deque[int] = deque()
+        self._next_id = 0
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.lookup_seconds = 0.0
+        self.searches = 0
+        self.search_seconds = 0.0
+
+    def lookup(
+        self, query_embeddings: np.ndarray, top_k: int, version: Optional[int]
+    ) -> List[Optional[List[Chunk]]]:
+        start = time.perf_counter()
+        answers: List[Optional[List[Chunk]]] = [None] * len(query_embeddings)
+        with self._lock:
+            self._sync_version(version)
+            if version == self._version and self._entries:
+                similarities, ids = self.index.search(
+                    _normalized(query_embeddings),
+                    min(self.neighbours, len(self._entries)),
+                )
+                for row, (row_similarities, row_ids) in enumerate(
+                    zip(similarities, ids)
+                ):
+                    answers[row] = self._best_match(row_similarities, row_ids, top_k)
+            hits = sum(answer is not None for answer in answers)
+            self.hits += hits
+            self.misses += len(answers) - hits
+            self.lookup_seconds += time.perf_counter() - start
+        return answers
+
+    def add(
+        self,
+        query_embeddings: np.ndarray,
+        results: List[List[Chunk]],
+        top_k: int,
+        version: Optional[int],
+        search_seconds: float = 0.0,
+    ) -> None:
+        with self._lock:
+            self.searches += len(results)
+            self.search_seconds += search_seconds
+            if version is None or self.max_entries <= 0:
+                return
+            self._sync_version(version)
+            if version != self._version:
+                return
+            ids = np.arange(self._next_id, self._next_id + len(results), dtype="int64")
+            self._next_id += len(results)
+            self.index.add_with_ids(_normalized(query_embeddings), ids)
+            for vector_id, chunks in zip(ids.tolist(), results):
+                self._entries[vector_id] = _Entry(top_k, list(chunks))
+                self._order.append(vector_id)
+            evicted = [
+                self._order.popleft()
+                for _ in range(max(len(self._order) - self.max_entries, 0))
+            ]
+            if evicted:
+                self.index.remove_ids(np.array(evicted, dtype="int64"))
+                for vector_id in evicted:
+                    del self._entries[vector_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        mean_search = self.search_seconds / self.searches if self.searches else 0.0
+        return {
+            "enabled": self.max_entries > 0,
+            "threshold": self.threshold,
+            "index_version": self._version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "mean_lookup_ms": self.lookup_seconds / lookups * 1000 if lookups else 0.0,
+            "mean_search_ms": mean_search * 1000,
+            # Searches skipped by hits, at the mean search time, net of all lookups.
+            "saved_ms": (self.hits * mean_search - self.lookup_seconds) * 1000,
+        }
+
+    def _best_match(
+        self, similarities: np.ndarray, ids: np.ndarray, top_k: int
+    ) -> Optional[List[Chunk]]:
+        # Neighbours come most similar first.
+        for similarity, vector_id in zip(similarities.tolist(), ids.tolist()):
+            if vector_id < 0 or similarity < self.threshold:
+                return None
+            entry = self._entries[vector_id]
+            if entry.top_k >= top_k:
+                return entry.chunks[:top_k]
+        return None
+
+    def _sync_version(self, version: Optional[int]) -> None:
+        # Versions only grow, so an older one (a search that raced with a swap)
+        # leaves the newer entries alone.
+        if version is None or (self._version is not None and version <= self._version):
+            return
+        if self._entries:
+            self.invalidations += 1
+        self._reset()
+        self._version = version
+
+    def _reset(self) -> None:
+        self.index.reset()
+        self._entries.clear()
+        self._order.clear()
+
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
@@ -0,0 +1,320 @@
+import math
+import os
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Seconds; spans a cached hit (~10 µs) to a cold model call (seconds).
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+LabelValues = Tuple[str, ...]
+# A scrape-time value: a number, or numbers by label values for labelled metrics.
+MetricFunction = Callable[[], Union[float, Dict[LabelValues, float]]]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class _Metric:
+    """One metric family: a name, help text, label names and its children."""
+
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[MetricFunction] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self._children: Dict[LabelValues, "_Metric"] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> "_Metric":
+        """
+        Returns the child for these label values, creating it on first use. Look it up
+        once and keep it, so the hot path pays no dict lookup.
+        """
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}")
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def remove(self, *values: str) -> None:
+        with self._lock:
+            self._children.pop(tuple(str(v) for v in values), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+    def collect(self) -> List[Sample]:
+        if self.function is not None:
+            value = self.function()
+            if not isinstance(value, dict):
+                return [(self.name, {}, float(value))]
+            return [
+                (self.name, dict(zip(self.labelnames, key)), float(v))
+                for key, v in value.items()
+            ]
+        if not self.labelnames:
+            return self._samples({})
+        samples: List[Sample] = []
+        for key, child in list(self._children.items()):
+            samples.extend(child._samples(dict(zip(self.labelnames, key))))
+        return samples
+
+    def _new_child(self) -> "_Metric":
+        return type(self)(self.name, self.documentation)
+
+    def _samples(self, labels: Dict[str, str]) -> List[Sample]:
+        raise NotImplementedError
+
+
+class _ThreadSlots:
+    """
+    Per-thread lists of numbers, summed column-wise when scraped.
+
+    Each thread only writes its own list, so updates need no lock and are never lost;
+    a scrape may read a value one update stale. Lists of finished threads are kept,
+    since their counts still belong to the totals (threads come from bounded pools).
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.local = threading.local()
+        self._all: List[List[float]] = []
+        self._lock = threading.Lock()
+
+    def new(self) -> List[float]:
+        slots: List[float] = [0] * self.size
+        self.local.slots = slots
+        with self._lock:
+            self._all.append(slots)
+        return slots
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            shards = list(self._all)
+        return [sum(column) for column in zip(*shards)] if shards else [0] * self.size
+
+
+class Counter(_Metric):
+    """A monotonically increasing count (requests, results, errors)."""
+
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._slots = _ThreadSlots(1)
+        self._local = self._slots.local
+
+    def inc(self, amount: float = 1.0) -> None:
+        try:
+            slots = self._local.slots
+        except AttributeError:
+            slots = self._slots.new()
+        slots[0] += amount
+
+    def _samples(self, labels: Dict[str, str]) -> List[Sample]:
+        return [(self.name, labels, self._slots.totals()[0])]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down; with `function`, read at scrape time."""
+
+    type = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def _samples(self, labels: Dict[str, str]) -> List[Sample]:
+        return [(self.name, labels, self._value)]
+
+
+class Histogram(_Metric):
+    """
+    Counts observations into cumulative `le` buckets, with their sum and count.
+
+    observe() is one bisect over the bucket bounds and two additions to the calling
+    thread's own slots, without a lock; buckets are only accumulated when scraped.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bound, one for +Inf, and the sum last.
+        self._slots = _ThreadSlots(len(self.buckets) + 2)
+        self._local = self._slots.local
+
+    def observe(self, value: float) -> None:
+        try:
+            slots = self._local.slots
+        except AttributeError:
+            slots = self._slots.new()
+        slots[bisect_left(self.buckets, value)] += 1
+        slots[-1] += value
+
+    def _new_child(self) -> "Histogram":
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def _samples(self, labels: Dict[str, str]) -> List[Sample]:
+        *counts, total = self._slots.totals()
+        samples: List[Sample] = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            samples.append(
+                (f"{self.name}_bucket", {**labels, "le": _format(bound)}, cumulative)
+            )
+        samples.append((f"{self.name}_sum", labels, total))
+        samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Holds metric families and renders them in the Prometheus text exposition format.
+
+    Creating a metric that already exists returns the existing one, so modules can
+    declare their metrics at import time and be re-imported safely. Passing a
+    `function` again points a scrape-time metric at new state (e.g. a new app).
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames=(), function=None):
+        return self._register(Counter, name, documentation, labelnames, function)
+
+    def gauge(self, name: str, documentation: str, labelnames=(), function=None):
+        return self._register(Gauge, name, documentation, labelnames, function)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = Histogram(name, documentation, labelnames, buckets)
+                self._metrics[name] = metric
+        return self._check(metric, Histogram)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            try:
+                samples = metric.collect()
+            except Exception as e:  # A broken callback must not break the scrape
+                lines.append(f"# {metric.name} unavailable: {e}")
+                continue
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(_sample_line(*sample) for sample in samples)
+        return "\n".join(lines) + "\n"
+
+    def _register(self, cls, name, documentation, labelnames, function):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, function)
+                self._metrics[name] = metric
+            elif function is not None:
+                metric.function = function
+        return self._check(metric, cls)
+
+    @staticmethod
+    def _check(metric: _Metric, cls: type):
+        if type(metric) is not cls:
+            raise ValueError(f"{metric.name} is already registered as a {metric.type}")
+        return metric
+
+
+# Prometheus' text exposition format, version 0.0.4.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = MetricsRegistry()
+
+
+def resident_memory_bytes() -> float:
+    """Current resident set size of this process (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # ru_maxrss is in KiB on Linux (bytes on macOS, where this is approximate).
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+REGISTRY.gauge(
+    "process_resident_memory_bytes",
+    "Resident memory size in bytes.",
+    function=resident_memory_bytes,
+)
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _sample_line(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in labels.items())
+        return f"{name}{{{rendered}}} {_format(value)}"
+    return f"{name} {_format(value)}"
@@ -0,0 +1,130 @@
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+from src.domain.entities import Chunk, Document
+from src.domain.ports import IChunkingStrategy
+
+# The strategy each worker process chunks with, installed once by the pool initializer
+# instead of being pickled with every task.
+_worker_strategy: Optional[IChunkingStrategy] = None
+
+
+def _init_worker(strategy: IChunkingStrategy) -> None:
+    global _worker_strategy
+    _worker_strategy = strategy
+
+
+def _chunk_batch(documents: List[Document]) -> List[List[Chunk]]:
+    assert _worker_strategy is not None
+    return [_worker_strategy.chunk(document) for document in documents]
+
+
+def _doc_bytes(document: Document) -> int:
+    return len(document.content)
+
+
+class ParallelChunker:
+    """
+    Chunks a stream of documents across a process pool.
+
+    Consecutive documents are grouped into batches of about `batch_bytes` of text, so
+    tasks are similar in cost however uneven the documents are, and pickling is paid
+    per batch rather than per document. Results come back in input order. Work stays
+    in-process when parallelism cannot pay for itself: with one worker, for streamed
+    documents (their text is read lazily, so it never crosses a process boundary), and
+    when the whole input is smaller than `min_parallel_bytes`.
+    """
+
+    def __init__(
+        self,
+        strategy: IChunkingStrategy,
+        max_workers: int = 1,
+        batch_bytes: int = 1 << 20,
+        min_parallel_bytes: int = 256 << 10,
+    ):
+        self.strategy = strategy
+        self.max_workers = max_workers
+        self.batch_bytes = batch_bytes
+        self.min_parallel_bytes = min_parallel_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def chunk_documents(
+        self, documents: Iterable[Document]
+    ) -> Iterator[Tuple[Document, Iterable[Chunk]]]:
+        """Yields (document, its chunks) in input order."""
+        if self.max_workers <= 1:
+            for document in documents:
+                yield document, self.strategy.chunk_stream(document)
+            return
+
+        # Results are held in order; a window of 2 batches per worker keeps every
+        # worker busy without reading arbitrarily far ahead of the consumer.
+        pending: Deque[Tuple[List[Document], Optional[Future]]] = deque()
+        window = 2 * self.max_workers
+        batch: List[Document] = []
+        batch_size = 0
+        seen_bytes = 0
+
+        for document in documents:
+            if document.is_streamed:
+                # Keep order: flush what is batched, then chunk this one here.
+                if batch:
+                    worth_it = seen_bytes >= self.min_parallel_bytes
+                    pending.append((batch, self._submit(batch) if worth_it else None))
+                    batch, batch_size = [], 0
+                pending.append(([document], None))
+            else:
+                batch.append(document)
+                batch_size += _doc_bytes(document)
+                seen_bytes += _doc_bytes(document)
+                if (
+                    batch_size >= self.batch_bytes
+                    and seen_bytes >= self.min_parallel_bytes
+                ):
+                    pending.append((batch, self._submit(batch)))
+                    batch, batch_size = [], 0
+            while len(pending) > window or (pending and _is_ready(pending[0])):
+                yield from self._collect(pending.popleft())
+
+        if batch:
+            # A small tail (or a tiny input overall) is not worth a round trip.
+            submit = self._pool is not None and batch_size >= self.batch_bytes // 4
+            pending.append((batch, self._submit(batch) if submit else None))
+        while pending:
+            yield from self._collect(pending.popleft())
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _submit(self, batch: List[Document]) -> Future:
+        if self._pool is None:
+            # 🟨 CAUTION: spawn, not fork: the ingestion pipeline runs other threads,
+            # and a forked child could inherit a lock one of them holds.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.strategy,),
+            )
+            logging.info(f"Started a {self.max_workers}-process chunking pool.")
+        return self._pool.submit(_chunk_batch, batch)
+
+    def _collect(
+        self, item: Tuple[List[Document], Optional[Future]]
+    ) -> Iterator[Tuple[Document, Iterable[Chunk]]]:
+        batch, future = item
+        if future is None:
+            for document in batch:
+                yield document, self.strategy.chunk_stream(document)
+        else:
+            yield from zip(batch, future.result())
+
+
+def _is_ready(item: Tuple[List[Document], Optional[Future]]) -> bool:
+    future = item[1]
+    return future is None or future.done()
@@ -0,0 +1,95 @@
+import logging
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, Tuple
+
+# A stage turns the stream of items from upstream into the stream it passes on; it is
+# a generator function, so it can batch, split or drop items.
+Stage = Tuple[str, Callable[[Iterator[Any]], Iterable[Any]]]
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _put(q: queue.Queue, item: Any, cancel: threading.Event) -> bool:
+    # Blocks while the queue is full (backpressure), but gives up once cancelled.
+    while not cancel.is_set():
+        try:
+            q.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(q: queue.Queue, cancel: threading.Event) -> Iterator[Any]:
+    while True:
+        try:
+            item = q.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            if cancel.is_set():
+                return
+            continue
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+def _pump(items: Iterable[Any], q: queue.Queue, cancel: threading.Event) -> None:
+    try:
+        for item in items:
+            if not _put(q, item, cancel):
+                return
+        _put(q, _DONE, cancel)
+    except BaseException as e:
+        # Forward the error downstream; it is re-raised on the calling thread.
+        _put(q, _Failure(e), cancel)
+
+
+def run_pipeline(
+    source: Iterable[Any],
+    stages: Sequence[Stage],
+    sink: Callable[[Any], None],
+    queue_size: int = 4,
+) -> None:
+    """
+    Runs source -> stages -> sink with one thread per stage and a bounded queue of
+    `queue_size` items between neighbours.
+
+    A full queue blocks its producer, so at most queue_size items wait between any two
+    stages and memory stays flat however long the source is. The source and each stage
+    run on their own thread, so I/O-bound stages overlap with CPU-bound ones; the sink
+    runs on the calling thread. The first error raised anywhere cancels every stage and
+    is re-raised here.
+    """
+    cancel = threading.Event()
+    threads: List[threading.Thread] = []
+
+    def start(name: str, items: Iterable[Any]) -> queue.Queue:
+        q: queue.Queue = queue.Queue(maxsize=queue_size)
+        thread = threading.Thread(
+            target=_pump, args=(items, q, cancel), name=f"pipeline-{name}", daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+        return q
+
+    upstream = start("source", source)
+    for name, stage in stages:
+        upstream = start(name, stage(_drain(upstream, cancel)))
+
+    try:
+        for item in _drain(upstream, cancel):
+            sink(item)
+    finally:
+        cancel.set()
+        for thread in threads:
+            thread.join()
+        logging.debug("Pipeline threads stopped.")
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from src.domain.entities import Chunk
+
+# Answers a list of queries with one list of chunks each, in order; e.g.
+# QueryService.search_batch. Called on a worker thread.
+SearchBatch = Callable[[List[str], int], List[List[Chunk]]]
+
+
+@dataclass
+class _PendingQuery:
+    query: str
+    top_k: int
+    future: "asyncio.Future[List[Chunk]]"
+
+
+class QueryBatcher:
+    """
+    Coalesces concurrent queries into micro-batches answered by one SearchBatch call.
+
+    A batch closes when it holds `max_batch_size` queries or `max_wait_ms` after its
+    first query arrived, and is then embedded and searched on a worker thread, so the
+    event loop keeps accepting requests. One batch runs at a time: queries arriving
+    meanwhile form the next batch, so batches grow with load and a lone query waits at
+    most `max_wait_ms`. Each batch is searched with its largest top_k and every result
+    list is cut to its own query's top_k. `max_batch_size` and `max_wait_ms` are read
+    per batch, so they can be changed while the batcher runs (e.g. on a config reload).
+    """
+
+    def __init__(
+        self,
+        search_batch: SearchBatch,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.search_batch = search_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: Optional["asyncio.Queue[_PendingQuery]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self.batches = 0
+        self.queries = 0
+
+    async def search(self, query: str, top_k: int = 3) -> List[Chunk]:
+        """Returns the top_k chunks for `query`, answered as part of a batch."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_PendingQuery(query, top_k, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stops the batching task; queries still queued are cancelled."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            self._queue.get_nowait().future.cancel()
+        self._worker = None
+
+    async def _next_batch(self) -> List[_PendingQuery]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            # Queries queued while the previous batch ran are taken without waiting.
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            else:
+                batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = [p for p in await self._next_batch() if not p.future.done()]
+            if not batch:
+                continue
+            top_k = max(p.top_k for p in batch)
+            try:
+                results = await asyncio.to_thread(
+                    self.search_batch, [p.query for p in batch], top_k
+                )
+            except Exception as e:
+                logging.error(f"Query batch of {len(batch)} failed: {e}")
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                continue
+            self.batches += 1
+            self.queries += len(batch)
+            for pending, chunks in zip(batch, results):
+                # Requests cancelled meanwhile (client gone) have no one to answer.
+                if not pending.future.done():
+                    pending.future.set_result(chunks[: pending.top_k])
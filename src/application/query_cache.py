@@ -0,0 +1,196 @@
+import json
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.domain.entities import Chunk
+
+_WHITESPACE = re.compile(r"\s+")
+
+CacheKey = Tuple[str, int, str]
+
+
+def normalize_query(query: str) -> str:
+    """NFC-normalizes and collapses whitespace, as the embedding cache does for its keys."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", query)).strip()
+
+
+def result_cache_key(
+    query: str, top_k: int, metadata_filter: Optional[Dict[str, Any]] = None
+) -> CacheKey:
+    return (
+        normalize_query(query),
+        top_k,
+        json.dumps(metadata_filter, sort_keys=True, default=str)
+        if metadata_filter
+        else "",
+    )
+
+
+def _result_bytes(key: CacheKey, chunks: List[Chunk]) -> int:
+    # An estimate: the strings held per entry dominate; containers are small.
+    size = sum(sys.getsizeof(part) for part in key)
+    for chunk in chunks:
+        size += sys.getsizeof(chunk.id) + sys.getsizeof(chunk.document_id)
+        size += sys.getsizeof(chunk.content)
+        size += len(json.dumps(chunk.metadata, default=str))
+    return size
+
+
+@dataclass
+class _Entry:
+    chunks: List[Chunk]
+    size: int
+    expires_at: float
+
+
+class QueryResultCache:
+    """
+    LRU cache of search results, keyed by normalized query text, top_k and metadata
+    filter, for one index version at a time.
+
+    Every lookup and store passes the repository's current index_version(); when it
+    differs from the version the cache holds, the cache is cleared first, so results
+    never outlive the index they came from (ingestion, hot reload, config reload).
+    Entries also expire `ttl_seconds` after being stored (0 = never), and the least
+    recently used are evicted beyond `max_entries` or `max_bytes` (an estimate of the
+    chunks' text held). Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 << 20,
+        ttl_seconds: float = 300.0,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    def get(
+        self,
+        query: str,
+        top_k: int,
+        version: Optional[int],
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> Optional[List[Chunk]]:
+        """Returns the cached chunks, or None on a miss. A None version never hits."""
+        if not self.enabled:
+            return None
+        key = result_cache_key(query, top_k, metadata_filter)
+        with self._lock:
+            self._sync_version(version)
+            entry = self._entries.get(key) if version is not None else None
+            if entry is not None and entry.expires_at < time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry.chunks)
+
+    def put(
+        self,
+        query: str,
+        top_k: int,
+        version: Optional[int],
+        chunks: List[Chunk],
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Stores the chunks found for a query at `version`: the index version read
+        before searching, so a result that raced with a swap is stored under the old
+        version and dropped with it.
+        """
+        if not self.enabled or version is None:
+            return
+        key = result_cache_key(query, top_k, metadata_filter)
+        size = _result_bytes(key, chunks)
+        if size > self.max_bytes:
+            return
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+        )
+        with self._lock:
+            self._sync_version(version)
+            if version != self._version:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(list(chunks), size, expires_at)
+            self._bytes += size
+            self._evict()
+
+    def configure(self, max_entries: int, max_bytes: int, ttl_seconds: float) -> None:
+        """
+        Applies new limits in place (e.g. on a config reload), evicting the least
+        recently used entries beyond them. A new TTL applies to entries stored from now.
+        """
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self.ttl_seconds = ttl_seconds
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "index_version": self._version,
+            "entries": len(self._entries),
+            "memory_bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _sync_version(self, version: Optional[int]) -> None:
+        # Versions only grow, so an older one (a lookup that raced with a swap)
+        # leaves the newer entries alone.
+        if version is None or (self._version is not None and version <= self._version):
+            return
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._bytes = 0
+        self._version = version
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: CacheKey) -> None:
+        self._bytes -= self._entries.pop(key).size
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from src.application.services.query_service import QueryService
+
+WARM_UP_QUERY = "How do I configure the service?"
+
+
+class ReloadInProgressError(RuntimeError):
+    """Raised when a reload is requested while another one is still running."""
+
+    def __init__(self, job_id: str):
+        super().__init__(f"Reload {job_id} is still running.")
+        self.job_id = job_id
+
+
+@dataclass
+class ReloadJob:
+    id: str
+    # pending -> building -> warming -> succeeded, or failed at any step.
+    status: str = "pending"
+    created_at: str = ""
+    finished_at: Optional[str] = None
+    config_version: Optional[str] = None
+    reused_embedding_service: bool = False
+    reused_index: bool = False
+    build_seconds: Optional[float] = None
+    warm_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class BuiltService:
+    """
+    What a build step returns: the new service, the config it was built from, and the
+    (not yet started) refresher that keeps a newly loaded index current, if any.
+    """
+
+    query_service: QueryService
+    config: Any = None
+    config_version: Optional[str] = None
+    reused_embedding_service: bool = False
+    reused_index: bool = False
+    index_refresher: Any = None
+
+
+class ServiceReloader:
+    """
+    Rebuilds the QueryService on a background thread and swaps it in once it is warm.
+
+    `build` constructs the replacement (reload config, embedding service, index);
+    it is then warmed by embedding a query and searching the index with it, so model
+    weights, lazy imports and index pages are loaded before any request sees it.
+    Only then is it handed to `publish`, which swaps it in with a single reference
+    assignment: queries see either the old service or the warm new one. A failed
+    reload leaves the old service serving. One reload runs at a time; jobs are kept
+    for polling until `max_jobs` newer ones exist.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], BuiltService],
+        publish: Callable[[BuiltService], None],
+        warm_up_query: str = WARM_UP_QUERY,
+        max_jobs: int = 20,
+    ):
+        self.build = build
+        self.publish = publish
+        self.warm_up_query = warm_up_query
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, ReloadJob]" = OrderedDict()
+        self._active: Optional[ReloadJob] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> ReloadJob:
+        """Starts a reload and returns its job; raises ReloadInProgressError if busy."""
+        with self._lock:
+            if self._active is not None and not self._active.done:
+                raise ReloadInProgressError(self._active.id)
+            job = ReloadJob(id=uuid.uuid4().hex, created_at=_now())
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+            self._active = job
+            self._thread = threading.Thread(
+                target=self._run, args=(job,), name=f"reload-{job.id[:8]}", daemon=True
+            )
+            self._thread.start()
+        return job
+
+    def get(self, job_id: str) -> Optional[ReloadJob]:
+        return self._jobs.get(job_id)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Waits for the running reload, if any, to finish."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self, job: ReloadJob) -> None:
+        try:
+            job.status = "building"
+            start = time.perf_counter()
+            built = self.build()
+            job.build_seconds = time.perf_counter() - start
+            job.config_version = built.config_version
+            job.reused_embedding_service = built.reused_embedding_service
+            job.reused_index = built.reused_index
+
+            job.status = "warming"
+            start = time.perf_counter()
+            self._warm(built.query_service)
+            job.warm_seconds = time.perf_counter() - start
+
+            self.publish(built)
+            job.status = "succeeded"
+            logging.info(
+                f"Reload {job.id} swapped in config version {job.config_version} "
+                f"(built in {job.build_seconds:.2f}s, warmed in "
+                f"{job.warm_seconds:.2f}s, embedding service "
+                f"{'reused' if job.reused_embedding_service else 'rebuilt'}, index "
+                f"{'reused' if job.reused_index else 'reloaded'})."
+            )
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logging.error(f"Reload {job.id} failed: {e}", exc_info=True)
+        finally:
+            job.finished_at = _now()
+
+    def _warm(self, query_service: QueryService) -> None:
+        # Straight to the model and the index, so the result caches stay empty.
+        embedding = query_service.embedding_service.embed_query(self.warm_up_query)
+        query_service.vector_repository.search(embedding, top_k=1)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
@@ -1,5 +1,8 @@
 import logging
-from typing import List
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from src.domain.ports import (
     IDataSource,
     IChunkingStrategy,
@@ -7,7 +10,42 @@ from src.domain.ports import (
     IVectorRepository,
 )
 from src.domain.entities.document import Document
-from src.domain.entities.chunk import Chunk
+from src.domain.entities.chunk import Chunk, chunk_content_id
+from src.domain.entities.chunk_diff import ChunkDiff
+from src.application.parallel_chunking import ParallelChunker
+from src.application.pipeline import run_pipeline
+
+import numpy as np
+
+
+@dataclass
+class IngestionStats:
+    """Counts for one streamed ingestion."""
+
+    documents: int = 0
+    chunks: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    # Chunk diffs of documents that replace a stored version (see run()).
+    diffs: List[ChunkDiff] = field(default_factory=list)
+    checkpoints: int = 0
+    checkpoint_seconds: float = 0.0
+
+    @property
+    def reused_chunks(self) -> int:
+        return sum(len(diff.unchanged) for diff in self.diffs)
+
+
+@dataclass
+class _Batch:
+    """Chunks passed from the chunk stage through embedding to the repository."""
+
+    chunks: List[Chunk]
+    # Set when the batch ends exactly where a document ends, so a checkpoint taken
+    # after adding it holds only complete documents: the last one's id, and how many
+    # of stats.diffs belong to documents finished by then.
+    last_document_id: Optional[str] = None
+    diffs: int = 0
 
 
 class IngestionService:
@@ -22,18 +60,33 @@ class IngestionService:
         chunking_strategy: IChunkingStrategy,
         embedding_service: IEmbeddingService,
         vector_repository: IVectorRepository,
+        embed_batch_size: int = 1024,
+        queue_size: int = 4,
+        chunk_workers: int = 1,
+        checkpoint_every_chunks: int = 0,
+        checkpoint_every_seconds: float = 0.0,
     ):
         """
         Initializes the service with its dependencies, injected via interfaces (Ports).
         This adheres to the Dependency Inversion Principle.
+        `embed_batch_size` is the micro-batch of chunks sent to the embedding service;
+        `queue_size` bounds the documents / batches waiting between pipeline stages;
+        `chunk_workers` > 1 chunks in a process pool (see ParallelChunker);
+        `checkpoint_every_chunks` / `checkpoint_every_seconds` save the repository
+        during a run, whichever comes first (0 disables either; see _stream).
         """
         self.data_source = data_source
         self.chunking_strategy = chunking_strategy
         self.embedding_service = embedding_service
         self.vector_repository = vector_repository
+        self.embed_batch_size = embed_batch_size
+        self.queue_size = queue_size
+        self.chunk_workers = chunk_workers
+        self.checkpoint_every_chunks = checkpoint_every_chunks
+        self.checkpoint_every_seconds = checkpoint_every_seconds
         logging.info("IngestionService initialized with all dependencies.")
 
-    def ingest(self) -> None:
+    def ingest(self, resume: bool = False) -> None:
         """
         Executes the full ingestion pipeline:
         1. Loads documents from the data source.
@@ -41,33 +94,241 @@ class IngestionService:
         3. Generates vector embeddings for each chunk.
         4. Adds the vectorized chunks to the repository.
         5. Persists the repository state.
+        Steps 1-4 are streamed (see `_stream`), so memory stays flat in corpus size.
+        With `resume`, the repository's last checkpoint is loaded first and only the
+        documents it does not hold are ingested.
         """
         logging.info("Starting document ingestion process...")
 
-        # 1. Load all documents
-        documents: List[Document] = self.data_source.load_all()
-        if not documents:
+        documents = self.data_source.iter_all()
+        if resume:
+            # Checkpoints hold only complete documents, so the stored document ids
+            # are the progress cursor.
+            self.vector_repository.load()
+            done = self.vector_repository.get_all_document_identifiers()
+            logging.info(
+                f"Resuming from the last checkpoint: {len(done)} documents are "
+                "already ingested and will be skipped."
+            )
+            documents = self.data_source.iter_new(done)
+
+        stats = self._stream(documents)
+        if not stats.documents:
             logging.warning("No documents found to ingest. Pipeline finished early.")
             return
-        logging.info(f"Loaded {len(documents)} documents.")
-
-        # 2. Chunk
-        all_chunks: List[Chunk] = []
-        for doc in documents:
-            chunks = self.chunking_strategy.chunk(doc)
-            all_chunks.extend(chunks)
-        logging.info(f"Split documents into {len(all_chunks)} chunks.")
-
-        # 3. Embed
-        self.embedding_service.embed_chunks(all_chunks)
-        logging.info("Generated embeddings for all chunks.")
-
-        # 4. Add to repository
-        self.vector_repository.add(all_chunks)
-        logging.info("Added chunks to the vector repository.")
 
         # 5. Persist
         self.vector_repository.save()
         logging.info("Persisted the vector repository.")
 
         logging.info("Document ingestion process completed successfully.")
+
+    def run(self) -> None:
+        """
+        Executes a full, idempotent synchronization of the vector store.
+        1. Lists the source once and diffs it against the vector store's ids (SyncPlan).
+        2. Streams new or updated documents from the plan through the pipeline. A
+           document replacing a stored version (same `source`) is diffed chunk by
+           chunk: only chunks whose content is new are embedded and added.
+        3. Carries the unchanged chunks' vectors over to the new versions, deletes
+           documents that are no longer in the source, then persists.
+        Checkpoints taken while streaming store complete documents, with their
+        previous versions already carried over, so a run that dies midway resumes
+        by simply running again on the checkpointed repository: the plan skips what
+        it holds.
+        """
+        logging.info("Starting full synchronization run...")
+
+        # The S3 adapter uses ETags as IDs, so this correctly identifies new/modified files.
+        start = time.perf_counter()
+        repo_doc_ids = self.vector_repository.get_all_document_identifiers()
+        plan = self.data_source.plan_sync(repo_doc_ids)
+        logging.info(
+            f"Sync plan: {plan.summary()} ({len(repo_doc_ids)} documents in "
+            f"repository); listed and computed in {time.perf_counter() - start:.3f}s."
+        )
+
+        previous = self._previous_versions(plan.to_delete)
+        stats = self._stream(self.data_source.iter_planned(plan), previous)
+        if not stats.documents:
+            logging.info("No new or updated documents to ingest.")
+
+        # Previous versions were carried over by _stream; deleting them first would
+        # discard their vectors.
+        replaced = {diff.previous_document_id for diff in stats.diffs}
+        to_delete = [doc_id for doc_id in plan.to_delete if doc_id not in replaced]
+        if to_delete:
+            self.vector_repository.delete_by_document_id(to_delete)
+        if stats.diffs:
+            logging.info(
+                f"Re-chunked {len(stats.diffs)} changed documents incrementally: "
+                f"{stats.reused_chunks} chunks kept their vectors, "
+                f"{sum(d.added for d in stats.diffs)} were embedded, "
+                f"{sum(d.removed for d in stats.diffs)} were removed."
+            )
+
+        # Saved even without additions, to persist deletions.
+        self.vector_repository.save()
+        logging.info("Full synchronization run completed.")
+
+    def _previous_versions(
+        self, doc_ids: List[str]
+    ) -> Dict[str, Tuple[str, List[str]]]:
+        """
+        Maps the `source` of each stored document about to be replaced or deleted to
+        (its document id, its chunk ids), for diffing against the new version.
+        """
+        previous: Dict[str, Tuple[str, List[str]]] = {}
+        stored = self.vector_repository.get_chunks_by_document_id(doc_ids)
+        for doc_id, chunks in stored.items():
+            source = chunks[0].metadata.get("source") if chunks else None
+            if source and source not in previous:
+                previous[source] = (doc_id, [chunk.id for chunk in chunks])
+        return previous
+
+    def _stream(
+        self,
+        documents: Iterable[Document],
+        previous: Optional[Dict[str, Tuple[str, List[str]]]] = None,
+    ) -> IngestionStats:
+        """
+        Runs load -> chunk -> embed -> add as a pipeline of threads joined by bounded
+        queues. Reading the next document, chunking, and embedding the previous batch
+        overlap, and at most `queue_size` documents and batches are in flight between
+        stages, so memory is bounded by the batch size rather than the corpus size.
+        Chunks are added to the repository on the calling thread, in source order.
+        Chunk ids are content hashes; chunks of a document found in `previous` (by
+        source) that match a previous chunk are recorded in stats.diffs, not embedded.
+        Their vectors are carried over from the previous version at each checkpoint
+        and at the end.
+
+        When a checkpoint is due, the sink asks the chunk stage to cut the current
+        batch at the end of a document, then checkpoints the repository once that batch
+        is added, so a checkpoint never holds part of a document. A single document
+        larger than the interval delays the checkpoint until it ends; a repository
+        that cannot persist yet (an untrained IVF index) is retried an interval later.
+        """
+        previous = dict(previous or {})
+        stats = IngestionStats()
+        start = time.perf_counter()
+        dim = self.embedding_service.get_dimension()
+        cut_requested = threading.Event()
+
+        def chunk(docs: Iterator[Document]) -> Iterator[_Batch]:
+            chunker = ParallelChunker(self.chunking_strategy, self.chunk_workers)
+            batch: List[Chunk] = []
+            doc_id = None
+            try:
+                for doc, pieces in chunker.chunk_documents(docs):
+                    doc_id = doc.id
+                    stats.documents += 1
+                    source = doc.metadata.get("source")
+                    diff = None
+                    if source in previous:
+                        diff = ChunkDiff.start(*previous.pop(source))
+                        stats.diffs.append(diff)
+                    # Chunks are batched as they are produced, so a streamed document
+                    # never has all of its chunks (or its text) in memory at once.
+                    for piece in pieces:
+                        piece.id = chunk_content_id(piece.content)
+                        if source is not None:
+                            # Finds this version's successor on the next sync.
+                            piece.metadata.setdefault("source", source)
+                        if diff is not None and not diff.classify(piece):
+                            continue
+                        batch.append(piece)
+                        if len(batch) == self.embed_batch_size:
+                            yield _Batch(batch)
+                            batch = []
+                    if batch and cut_requested.is_set():
+                        cut_requested.clear()
+                        yield _Batch(batch, doc_id, len(stats.diffs))
+                        batch = []
+                if batch:
+                    yield _Batch(batch, doc_id, len(stats.diffs))
+            finally:
+                chunker.close()
+
+        def embed(batches: Iterator[_Batch]) -> Iterator[_Batch]:
+            for batch in batches:
+                # 🟦 NOTE: This stage runs ahead of add(), so each batch gets its own
+                # buffer, copied once when it is added (add() then drops the chunks'
+                # views, so the buffer is freed with the batch).
+                buffer = np.zeros((len(batch.chunks), dim), dtype=np.float32)
+                self.embedding_service.embed_chunks(batch.chunks, out=buffer)
+                for chunk, row in zip(batch.chunks, buffer):
+                    chunk.embedding = row
+                yield batch
+
+        carried = 0
+        checkpointed_chunks, checkpointed_at = 0, start
+        cut_pending = False
+
+        def carry_over(diffs: int) -> None:
+            nonlocal carried
+            for diff in stats.diffs[carried:diffs]:
+                self.vector_repository.carry_over(
+                    diff.previous_document_id, diff.unchanged
+                )
+            carried = max(carried, diffs)
+
+        def checkpoint_due() -> bool:
+            every_chunks = self.checkpoint_every_chunks
+            every_seconds = self.checkpoint_every_seconds
+            if every_chunks and stats.chunks - checkpointed_chunks >= every_chunks:
+                return True
+            return bool(every_seconds) and (
+                time.perf_counter() - checkpointed_at >= every_seconds
+            )
+
+        def checkpoint(batch: _Batch) -> None:
+            nonlocal checkpointed_chunks, checkpointed_at
+            started = time.perf_counter()
+            carry_over(batch.diffs)
+            saved = self.vector_repository.checkpoint()
+            # A skipped checkpoint is retried after another interval, not every batch.
+            checkpointed_at = time.perf_counter()
+            checkpointed_chunks = stats.chunks
+            if not saved:
+                return
+            seconds = checkpointed_at - started
+            stats.checkpoints += 1
+            stats.checkpoint_seconds += seconds
+            logging.info(
+                f"Checkpoint {stats.checkpoints}: saved {stats.chunks} chunks through "
+                f"document {batch.last_document_id!r} in {seconds:.2f}s."
+            )
+
+        def add(batch: _Batch) -> None:
+            nonlocal cut_pending
+            self.vector_repository.add(batch.chunks)
+            stats.chunks += len(batch.chunks)
+            stats.batches += 1
+            if not checkpoint_due():
+                return
+            if batch.last_document_id is not None:
+                checkpoint(batch)
+                cut_pending = False
+            elif not cut_pending:
+                cut_pending = True
+                cut_requested.set()
+
+        run_pipeline(
+            documents,
+            [("chunk", chunk), ("embed", embed)],
+            add,
+            queue_size=self.queue_size,
+        )
+        carry_over(len(stats.diffs))
+        stats.seconds = time.perf_counter() - start
+        logging.info(
+            f"Streamed {stats.documents} documents into {stats.chunks} chunks "
+            f"({stats.batches} batches of <= {self.embed_batch_size}) "
+            f"in {stats.seconds:.2f}s."
+        )
+        if stats.checkpoints:
+            logging.info(
+                f"{stats.checkpoints} checkpoints took {stats.checkpoint_seconds:.2f}s "
+                f"({stats.checkpoint_seconds / stats.seconds:.0%} of the run)."
+            )
+        return stats
@@ -1,8 +1,19 @@
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
+from src.application.metrics import REGISTRY
 from src.domain.entities.chunk import Chunk
-from src.domain.ports import IEmbeddingService, IVectorRepository
+from src.domain.ports import IEmbeddingService, ISemanticQueryCache, IVectorRepository
+
+EMBED_SECONDS = REGISTRY.histogram(
+    "rag_query_embed_seconds", "Time to embed query texts, per embedding call."
+)
+SEARCH_SECONDS = REGISTRY.histogram(
+    "rag_query_search_seconds", "Time to search the vector repository, per call."
+)
 
 
 class QueryService:
@@ -14,9 +25,11 @@ class QueryService:
         self,
         embedding_service: IEmbeddingService,
         vector_repository: IVectorRepository,
+        semantic_cache: Optional[ISemanticQueryCache] = None,
     ):
         self.embedding_service = embedding_service
         self.vector_repository = vector_repository
+        self.semantic_cache = semantic_cache
 
     def query(
         self, question: str, context: Optional[Dict[str, Any]] = None
@@ -29,15 +42,19 @@ class QueryService:
             return {"error": "QueryService is not fully configured."}
 
         # Step 1: Embed the question
+        start = time.perf_counter()
         embedding = self.embedding_service.embed_query(question)
+        EMBED_SECONDS.observe(time.perf_counter() - start)
 
         # Step 2: Query the vector store using the correct interface method
         # Use search(), not query(), and pass context as metadata_filter if present
+        start = time.perf_counter()
         results = self.vector_repository.search(
             query_embedding=embedding,
             top_k=3,
             metadata_filter=context,
         )
+        SEARCH_SECONDS.observe(time.perf_counter() - start)
 
         # Step 3: Format and return the response
         return {
@@ -54,13 +71,79 @@ class QueryService:
             "meta": {"service": "QueryService", "version": "1.0.0"},
         }
 
-    def search(self, query: str, top_k: int = 3) -> List[Chunk]:
+    def search(
+        self, query: str, top_k: int = 3, use_semantic_cache: bool = False
+    ) -> List[Chunk]:
         """
         Given a query string, returns the top_k most relevant document chunks.
+        With use_semantic_cache, close paraphrases of recent queries reuse their results.
         """
         logging.info("Embedding query text...")
+        start = time.perf_counter()
         query_embedding = self.embedding_service.embed_query(query)
+        EMBED_SECONDS.observe(time.perf_counter() - start)
+        if use_semantic_cache and self.semantic_cache is not None:
+            return self._search_embeddings(
+                query_embedding[np.newaxis], top_k, use_semantic_cache
+            )[0]
         logging.info("Searching vector repository...")
+        start = time.perf_counter()
         results = self.vector_repository.search(query_embedding, top_k=top_k)
+        SEARCH_SECONDS.observe(time.perf_counter() - start)
         # Only return the Chunk objects, not the (Chunk, score) tuples
         return [chunk for chunk, _ in results]
+
+    def search_batch(
+        self, queries: List[str], top_k: int = 3, use_semantic_cache: bool = False
+    ) -> List[List[Chunk]]:
+        """
+        Returns the top_k most relevant chunks for each query, in input order.
+        All queries are embedded in one model call and searched in one index call.
+        use_semantic_cache is for /query traffic only: callers that need exact
+        results for every query (e.g. /query/batch) leave it off.
+        """
+        if not queries:
+            return []
+        logging.info(f"Embedding {len(queries)} query texts...")
+        start = time.perf_counter()
+        query_embeddings = self.embedding_service.embed_queries(queries)
+        EMBED_SECONDS.observe(time.perf_counter() - start)
+        return self._search_embeddings(query_embeddings, top_k, use_semantic_cache)
+
+    def _search_embeddings(
+        self, query_embeddings: np.ndarray, top_k: int, use_semantic_cache: bool
+    ) -> List[List[Chunk]]:
+        """
+        Searches the vector repository for each row of a query matrix, answering
+        from the semantic cache first, if there is one and it is asked for: only
+        its misses are searched.
+        """
+        # One repository throughout, even if a hot reload swaps it meanwhile.
+        repository = self.vector_repository
+        if not use_semantic_cache or self.semantic_cache is None:
+            logging.info("Searching vector repository...")
+            start = time.perf_counter()
+            results = repository.search_batch(query_embeddings, top_k=top_k)
+            SEARCH_SECONDS.observe(time.perf_counter() - start)
+            return [[chunk for chunk, _ in hits] for hits in results]
+
+        # Read before searching, so results racing with a swap stay with the old version.
+        version = repository.index_version()
+        answers = self.semantic_cache.lookup(query_embeddings, top_k, version)
+        misses = [i for i, chunks in enumerate(answers) if chunks is None]
+        if misses:
+            logging.info(
+                f"Searching vector repository for {len(misses)} of "
+                f"{len(answers)} queries (semantic cache misses)..."
+            )
+            start = time.perf_counter()
+            results = repository.search_batch(query_embeddings[misses], top_k=top_k)
+            search_seconds = time.perf_counter() - start
+            SEARCH_SECONDS.observe(search_seconds)
+            found = [[chunk for chunk, _ in hits] for hits in results]
+            self.semantic_cache.add(
+                query_embeddings[misses], found, top_k, version, search_seconds
+            )
+            for i, chunks in zip(misses, found):
+                answers[i] = chunks
+        return answers
@@ -1,4 +1,6 @@
 from .document import Document
-from .chunk import Chunk
+from .chunk import Chunk, chunk_content_id
+from .chunk_diff import ChunkDiff
+from .sync_plan import SyncPlan
 
-__all__ = ["Document", "Chunk"]
+__all__ = ["Document", "Chunk", "chunk_content_id", "ChunkDiff", "SyncPlan"]
@@ -1,7 +1,19 @@
+import hashlib
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 import numpy as np
 
+# Hex digits of the SHA-256 content hash used as a chunk id.
+CHUNK_ID_HASH_CHARS = 32
+
+
+def chunk_content_id(content: str) -> str:
+    """
+    A chunk id derived from its text alone, so a chunk that survives an edit to its
+    document keeps its id (and its stored vector) across document versions.
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:CHUNK_ID_HASH_CHARS]
+
 
 @dataclass
 class Chunk:
@@ -0,0 +1,44 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, List
+
+from .chunk import Chunk
+
+
+@dataclass
+class ChunkDiff:
+    """
+    The chunk-level difference between a stored document version and its successor.
+    Chunk ids are content hashes (see chunk_content_id), so a chunk of the new version
+    whose id the previous version also had is unchanged and can keep its vector; the
+    rest must be embedded. Ids are compared as multisets, so repeated chunks (license
+    headers, boilerplate) are matched one for one.
+    """
+
+    previous_document_id: str
+    remaining: Counter = field(default_factory=Counter)
+    unchanged: List[Chunk] = field(default_factory=list)
+    added: int = 0
+
+    @classmethod
+    def start(
+        cls, previous_document_id: str, previous_chunk_ids: Iterable[str]
+    ) -> "ChunkDiff":
+        return cls(previous_document_id, Counter(previous_chunk_ids))
+
+    def classify(self, chunk: Chunk) -> bool:
+        """
+        Records one chunk of the new version, in order. Returns True if it is new and
+        must be embedded, False if it matches a previous chunk.
+        """
+        if self.remaining[chunk.id] > 0:
+            self.remaining[chunk.id] -= 1
+            self.unchanged.append(chunk)
+            return False
+        self.added += 1
+        return True
+
+    @property
+    def removed(self) -> int:
+        """Previous chunks with no counterpart in the new version."""
+        return sum(self.remaining.values())
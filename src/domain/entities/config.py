@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 
 # --- Individual Component Models ---
 
@@ -7,14 +7,32 @@ from typing import Optional
 class DataSourceConfig(BaseModel):
     type: str
     path: str | None = None  # Used by file_system
+    include: list[str] | None = None  # file_system globs; default all files
+    exclude: list[str] | None = None  # file_system globs; default VCS / cache dirs
+    manifest_path: str | None = None  # file_system (path, size, mtime, hash) record
     bucket: str | None = None  # Used by s3
     prefix: str | None = None  # Used by s3
+    max_workers: int = Field(default=32, gt=0)  # Concurrent S3 GETs (and pool size)
+    ordered: bool = True  # Yield S3 documents in listing order, or as they arrive
+    listing_ttl_seconds: float = Field(default=300.0, gt=0)  # S3 id lookup snapshot
+    # Documents at least this large are streamed (mmap / ranged GETs) into the chunker
+    stream_threshold_bytes: int = Field(default=16 << 20, gt=0)
 
 
 class ChunkingStrategyConfig(BaseModel):
-    type: str
-    chunk_size: int = Field(..., gt=0)
+    type: str  # "recursive" (built-in), "langchain" or "token_budget"
+    chunk_size: int = Field(..., gt=0)  # Characters; tokens for "token_budget"
     chunk_overlap: int = Field(..., ge=0)
+    # Hugging Face tokenizer (hub name or tokenizer.json path) for "token_budget";
+    # token counts are approximated without one.
+    tokenizer: Optional[str] = None
+
+
+class EmbeddingCacheConfig(BaseModel):
+    enabled: bool = True
+    path: str  # SQLite file, e.g. next to the index
+    max_bytes: int = Field(default=1 << 30, gt=0)  # On-disk budget
+    memory_max_bytes: int = Field(default=64 << 20, gt=0)  # In-process LRU budget
 
 
 class EmbeddingServiceConfig(BaseModel):
@@ -22,6 +40,10 @@ class EmbeddingServiceConfig(BaseModel):
     model_name: str | None = None
     aws_region: str | None = None
     model_id: str | None = None
+    max_concurrency: int | None = Field(
+        default=None, gt=0
+    )  # Bedrock requests in flight
+    cache: EmbeddingCacheConfig | None = None
 
 
 class VectorRepositoryConfig(BaseModel):
@@ -29,6 +51,34 @@ class VectorRepositoryConfig(BaseModel):
     persist_path: str  # Local path inside the container
     s3_bucket: str | None = None  # Used for cloud persistence
     s3_key: str | None = None  # Used for cloud persistence
+    index_type: Literal["flat", "hnsw", "ivf_flat", "ivf_pq"] = "flat"
+    hnsw_m: int = Field(default=32, gt=0)  # Graph degree (build time)
+    hnsw_ef_construction: int = Field(default=200, gt=0)  # Build-time beam width
+    hnsw_ef_search: int = Field(default=64, gt=0)  # Query-time beam width
+    ivf_nlist: int = Field(default=1024, gt=0)  # Number of IVF cells
+    ivf_nprobe: int = Field(default=16, gt=0)  # Cells scanned per query
+    pq_m: int = Field(default=16, gt=0)  # PQ sub-quantizers (must divide dim)
+    pq_nbits: int = Field(default=8, gt=0)  # Bits per PQ code
+    s3_poll_interval_seconds: float = Field(default=30.0, gt=0)  # API hot reload
+
+
+class IngestionConfig(BaseModel):
+    embed_batch_size: int = Field(default=1024, gt=0)  # Chunks per embedding call
+    queue_size: int = Field(default=4, gt=0)  # Items waiting between pipeline stages
+    chunk_workers: int = Field(default=1, gt=0)  # Chunking processes; 1 = in-process
+    checkpoint_every_chunks: int = Field(default=0, ge=0)  # Save per N chunks; 0 = off
+    checkpoint_every_seconds: float = Field(default=0.0, ge=0)  # Or per T s; 0 = off
+    resume: bool = False  # Load the last checkpoint and skip the documents it holds
+
+
+class QueryConfig(BaseModel):
+    max_batch_size: int = Field(default=32, gt=0)  # Queries per /query micro-batch
+    max_batch_wait_ms: float = Field(default=5.0, ge=0)  # Wait for a batch to fill
+    result_cache_max_entries: int = Field(default=10000, ge=0)  # 0 disables the cache
+    result_cache_max_bytes: int = Field(default=64 << 20, gt=0)  # Estimated text held
+    result_cache_ttl_seconds: float = Field(default=300.0, ge=0)  # 0 = no expiry
+    semantic_cache_max_entries: int = Field(default=0, ge=0)  # Opt-in; 0 = off
+    semantic_cache_threshold: float = Field(default=0.95, gt=0, le=1)  # Min. cosine
 
 
 class RagPipelineConfig(BaseModel):
@@ -56,4 +106,6 @@ class AppConfig(BaseModel):
     chunking_strategy: ChunkingStrategyConfig
     embedding_service: EmbeddingServiceConfig
     vector_repository: VectorRepositoryConfig
+    ingestion: IngestionConfig = IngestionConfig()
+    query: QueryConfig = QueryConfig()
     rag_pipeline: Optional[RagPipelineConfig] = None
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, TYPE_CHECKING
+from typing import Callable, Iterator, List, Dict, Any, Optional, TYPE_CHECKING
 import uuid
 
 from .chunk import Chunk
@@ -22,6 +22,22 @@ class Document:
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     metadata: Dict[str, Any] = field(default_factory=dict)
     chunks: List[Chunk] = field(default_factory=list)
+    # For sources too large to hold in memory: content is left empty and this returns
+    # a fresh iterator over the text in order, read incrementally from the source.
+    stream: Optional[Callable[[], Iterator[str]]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    @property
+    def is_streamed(self) -> bool:
+        return self.stream is not None
+
+    def iter_text(self) -> Iterator[str]:
+        """Yields the document's text in pieces, whether streamed or in memory."""
+        if self.stream is not None:
+            yield from self.stream()
+        elif self.content:
+            yield self.content
 
     def create_chunks(self, chunking_strategy: "IChunkingStrategy") -> None:
         """
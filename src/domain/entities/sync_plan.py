@@ -0,0 +1,32 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping
+
+
+@dataclass
+class SyncPlan:
+    """
+    The difference between a source listing and the ids already ingested.
+    `to_add` maps each new or changed document id to whatever the data source needs to
+    fetch it (an S3 listing entry, a file name), so loading never re-lists the source.
+    """
+
+    to_add: Dict[str, Any] = field(default_factory=dict)
+    to_delete: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @classmethod
+    def compute(cls, source: Mapping[str, Any], known_ids: Iterable[str]) -> "SyncPlan":
+        """Builds the plan with set / dict operations: O(source + known)."""
+        known = set(known_ids)
+        to_add = {doc_id: ref for doc_id, ref in source.items() if doc_id not in known}
+        return cls(
+            to_add=to_add,
+            to_delete=sorted(known.difference(source)),
+            unchanged=len(source) - len(to_add),
+        )
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.to_add)} to add, {len(self.to_delete)} to delete, "
+            f"{self.unchanged} unchanged"
+        )
@@ -1,11 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, TYPE_CHECKING, Tuple, Optional
+from dataclasses import replace
+from typing import List, Dict, Any, TYPE_CHECKING, Iterable, Iterator, Tuple, Optional
 import numpy as np
 
 # Use a TYPE_CHECKING block to import for type hints only.
 # This prevents circular import errors at runtime.
 if TYPE_CHECKING:
-    from src.domain.entities import Document, Chunk
+    from src.domain.entities import Document, Chunk, SyncPlan
 
 
 class IChunkingStrategy(ABC):
@@ -27,6 +28,18 @@ class IChunkingStrategy(ABC):
         """
         pass
 
+    def chunk_stream(self, document: "Document") -> Iterator["Chunk"]:
+        """
+        Yields a document's chunks as they are produced. Strategies that can split
+        text incrementally should override this, so streamed documents (see
+        Document.stream) are never materialized; this default joins them first.
+        """
+        if document.is_streamed:
+            document = replace(
+                document, content="".join(document.iter_text()), stream=None
+            )
+        yield from self.chunk(document)
+
 
 class IDataSource(ABC):
     """
@@ -69,6 +82,33 @@ class IDataSource(ABC):
         """
         pass
 
+    def iter_all(self) -> Iterator["Document"]:
+        """
+        Yields all documents one at a time, so callers can stream a corpus without
+        holding it in memory. Sources that can read lazily should override this.
+        """
+        yield from self.load_all()
+
+    def iter_new(self, last_known_ids: Iterable[str]) -> Iterator["Document"]:
+        """Streaming counterpart of load_new()."""
+        yield from self.load_new(list(last_known_ids))
+
+    def plan_sync(self, known_ids: Iterable[str]) -> "SyncPlan":
+        """
+        Diffs one listing of the source against the already ingested ids.
+        Sources should override this when their listing carries more than the id,
+        so iter_planned() can fetch without looking documents up again.
+        """
+        from src.domain.entities import SyncPlan
+
+        source_ids = self.get_all_source_document_identifiers()
+        return SyncPlan.compute({doc_id: doc_id for doc_id in source_ids}, known_ids)
+
+    def iter_planned(self, plan: "SyncPlan") -> Iterator["Document"]:
+        """Yields the documents a plan adds, using the references it recorded."""
+        for ref in plan.to_add.values():
+            yield self.load(ref)
+
 
 class IVectorRepository(ABC):
     """
@@ -105,6 +145,22 @@ class IVectorRepository(ABC):
         """
         pass
 
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple["Chunk", float]]]:
+        """
+        Searches for each row of an (n, d) query matrix.
+        Returns one list of (chunk, distance) tuples per query, in input order.
+        Stores that can search a query matrix natively should override this.
+        """
+        return [
+            self.search(query_embedding, top_k, metadata_filter)
+            for query_embedding in query_embeddings
+        ]
+
     @abstractmethod
     def save(self) -> None:
         """
@@ -113,6 +169,54 @@ class IVectorRepository(ABC):
         """
         pass
 
+    def checkpoint(self) -> bool:
+        """
+        Persists progress in the middle of an ingestion run, as save() does.
+        Stores that cannot persist a consistent state yet save nothing and return
+        False; the run carries on, and a resume starts from the previous save.
+        """
+        self.save()
+        return True
+
+    def load(self) -> None:
+        """
+        Restores previously persisted state, if any. A no-op for stores that
+        do not persist locally.
+        """
+        return None
+
+    def index_version(self) -> Optional[int]:
+        """
+        Returns a number that increases whenever search results may change (vectors
+        or chunk metadata added, deleted or reloaded), so callers can cache results
+        per version. Returns None if the store cannot tell; results must then not be
+        cached.
+        """
+        return None
+
+    def get_chunks_by_document_id(
+        self, doc_ids: Iterable[str]
+    ) -> Dict[str, List["Chunk"]]:
+        """
+        Returns the stored chunks (without embeddings) of the given documents, so a
+        new version of a document can be diffed against them (see ChunkDiff).
+        Returns {} if the store cannot carry vectors over; every chunk is then
+        re-embedded.
+        """
+        return {}
+
+    @abstractmethod
+    def carry_over(self, previous_document_id: str, chunks: List["Chunk"]) -> None:
+        """
+        Replaces a stored document version with its successor's unchanged chunks:
+        each of `chunks` takes over the vector of a stored chunk of
+        `previous_document_id` with the same id, under its new document id and
+        metadata. The previous version's other chunks are deleted.
+        Only called for chunks returned by get_chunks_by_document_id, which were
+        not re-embedded, so their vectors must be kept; there is no safe default.
+        """
+        pass
+
 
 class IEmbeddingService(ABC):
     """
@@ -121,10 +225,14 @@ class IEmbeddingService(ABC):
     """
 
     @abstractmethod
-    def embed_chunks(self, chunks: List["Chunk"]) -> None:
+    def embed_chunks(
+        self, chunks: List["Chunk"], out: Optional[np.ndarray] = None
+    ) -> None:
         """
         Generates embeddings and assigns them to the .embedding attribute
         of each chunk object in the list, modifying them in-place.
+        If `out` (shape (len(chunks), dim)) is given, row i receives the embedding of
+        chunks[i] instead, and .embedding is left untouched.
         """
         pass
 
@@ -133,6 +241,15 @@ class IEmbeddingService(ABC):
         """Generates an embedding for a single query string."""
         pass
 
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Generates embeddings for many query strings as an (n, dim) float32 matrix.
+        Services whose model can encode a batch in one call should override this.
+        """
+        return np.vstack([self.embed_query(query) for query in queries]).astype(
+            np.float32, copy=False
+        )
+
     @abstractmethod
     def get_dimension(self) -> int:
         """
@@ -140,3 +257,35 @@ class IEmbeddingService(ABC):
         This is required for initializing vector repositories (e.g., FAISS).
         """
         pass
+
+
+class ISemanticQueryCache(ABC):
+    """
+    Abstract interface for a cache answering queries from results stored for earlier,
+    semantically near-identical queries (compared by embedding, not by text).
+    """
+
+    @abstractmethod
+    def lookup(
+        self, query_embeddings: np.ndarray, top_k: int, version: Optional[int]
+    ) -> List[Optional[List["Chunk"]]]:
+        """
+        Returns, per row of an (n, d) query matrix, the top_k chunks cached for a
+        similar earlier query at index `version`, or None on a miss.
+        """
+        pass
+
+    @abstractmethod
+    def add(
+        self,
+        query_embeddings: np.ndarray,
+        results: List[List["Chunk"]],
+        top_k: int,
+        version: Optional[int],
+        search_seconds: float = 0.0,
+    ) -> None:
+        """
+        Stores the chunks found for each query row at index `version`, and the time the
+        index search took, so the cache can report the latency its hits save.
+        """
+        pass
@@ -50,24 +50,42 @@ def main() -> int:
                 config.vector_repository.get("persist_path", "./vector_store")
             ).parent.mkdir(parents=True, exist_ok=True)
 
-        data_source = create_data_source(config.data_source.get("type"))  # type: ignore
+        data_source = create_data_source(
+            config.data_source.get("type"),  # type: ignore
+            **{k: v for k, v in config.data_source.items() if k != "type"},
+        )
         chunking_strategy = create_chunking_strategy(
-            config.chunking_strategy.get("type"),
+            config.chunking_strategy.get("chunk_size", 1000),
             config.chunking_strategy.get("chunk_overlap", 0),
-        )  # type: ignore
+            config.chunking_strategy.get("type", "langchain"),
+            tokenizer=config.chunking_strategy.get("tokenizer"),
+        )
         embedding_service = create_embedding_service(config.embedding_service)
         vector_repository = create_vector_repository(
             config.vector_repository, embedding_service
         )
 
+        ingestion = dict(getattr(config, "ingestion", {}))
+        resume = bool(ingestion.pop("resume", False))
+        if resume:
+            # A fresh task must fetch the last checkpoint from S3, or the live index
+            # if the last run finished (its final save removes the checkpoint).
+            checkpoint = vector_repository.s3_versions(checkpoint=True)
+            versions = checkpoint or vector_repository.s3_versions()
+            if versions:
+                vector_repository.download_from_s3(
+                    versions, checkpoint=checkpoint is not None
+                )
+
         ingestion_service = IngestionService(
             data_source=data_source,
             chunking_strategy=chunking_strategy,
             embedding_service=embedding_service,
             vector_repository=vector_repository,
+            **ingestion,
         )
 
-        ingestion_service.ingest()
+        ingestion_service.ingest(resume=resume)
 
         logging.info("RAG ingestion pipeline finished successfully.")
         return 0
@@ -0,0 +1,140 @@
+import io
+import json
+import threading
+import time
+import unittest
+
+import numpy as np
+from botocore.exceptions import ClientError, ReadTimeoutError
+
+from src.adapters.embedding.bedrock_embedding_service import BedrockEmbeddingService
+from src.adapters.embedding.concurrent_embedding import AIMDConcurrencyLimiter
+from src.domain.entities.chunk import Chunk
+
+
+class StubBedrockClient:
+    """Local stand-in for bedrock-runtime: embeds len(text), throttles on demand."""
+
+    def __init__(self, throttle_first: int = 0, latency: float = 0.0):
+        self.throttle_first = throttle_first
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, body, modelId, accept, contentType):
+        text = json.loads(body)["inputText"]
+        with self._lock:
+            self.calls += 1
+            throttle = self.calls <= self.throttle_first
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if throttle:
+                raise ClientError(
+                    {"Error": {"Code": "ThrottlingException", "Message": "slow down"}},
+                    "InvokeModel",
+                )
+            payload = json.dumps({"embedding": [float(len(text)), 1.0]})
+            return {"body": io.BytesIO(payload.encode())}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestBedrockEmbeddingService(unittest.TestCase):
+    """Tests concurrent, throttle-aware embedding against a stub Bedrock client."""
+
+    def make_service(self, client, **kwargs):
+        service = BedrockEmbeddingService(
+            aws_region="af-south-1", client=client, **kwargs
+        )
+        service.embedder.sleep = lambda seconds: None
+        return service
+
+    def test_embeddings_keep_chunk_order_and_skip_empty_chunks(self):
+        client = StubBedrockClient(latency=0.005)
+        service = self.make_service(client, max_concurrency=8)
+        chunks = [Chunk(id=str(i), document_id="d", content="x" * i) for i in range(40)]
+
+        service.embed_chunks(chunks)
+
+        self.assertIsNone(chunks[0].embedding)
+        for i in range(1, 40):
+            np.testing.assert_array_equal(chunks[i].embedding, [i, 1.0])
+        self.assertEqual(client.calls, 39)
+        self.assertGreater(client.max_in_flight, 1)
+        self.assertLessEqual(client.max_in_flight, 8)
+        self.assertEqual(service.last_run_stats.requests, 39)
+
+    def test_throttled_requests_are_retried_and_counted(self):
+        client = StubBedrockClient(throttle_first=5)
+        service = self.make_service(client, max_concurrency=4)
+        chunks = [Chunk(id=str(i), document_id="d", content="ab") for i in range(10)]
+        out = np.zeros((10, 2), dtype=np.float32)
+
+        service.embed_chunks(chunks, out=out)
+
+        np.testing.assert_array_equal(out, np.tile([2.0, 1.0], (10, 1)))
+        self.assertEqual(service.last_run_stats.throttles, 5)
+        self.assertEqual(client.calls, 15)
+
+    def test_transient_errors_are_retried_without_lowering_concurrency(self):
+        client = StubBedrockClient()
+        invoke_model = client.invoke_model
+        failures = [
+            ClientError(
+                {
+                    "Error": {"Code": "InternalServerException"},
+                    "ResponseMetadata": {"HTTPStatusCode": 500},
+                },
+                "InvokeModel",
+            ),
+            ReadTimeoutError(endpoint_url="https://bedrock"),
+        ]
+
+        def flaky_invoke_model(**kwargs):
+            if failures:
+                raise failures.pop(0)
+            return invoke_model(**kwargs)
+
+        client.invoke_model = flaky_invoke_model
+        service = self.make_service(client, max_concurrency=4)
+        limit = service.embedder.limiter.limit
+
+        embedding = service.embed_queries(["abc"])
+
+        np.testing.assert_array_equal(embedding, [[3.0, 1.0]])
+        stats = service.last_run_stats
+        self.assertEqual((stats.transient_errors, stats.throttles), (2, 0))
+        self.assertEqual(service.embedder.limiter.limit, limit)
+
+    def test_non_throttling_errors_are_not_retried(self):
+        client = StubBedrockClient()
+        client.invoke_model = lambda **kwargs: (_ for _ in ()).throw(
+            ClientError({"Error": {"Code": "ValidationException"}}, "InvokeModel")
+        )
+        service = self.make_service(client)
+
+        with self.assertRaises(ClientError):
+            service.embed_queries(["a query"])
+
+
+class TestAIMDConcurrencyLimiter(unittest.TestCase):
+    def test_additive_increase_and_multiplicative_decrease(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=4, max_limit=8)
+
+        # Roughly one limit's worth of successes raises the limit by one.
+        for _ in range(5):
+            limiter.on_success()
+        self.assertEqual(limiter.limit, 5)
+
+        limiter.on_throttle()
+        limiter.on_throttle()  # Same congestion event: within the cooldown window.
+        self.assertEqual(limiter.limit, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
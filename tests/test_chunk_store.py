@@ -0,0 +1,91 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from src.adapters.vector_storage.chunk_store import (
+    ChunkIdView,
+    ChunkMap,
+    ChunkStore,
+    write_chunk_store,
+)
+from src.domain.entities.chunk import Chunk
+
+
+class TestChunkStore(unittest.TestCase):
+    """Tests the memory-mapped columnar chunk metadata store."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "index.chunks")
+        write_chunk_store(
+            self.path,
+            [
+                (0, "c1", "d1", "héllo", '{"page": 1}'),
+                (4, "c2", "d2", "", "{}"),
+                (7, "c3", "d1", "world", '{"tags": ["a"]}'),
+            ],
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_round_trip_reads_rows_by_vector_id(self):
+        store = ChunkStore(self.path)
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.row_of(4), 1)
+        self.assertIsNone(store.row_of(5))
+        chunk = store.chunk(store.row_of(0))
+        self.assertEqual(
+            (chunk.id, chunk.document_id, chunk.content), ("c1", "d1", "héllo")
+        )
+        self.assertEqual(chunk.metadata, {"page": 1})
+        self.assertEqual(store.chunk(2).metadata, {"tags": ["a"]})
+        store.close()
+
+    def test_rejects_foreign_or_newer_files(self):
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write(struct.pack("<I", 99))
+        with self.assertRaisesRegex(ValueError, "version 99"):
+            ChunkStore(self.path)
+
+        with open(self.path, "r+b") as f:
+            f.write(b"NOTCHUNK")
+        with self.assertRaisesRegex(ValueError, "not a chunk store"):
+            ChunkStore(self.path)
+
+    def test_rows_must_be_in_ascending_vector_id_order(self):
+        with self.assertRaises(ValueError):
+            write_chunk_store(
+                self.path, [(2, "a", "d", "", "{}"), (1, "b", "d", "", "{}")]
+            )
+
+    def test_chunk_map_overlays_edits_and_rewrites_them(self):
+        chunks = ChunkMap(ChunkStore(self.path))
+        ids = ChunkIdView(chunks)
+
+        del chunks[4]
+        chunks[8] = Chunk(id="c4", document_id="d3", content="new", metadata={"x": 1})
+
+        self.assertEqual(list(chunks), [0, 7, 8])
+        self.assertNotIn(4, chunks)
+        self.assertEqual(ids[8], "c4")
+        self.assertEqual(
+            list(chunks.iter_field("document_id")), [(0, "d1"), (7, "d1"), (8, "d3")]
+        )
+        rewritten = os.path.join(self.test_dir, "rewritten.chunks")
+        self.assertEqual(write_chunk_store(rewritten, chunks.rows()), 3)
+        chunks.close()
+
+        reopened = ChunkMap(ChunkStore(rewritten))
+        self.assertEqual(dict(ChunkIdView(reopened)), {0: "c1", 7: "c3", 8: "c4"})
+        self.assertEqual(reopened[8].metadata, {"x": 1})
+        self.assertEqual(reopened[0].content, "héllo")
+        reopened.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.adapters.embedding.cached_embedding_service import CachedEmbeddingService
+from src.adapters.embedding.embedding_cache import (
+    CacheStats,
+    EmbeddingCache,
+    cache_key,
+)
+from src.domain.entities.chunk import Chunk
+from src.domain.ports import IEmbeddingService
+
+
+class CountingEmbeddingService(IEmbeddingService):
+    """Embeds a text as [len(text), 1] and records every text it was asked for."""
+
+    def __init__(self):
+        self.texts = []
+
+    def embed_chunks(self, chunks, out=None):
+        for i, chunk in enumerate(chunks):
+            if not chunk.content:
+                continue
+            self.texts.append(chunk.content)
+            vector = np.array([len(chunk.content), 1.0], dtype=np.float32)
+            if out is not None:
+                out[i] = vector
+            else:
+                chunk.embedding = vector
+
+    def embed_query(self, query):
+        self.texts.append(query)
+        return np.array([len(query), 1.0], dtype=np.float32)
+
+    def get_dimension(self):
+        return 2
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Tests the two-tier embedding cache and the caching service wrapper."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key_ignores_whitespace_but_not_model(self):
+        self.assertEqual(cache_key("m", "a  b\n"), cache_key("m", " a b"))
+        self.assertNotEqual(cache_key("m1", "a b"), cache_key("m2", "a b"))
+
+    def test_vectors_persist_across_instances(self):
+        cache = EmbeddingCache(self.path)
+        cache.put_many([(b"k1", np.array([1.0, 2.0]))])
+        cache.close()
+
+        cache = EmbeddingCache(self.path)
+        stats = CacheStats()
+        found = cache.get_many([b"k1", b"k2"], stats)
+        np.testing.assert_array_equal(found[b"k1"], [1.0, 2.0])
+        self.assertNotIn(b"k2", found)
+        self.assertEqual((stats.lookups, stats.disk_hits), (2, 1))
+        self.assertEqual(cache.get_many([b"k1"], stats).keys(), {b"k1"})
+        self.assertEqual(stats.memory_hits, 1)
+
+    def test_disk_budget_evicts_least_recently_used(self):
+        # Each vector is 8 bytes; the budget holds four of them.
+        cache = EmbeddingCache(self.path, max_bytes=32, memory_max_bytes=8)
+        cache.put_many([(b"a", [1.0, 1.0]), (b"b", [2.0, 2.0])])
+        cache.get_many([b"a"])
+        cache._db.execute("UPDATE embeddings SET last_used = 0 WHERE key = ?", (b"b",))
+        cache._db.commit()
+        cache.put_many([(k, [3.0, 3.0]) for k in (b"c", b"d", b"e")])
+
+        self.assertLessEqual(cache.disk_bytes, 32)
+        remaining = {row[0] for row in cache._db.execute("SELECT key FROM embeddings")}
+        self.assertNotIn(b"b", remaining)
+        self.assertIn(b"e", remaining)
+        self.assertLessEqual(cache._memory_bytes, 8)
+
+    def test_disk_hits_touch_rows_at_most_once_per_interval(self):
+        cache = EmbeddingCache(self.path, memory_max_bytes=0)
+        cache.put_many([(b"a", [1.0, 1.0])])
+        cache._db.execute("UPDATE embeddings SET last_used = 1 WHERE key = ?", (b"a",))
+        cache._db.commit()
+
+        def last_used():
+            return cache._db.execute("SELECT last_used FROM embeddings").fetchone()[0]
+
+        cache.get_many([b"a"])
+        touched = last_used()
+        self.assertGreater(touched, 1)
+        cache.get_many([b"a"])
+        self.assertEqual(last_used(), touched)
+
+    def test_disk_budget_counts_rows_written_by_other_instances(self):
+        # Two instances on one file stand in for two processes sharing the cache.
+        cache = EmbeddingCache(self.path, max_bytes=32)
+        other = EmbeddingCache(self.path, max_bytes=32)
+        cache.put_many([(k, [1.0, 1.0]) for k in (b"a", b"b", b"c")])
+        other.put_many([(k, [2.0, 2.0]) for k in (b"d", b"e")])
+
+        self.assertLessEqual(cache.disk_bytes, 32)
+        self.assertEqual(cache.disk_bytes, other.disk_bytes)
+        rows = cache._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self.assertEqual(rows * 8, cache.disk_bytes)
+
+    def test_cached_service_embeds_only_misses(self):
+        inner = CountingEmbeddingService()
+        service = CachedEmbeddingService(inner, "test", EmbeddingCache(self.path))
+        chunks = [
+            Chunk(id="1", document_id="d", content="alpha"),
+            Chunk(id="2", document_id="d", content=""),
+            Chunk(id="3", document_id="d", content="alpha "),
+        ]
+        service.embed_chunks(chunks)
+        self.assertEqual(inner.texts, ["alpha"])
+        np.testing.assert_array_equal(chunks[2].embedding, [5.0, 1.0])
+        self.assertIsNone(chunks[1].embedding)
+
+        out = np.zeros((3, 2), dtype=np.float32)
+        service.embed_chunks(chunks, out=out)
+        np.testing.assert_array_equal(out, [[5, 1], [0, 0], [5, 1]])
+        self.assertEqual(service.last_run_stats.hit_ratio, 1.0)
+
+        queries = service.embed_queries(["alpha", "beta"])
+        np.testing.assert_array_equal(queries, [[5, 1], [4, 1]])
+        self.assertEqual(inner.texts, ["alpha", "beta"])
+        self.assertEqual(service.stats.lookups, 6)
+        self.assertEqual(service.stats.hits, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
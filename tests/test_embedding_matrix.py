@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from src.adapters.vector_storage.embedding_matrix import EmbeddingMatrix
+
+
+class TestEmbeddingMatrix(unittest.TestCase):
+    """Tests the growable float32 staging matrix used by the vector repository."""
+
+    def test_reserve_returns_writable_view_of_new_rows(self):
+        matrix = EmbeddingMatrix(dim=3, initial_capacity=4)
+
+        start, view = matrix.reserve(2)
+        view[:] = [[1, 2, 3], [4, 5, 6]]
+
+        self.assertEqual(start, 0)
+        self.assertEqual(len(matrix), 2)
+        self.assertEqual(view.dtype, np.float32)
+        np.testing.assert_array_equal(matrix.take(np.array([1])), [[4, 5, 6]])
+
+    def test_capacity_doubles_and_preserves_rows(self):
+        matrix = EmbeddingMatrix(dim=2, initial_capacity=2)
+        _, view = matrix.reserve(2)
+        view[:] = [[1, 1], [2, 2]]
+
+        start, view = matrix.reserve(1)
+        view[:] = [[3, 3]]
+
+        self.assertEqual(start, 2)
+        self.assertEqual(matrix.capacity, 4)
+        np.testing.assert_array_equal(
+            matrix.take(np.arange(3)), [[1, 1], [2, 2], [3, 3]]
+        )
+
+    def test_take_is_zero_copy_only_for_contiguous_rows(self):
+        matrix = EmbeddingMatrix(dim=2)
+        _, view = matrix.reserve(4)
+        view[:] = np.arange(8).reshape(4, 2)
+
+        contiguous = matrix.take(np.array([1, 2, 3]))
+        scattered = matrix.take(np.array([0, 2]))
+
+        self.assertTrue(np.shares_memory(contiguous, view))
+        self.assertFalse(np.shares_memory(scattered, view))
+        np.testing.assert_array_equal(scattered, [[0, 1], [4, 5]])
+
+    def test_clear_keeps_allocation_and_release_frees_it(self):
+        matrix = EmbeddingMatrix(dim=2, initial_capacity=8)
+        matrix.reserve(3)
+
+        matrix.clear()
+        self.assertEqual(len(matrix), 0)
+        self.assertEqual(matrix.capacity, 8)
+
+        matrix.release()
+        self.assertEqual(matrix.capacity, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
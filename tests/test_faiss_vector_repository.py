@@ -41,13 +41,6 @@ class TestFaissVectorRepository(unittest.TestCase):
             "src.adapters.vector_storage.faiss_vector_repository.os.path.exists",
             return_value=True,
         )
-        self.patcher_json_dump = patch(
-            "src.adapters.vector_storage.faiss_vector_repository.json.dump"
-        )
-        self.patcher_json_load = patch(
-            "src.adapters.vector_storage.faiss_vector_repository.json.load",
-            return_value=["c1"],
-        )
         self.patcher_mkdir = patch(
             "src.adapters.vector_storage.faiss_vector_repository.Path.mkdir"
         )
@@ -57,19 +50,21 @@ class TestFaissVectorRepository(unittest.TestCase):
 
         self.mock_open = self.patcher_open.start()
         self.mock_exists = self.patcher_exists.start()
-        self.mock_json_dump = self.patcher_json_dump.start()
-        self.mock_json_load = self.patcher_json_load.start()
         self.mock_mkdir = self.patcher_mkdir.start()
         self.mock_boto3 = self.patcher_boto3.start()
 
+        # Calls on the shared faiss mock must not leak between tests
+        mock_faiss_module.write_index.reset_mock()
+
         # Mock the behavior of the faiss index object
         self.mock_index = MagicMock()
         self.mock_index.ntotal = 0
         mock_faiss_module.IndexFlatL2.return_value = self.mock_index
+        mock_faiss_module.IndexIDMap2.return_value = self.mock_index
         mock_faiss_module.read_index.return_value = self.mock_index
 
         self.repository = FaissVectorRepository(
-            embedding_dim=128, persist_path=self.persist_path
+            embedding_dim=2, persist_path=self.persist_path
         )
 
     def tearDown(self):
@@ -87,22 +82,45 @@ class TestFaissVectorRepository(unittest.TestCase):
 
         self.repository.add(chunks)
 
-        self.assertEqual(self.mock_index.add.call_count, 1)
+        self.assertEqual(self.mock_index.add_with_ids.call_count, 1)
+        vectors, ids = self.mock_index.add_with_ids.call_args[0]
         np.testing.assert_array_equal(
-            self.mock_index.add.call_args[0][0],
-            np.array([[0.1, 0.2], [0.3, 0.4]], dtype="float32"),
+            vectors, np.array([[0.1, 0.2], [0.3, 0.4]], dtype="float32")
         )
+        np.testing.assert_array_equal(ids, np.array([0, 1], dtype="int64"))
         self.assertEqual(len(self.repository.id_map), 2)
         self.assertEqual(self.repository.id_map[0], "c1")
+        self.assertEqual(self.repository.doc_vector_ids, {"d1": [0, 1]})
 
-    def test_search_retrieves_correct_chunks(self):
-        """Verify that a query returns the correct chunk IDs based on mocked search results."""
-        self.repository.id_map = ["c1", "c2", "c3"]
-        self.repository.chunks = [
+    def test_added_chunks_drop_their_embeddings_once_staged(self):
+        """Verify stored chunks hold no embedding, so no batch buffer outlives add()."""
+        buffer = np.array([[0.1, 0.2], [0.3, 0.4]], dtype="float32")
+        chunks = [
             Chunk(id="c1", document_id="d1", content="content1"),
             Chunk(id="c2", document_id="d1", content="content2"),
-            Chunk(id="c3", document_id="d1", content="content3"),
         ]
+        for chunk, row in zip(chunks, buffer):
+            chunk.embedding = row  # A view of the buffer, as the embed stage sets it
+
+        self.repository.add(chunks)
+        buffer[:] = 0  # The index must already hold its own copy
+
+        vectors, _ = self.mock_index.add_with_ids.call_args[0]
+        np.testing.assert_array_equal(
+            vectors, np.array([[0.1, 0.2], [0.3, 0.4]], dtype="float32")
+        )
+        self.assertTrue(
+            all(c.embedding is None for c in self.repository.chunks.values())
+        )
+
+    def test_search_retrieves_correct_chunks(self):
+        """Verify that a query returns the correct chunk IDs based on mocked search results."""
+        self.repository.id_map = {0: "c1", 1: "c2", 2: "c3"}
+        self.repository.chunks = {
+            0: Chunk(id="c1", document_id="d1", content="content1"),
+            1: Chunk(id="c2", document_id="d1", content="content2"),
+            2: Chunk(id="c3", document_id="d1", content="content3"),
+        }
         self.mock_index.ntotal = 3
         query_embedding = np.array([[0.1, 0.2]], dtype="float32")
         self.mock_index.search.return_value = (
@@ -117,9 +135,33 @@ class TestFaissVectorRepository(unittest.TestCase):
         self.assertEqual(results[0][0].id, "c3")
         self.assertEqual(results[1][0].id, "c1")
 
+    def test_search_batch_issues_one_faiss_call_for_all_queries(self):
+        """Verify a query matrix is searched in one call and split back per query."""
+        self.repository.chunks = {
+            0: Chunk(id="c1", document_id="d1", content="content1"),
+            1: Chunk(id="c2", document_id="d1", content="content2"),
+        }
+        self.mock_index.ntotal = 2
+        self.mock_index.search.return_value = (
+            np.array([[0.1, 0.2], [0.3, 0.4]]),
+            np.array([[1, 0], [0, -1]]),
+        )
+
+        results = self.repository.search_batch(
+            np.array([[0.1, 0.2], [0.3, 0.4]], dtype="float64"), top_k=2
+        )
+
+        self.mock_index.search.assert_called_once()
+        queries = self.mock_index.search.call_args[0][0]
+        self.assertEqual((queries.shape, queries.dtype), ((2, 2), np.float32))
+        self.assertEqual(
+            [[chunk.id for chunk, _ in hits] for hits in results],
+            [["c2", "c1"], ["c1"]],
+        )
+
     def test_persist_and_load_flow(self):
-        """Verify that persist calls the correct faiss and json methods."""
-        self.repository.id_map = ["c1"]
+        """Verify that persist calls the correct faiss methods."""
+        self.repository.id_map = {0: "c1"}
 
         self.repository.persist()
 
@@ -132,8 +174,7 @@ class TestFaissVectorRepository(unittest.TestCase):
 
     def test_save_method_integration(self):
         """Integration test for the save method, ensuring it calls the correct external methods."""
-        self.repository.chunks = [Chunk(id="c1", document_id="d1", content="content1")]
-        self.repository.id_map = ["c1"]
+        self.repository.chunks[0] = Chunk(id="c1", document_id="d1", content="content1")
 
         # Mock the external dependencies
         mock_faiss_module.write_index = MagicMock()
@@ -165,6 +206,380 @@ class TestFaissVectorRepository(unittest.TestCase):
                 self.repository.s3_key,
             )
 
+    def test_empty_index_is_saved_and_uploaded_like_any_other(self):
+        """Verify an empty index still writes its chunk store and replaces the S3 copy."""
+        repository = FaissVectorRepository(
+            embedding_dim=2,
+            persist_path=os.path.join(self.test_dir, "index.bin"),
+            s3_bucket="bucket",
+            s3_key="index.bin",
+        )
+        s3 = self.mock_boto3.return_value
+
+        repository.save()
+
+        self.mock_mkdir.assert_called_with(parents=True, exist_ok=True)
+        mock_faiss_module.write_index.assert_called_once_with(
+            self.mock_index, str(repository.persist_path)
+        )
+        self.assertIsNotNone(repository.chunks.base)
+        self.assertEqual(len(repository.chunks), 0)
+        self.assertEqual(
+            [call.args[2] for call in s3.upload_file.call_args_list],
+            ["index.bin", "index.chunks"],
+        )
+        repository.chunks.close()
+
+    def test_hnsw_index_type_applies_build_and_search_params(self):
+        """Verify the HNSW family is built with M/efConstruction and efSearch applied."""
+        hnsw_index = MagicMock()
+        mock_faiss_module.IndexHNSWFlat.return_value = hnsw_index
+        mock_faiss_module.ParameterSpace.reset_mock()
+
+        repository = FaissVectorRepository(
+            embedding_dim=128,
+            persist_path=self.persist_path,
+            index_type="hnsw",
+            hnsw_m=16,
+            hnsw_ef_construction=80,
+            hnsw_ef_search=48,
+        )
+
+        mock_faiss_module.IndexHNSWFlat.assert_called_with(128, 16)
+        mock_faiss_module.IndexIDMap2.assert_called_with(hnsw_index)
+        self.assertIs(repository.index, self.mock_index)
+        self.assertEqual(hnsw_index.hnsw.efConstruction, 80)
+        mock_faiss_module.ParameterSpace.return_value.set_index_parameter.assert_called_with(
+            self.mock_index, "efSearch", 48
+        )
+
+    def test_unknown_index_type_is_rejected(self):
+        """Verify an unsupported index_type fails fast."""
+        with self.assertRaises(ValueError):
+            FaissVectorRepository(
+                embedding_dim=128, persist_path=self.persist_path, index_type="lsh"
+            )
+
+    def test_ivf_index_buffers_until_trained_on_save(self):
+        """Verify IVF vectors are buffered until enough exist, then trained on save."""
+        ivf_index = MagicMock()
+        ivf_index.is_trained = False
+        ivf_index.ntotal = 0
+        mock_faiss_module.IndexIVFFlat.return_value = ivf_index
+        repository = FaissVectorRepository(
+            embedding_dim=2,
+            persist_path=self.persist_path,
+            index_type="ivf_flat",
+            ivf_nlist=4,
+        )
+        chunks = [
+            Chunk(id=f"c{i}", document_id="d1", content="content", embedding=[i, i])
+            for i in range(3)
+        ]
+
+        repository.add(chunks)
+        ivf_index.train.assert_not_called()
+        ivf_index.add_with_ids.assert_not_called()
+        self.assertEqual(len(repository.chunks), 3)
+
+        repository.save()
+        ivf_index.train.assert_called_once()
+        self.assertEqual(ivf_index.add_with_ids.call_args[0][0].shape, (3, 2))
+
+    def test_search_does_not_train_a_buffering_ivf_index(self):
+        """Verify searching an untrained IVF index returns nothing and trains nothing."""
+        ivf_index = MagicMock()
+        ivf_index.is_trained = False
+        ivf_index.ntotal = 0
+        mock_faiss_module.IndexIVFFlat.return_value = ivf_index
+        repository = FaissVectorRepository(
+            embedding_dim=2,
+            persist_path=self.persist_path,
+            index_type="ivf_flat",
+            ivf_nlist=4,
+        )
+        repository.add(
+            [
+                Chunk(id=f"c{i}", document_id="d1", content="content", embedding=[i, i])
+                for i in range(3)
+            ]
+        )
+
+        results = repository.search_batch(np.ones((2, 2), dtype="float32"), top_k=2)
+
+        self.assertEqual(results, [[], []])
+        ivf_index.train.assert_not_called()
+        ivf_index.search.assert_not_called()
+        # Still buffered for the training ingestion or save() will do.
+        self.assertEqual(sum(map(len, repository._pending_rows)), 3)
+
+    def test_ivf_checkpoint_is_skipped_until_the_index_can_train(self):
+        """Verify checkpoints never force-train IVF on a partial corpus."""
+        ivf_index = MagicMock()
+        ivf_index.is_trained = False
+        ivf_index.ntotal = 0
+        mock_faiss_module.IndexIVFFlat.return_value = ivf_index
+        mock_faiss_module.write_index.reset_mock()
+        repository = FaissVectorRepository(
+            embedding_dim=2,
+            persist_path=self.persist_path,
+            index_type="ivf_flat",
+            ivf_nlist=4,
+        )
+        repository.add(
+            [
+                Chunk(id=f"c{i}", document_id="d1", content="content", embedding=[i, i])
+                for i in range(3)
+            ]
+        )
+
+        self.assertFalse(repository.checkpoint())
+        ivf_index.train.assert_not_called()
+        mock_faiss_module.write_index.assert_not_called()
+
+        # The final save still trains on whatever is buffered.
+        repository.save()
+        ivf_index.train.assert_called_once()
+        mock_faiss_module.write_index.assert_called_once()
+        repository.chunks.close()
+
+    def test_delete_removes_only_the_documents_vector_ids(self):
+        """Verify deletion calls remove_ids with the document's ids and updates all maps."""
+        chunks = [
+            Chunk(id="c1", document_id="d1", content="a", embedding=[0.1, 0.2]),
+            Chunk(id="c2", document_id="d2", content="b", embedding=[0.3, 0.4]),
+            Chunk(id="c3", document_id="d1", content="c", embedding=[0.5, 0.6]),
+        ]
+        self.repository.add(chunks)
+
+        self.repository.delete_by_document_id(["d1"])
+
+        self.mock_index.remove_ids.assert_called_once()
+        np.testing.assert_array_equal(
+            self.mock_index.remove_ids.call_args[0][0], np.array([0, 2])
+        )
+        self.assertEqual(self.repository.id_map, {1: "c2"})
+        self.assertEqual(list(self.repository.chunks), [1])
+        self.assertEqual(self.repository.get_all_document_identifiers(), ["d2"])
+        # Ids are stable: new chunks never reuse a deleted id.
+        self.repository.add(
+            [Chunk(id="c4", document_id="d3", content="d", embedding=[0.7, 0.8])]
+        )
+        self.assertEqual(self.repository.id_map[3], "c4")
+
+    def test_trained_index_receives_vectors_without_staging(self):
+        """Verify a trained index is handed the batch directly, bypassing staging."""
+        chunks = [
+            Chunk(id="c1", document_id="d1", content="a", embedding=[0.1, 0.2]),
+            Chunk(id="c2", document_id="d1", content="b", embedding=[0.3, 0.4]),
+        ]
+
+        self.repository.add(chunks)
+
+        vectors, _ = self.mock_index.add_with_ids.call_args[0]
+        np.testing.assert_array_equal(
+            vectors, np.array([[0.1, 0.2], [0.3, 0.4]], dtype="float32")
+        )
+        self.assertIsNone(chunks[0].embedding)
+        self.assertEqual(self.repository.embeddings.capacity, 0)
+
+    def test_save_rewrites_chunk_store_and_serves_chunks_from_it(self):
+        """Verify save() persists chunk metadata to the mmap store and reads back from it."""
+        chunks = [
+            Chunk(id="c1", document_id="d1", content="a", metadata={"k": 1}),
+            Chunk(id="c2", document_id="d2", content="b"),
+        ]
+        for chunk in chunks:
+            chunk.embedding = np.array([0.1, 0.2], dtype="float32")
+        self.repository.add(chunks)
+        self.mock_index.ntotal = 2
+
+        self.repository.save()
+
+        self.assertTrue(os.path.isfile(self.repository.metadata_path))
+        self.assertIsNotNone(self.repository.chunks.base)
+        self.assertEqual(self.repository.chunks[0].metadata, {"k": 1})
+        self.assertEqual(self.repository.id_map[1], "c2")
+        self.assertEqual(self.repository.doc_vector_ids, {"d1": [0], "d2": [1]})
+        self.repository.chunks.close()
+
+    def test_carry_over_rehomes_unchanged_vectors_to_the_new_version(self):
+        """Verify carry_over keeps matched vectors in place and deletes the rest."""
+        old = [
+            Chunk(id="h1", document_id="v1", content="a", metadata={"i": 0}),
+            Chunk(id="h2", document_id="v1", content="b", metadata={"i": 1}),
+            Chunk(id="h3", document_id="other", content="c"),
+        ]
+        for chunk in old:
+            chunk.embedding = np.array([0.1, 0.2], dtype="float32")
+        self.repository.add(old)
+        self.mock_index.ntotal = 3
+        self.repository.save()  # Serve the old version from the chunk store
+        self.assertEqual(
+            self.repository.get_chunks_by_document_id(["v1", "missing"])["v1"][1].id,
+            "h2",
+        )
+
+        kept = Chunk(id="h2", document_id="v2", content="b", metadata={"i": 0})
+        self.repository.carry_over("v1", [kept])
+
+        np.testing.assert_array_equal(
+            self.mock_index.remove_ids.call_args[0][0], np.array([0])
+        )
+        self.assertEqual(self.repository.chunks[1].document_id, "v2")
+        self.assertEqual(list(self.repository.metadata_index.match({"i": 0})), [1])
+        self.assertEqual(self.repository.doc_vector_ids, {"other": [2], "v2": [1]})
+        self.repository.save()  # Rows must still be written in vector id order
+        self.assertEqual(self.repository.id_map, {1: "h2", 2: "h3"})
+        self.repository.chunks.close()
+
+    def test_s3_download_pins_versions_and_falls_back_to_etag(self):
+        """Verify S3 versions come from VersionId (or ETag) and downloads are pinned."""
+        repository = FaissVectorRepository(
+            embedding_dim=2,
+            persist_path=self.persist_path,
+            s3_bucket="bucket",
+            s3_key="prefix/index.bin",
+        )
+        s3 = repository.s3_client
+        s3.head_object.side_effect = [
+            {"VersionId": "v-index", "ETag": '"a"'},
+            {"VersionId": "null", "ETag": '"b"'},
+        ]
+
+        versions = repository.s3_versions()
+        repository.download_from_s3(versions)
+
+        self.assertEqual(versions, ("v-index", "etag:b"))
+        calls = s3.download_file.call_args_list
+        self.assertEqual(calls[0].kwargs["ExtraArgs"], {"VersionId": "v-index"})
+        self.assertEqual(calls[1].args[1], "prefix/index.chunks")
+        self.assertIsNone(calls[1].kwargs["ExtraArgs"])
+        self.assertEqual(repository.last_known_s3_version_id, "etag:b")
+
+    def test_checkpoints_never_upload_to_the_live_s3_keys(self):
+        """Verify checkpoints go to the checkpoint prefix and only save() goes live."""
+        repository = FaissVectorRepository(
+            embedding_dim=2,
+            persist_path=self.persist_path,
+            s3_bucket="bucket",
+            s3_key="prefix/index.bin",
+        )
+        repository.add(
+            [Chunk(id="c1", document_id="d1", content="x", embedding=[1.0, 1.0])]
+        )
+        s3 = self.mock_boto3.return_value
+
+        self.assertTrue(repository.checkpoint())
+
+        uploaded = [call.args[2] for call in s3.upload_file.call_args_list]
+        self.assertEqual(
+            uploaded,
+            ["checkpoints/prefix/index.bin", "checkpoints/prefix/index.chunks"],
+        )
+        self.assertIsNone(repository.last_known_s3_version_id)
+
+        s3.upload_file.reset_mock()
+        repository.save()
+
+        uploaded = [call.args[2] for call in s3.upload_file.call_args_list]
+        self.assertEqual(uploaded, ["prefix/index.bin", "prefix/index.chunks"])
+        deleted = [call.kwargs["Key"] for call in s3.delete_object.call_args_list]
+        self.assertEqual(deleted, list(repository.s3_checkpoint_keys))
+        repository.chunks.close()
+
+    def _add_sourced_chunks(self):
+        chunks = [
+            Chunk(id=f"c{i}", document_id=f"d{i}", content="x", embedding=[i, i])
+            for i in range(3)
+        ]
+        chunks[0].metadata = {"source": "s3://b/contracts/a.md"}
+        chunks[1].metadata = {"source": "s3://b/memos/b.md"}
+        chunks[2].metadata = {"source": "s3://b/contracts/c.md"}
+        self.repository.add(chunks)
+        self.repository.delete_by_document_id(["d2"])
+        self.mock_index.ntotal = 2
+
+    def test_broad_metadata_filter_is_pushed_into_faiss_as_id_selector(self):
+        """Verify broad filters restrict the FAISS search itself instead of post-filtering."""
+        self._add_sourced_chunks()
+        self.mock_index.search.return_value = (np.array([[0.1]]), np.array([[0]]))
+        mock_faiss_module.IDSelectorBitmap.reset_mock()
+
+        with patch(
+            "src.adapters.vector_storage.faiss_vector_repository.EXACT_FILTER_MAX_IDS",
+            0,
+        ):
+            results = self.repository.search(
+                np.array([0.1, 0.2], dtype="float32"),
+                top_k=2,
+                metadata_filter={"source": {"prefix": "s3://b/contracts/"}},
+            )
+
+        bitmap = mock_faiss_module.IDSelectorBitmap.call_args[0][0]
+        np.testing.assert_array_equal(bitmap, np.array([0b1], dtype=np.uint8))
+        self.assertEqual(self.mock_index.search.call_args[0][1], 2)
+        self.assertIs(
+            self.mock_index.search.call_args.kwargs["params"],
+            mock_faiss_module.SearchParameters.return_value,
+        )
+        self.assertEqual([chunk.id for chunk, _ in results], ["c0"])
+
+    def test_narrow_metadata_filter_scans_only_matching_vectors(self):
+        """Verify narrow filters reconstruct just the matching ids and rank them exactly."""
+        self._add_sourced_chunks()
+        self.mock_index.reconstruct_batch.return_value = np.array([[0.0, 0.0]])
+        mock_faiss_module.knn.return_value = (np.array([[0.05]]), np.array([[0]]))
+
+        results = self.repository.search(
+            np.array([0.1, 0.2], dtype="float32"),
+            top_k=2,
+            metadata_filter={"source": ["s3://b/memos/b.md", "s3://b/other.md"]},
+        )
+
+        np.testing.assert_array_equal(
+            self.mock_index.reconstruct_batch.call_args[0][0], [1]
+        )
+        self.assertEqual(mock_faiss_module.knn.call_args[0][2], 1)
+        self.mock_index.search.assert_not_called()
+        self.assertEqual([(chunk.id, d) for chunk, d in results], [("c1", 0.05)])
+        # No match: FAISS is not consulted at all.
+        self.assertEqual(
+            self.repository.search(
+                np.array([0.1, 0.2], dtype="float32"),
+                top_k=2,
+                metadata_filter={"source": "s3://b/contracts/c.md"},
+            ),
+            [],
+        )
+
+    def test_delete_unknown_document_is_a_noop(self):
+        """Verify deleting a document that is not indexed does not touch the index."""
+        self.repository.delete_by_document_id(["missing"])
+        self.mock_index.remove_ids.assert_not_called()
+
+    def test_index_version_grows_whenever_results_may_change(self):
+        """Verify adds, deletes and loads bump the version; searches do not."""
+        versions = [self.repository.index_version()]
+        self.repository.add(
+            [Chunk(id="c1", document_id="d1", content="a", embedding=[0.1, 0.2])]
+        )
+        versions.append(self.repository.index_version())
+        self.mock_index.search.return_value = (
+            np.array([[0.1]], dtype="float32"),
+            np.array([[0]], dtype="int64"),
+        )
+        self.repository.search(np.array([0.1, 0.2], dtype="float32"), top_k=1)
+        self.assertEqual(self.repository.index_version(), versions[-1])
+        self.repository.delete_by_document_id(["d1"])
+        versions.append(self.repository.index_version())
+        self.assertEqual(versions, sorted(set(versions)))
+        # A repository built later (a hot-reload swap) never reuses an older version.
+        replacement = FaissVectorRepository(
+            embedding_dim=2, persist_path=self.persist_path
+        )
+        self.assertGreater(replacement.index_version(), versions[-1])
+
 
 if __name__ == "__main__":
     # Ensure pytest cache warnings do not cause confusion in local runs.
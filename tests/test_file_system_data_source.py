@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.adapters.data_sources import file_manifest
+from src.adapters.data_sources.file_system_data_source import FileSystemDataSource
+
+
+class TestFileSystemDataSource(unittest.TestCase):
+    """Tests the recursive walker, glob filters and the change manifest."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        self.write("a.md", "alpha")
+        self.write("docs/b.md", "beta")
+        self.write("docs/deep/c.py", "gamma")
+        self.write(".git/HEAD", "ref")
+        self.write("docs/skip.log", "noise")
+        self.manifest_path = os.path.join(self.root, "state", "manifest.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, rel_path, text):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def source(self, **kwargs):
+        return FileSystemDataSource(
+            self.root, manifest_path=self.manifest_path, **kwargs
+        )
+
+    def test_walks_recursively_with_include_and_exclude(self):
+        ids = self.source(exclude=[".git", "*.log"]).scan()
+        self.assertEqual(sorted(ids.values()), ["a.md", "docs/b.md", "docs/deep/c.py"])
+        only_docs = self.source(include=["docs/*.md"]).scan()
+        self.assertEqual(list(only_docs.values()), ["docs/b.md"])
+
+    def test_unchanged_files_are_not_rehashed_across_instances(self):
+        first = self.source().get_all_source_document_identifiers()
+        with mock.patch.object(
+            file_manifest, "hash_file", wraps=file_manifest.hash_file
+        ) as hashed:
+            second = self.source().get_all_source_document_identifiers()
+            self.assertEqual(sorted(first), sorted(second))
+            self.assertEqual(hashed.call_count, 0)
+
+            self.write("docs/b.md", "beta, edited")
+            third = self.source().get_all_source_document_identifiers()
+            self.assertEqual(hashed.call_count, 1)
+        self.assertEqual(
+            set(first) ^ set(third),
+            {
+                next(i for i in first if i.startswith("docs/b.md#")),
+                next(i for i in third if i.startswith("docs/b.md#")),
+            },
+        )
+
+    def test_sync_replaces_an_edited_file(self):
+        source = self.source()
+        known = [doc.id for doc in source.load_all()]
+        self.write("docs/deep/c.py", "gamma v2")
+        plan = source.plan_sync(known)
+
+        self.assertEqual(list(plan.to_add.values()), ["docs/deep/c.py"])
+        self.assertEqual(len(plan.to_delete), 1)
+        self.assertTrue(plan.to_delete[0].startswith("docs/deep/c.py#"))
+        doc = next(source.iter_planned(plan))
+        self.assertEqual((doc.content, doc.id), ("gamma v2", next(iter(plan.to_add))))
+
+    def test_manifest_inside_the_tree_is_not_ingested(self):
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+        self.source().scan()
+        self.assertTrue(os.path.exists(self.manifest_path))
+        self.assertNotIn("manifest.json", self.source().scan().values())
+
+
+if __name__ == "__main__":
+    unittest.main()
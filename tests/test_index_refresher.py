@@ -0,0 +1,212 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.adapters.vector_storage.index_refresher import S3IndexRefresher
+from src.application.service_reloader import BuiltService, ServiceReloader
+
+
+class FakeRepository:
+    """Just enough of FaissVectorRepository for the refresher."""
+
+    def __init__(self, persist_path, versions=None, live_vectors=2, chunks=2):
+        self.persist_path = Path(persist_path)
+        self.metadata_path = self.persist_path.with_suffix(".chunks")
+        self.last_known_s3_version_id = None
+        self.reload_lock = threading.Lock()
+        self.versions = versions
+        self.live_vectors = live_vectors
+        self.chunks = [None] * chunks
+        self.index_type = "flat"
+        self.index = MagicMock(ntotal=live_vectors)
+        self.replicas = []
+        self.searches = []
+
+    def s3_versions(self):
+        return self.versions
+
+    def replica(self, persist_path):
+        replica = FakeRepository(persist_path, self.versions, self.live_vectors)
+        self.replicas.append(replica)
+        return replica
+
+    def download_from_s3(self, versions):
+        for path in (self.persist_path, self.metadata_path):
+            Path(path).write_bytes(b"x")
+        self.last_known_s3_version_id = versions[1]
+
+    def load(self):
+        pass
+
+    def live_vector_count(self):
+        return self.live_vectors
+
+    def search(self, query_embedding, top_k):
+        # Only a downloaded version holds data; the local path starts empty.
+        results = self.chunks[:top_k] if self.last_known_s3_version_id else []
+        self.searches.append(results)
+        return results
+
+
+class TestS3IndexRefresher(unittest.TestCase):
+    """Tests polling, RCU publication and side-file cleanup of the S3 index refresher."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.persist_path = os.path.join(self.test_dir, "index.bin")
+        self.published = []
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_new_version_is_loaded_to_side_file_and_published(self):
+        repository = FakeRepository(self.persist_path, versions=("i1", "c1"))
+        refresher = S3IndexRefresher(repository, on_swap=self.published.append)
+
+        self.assertTrue(refresher.check_once())
+
+        replica = repository.replicas[0]
+        self.assertEqual(self.published, [replica])
+        self.assertIs(refresher.repository, replica)
+        self.assertEqual(replica.persist_path.name, "index.s3-1.bin")
+        status = refresher.status()
+        self.assertEqual(status["active_version"], "c1")
+        self.assertEqual(status["swap_count"], 1)
+        self.assertIsNotNone(status["last_swap_seconds"])
+        # Same version again: nothing to do.
+        self.assertFalse(refresher.check_once())
+
+    def test_retired_side_files_are_removed_after_the_next_swap(self):
+        repository = FakeRepository(self.persist_path, versions=("i1", "c1"))
+        refresher = S3IndexRefresher(repository, on_swap=self.published.append)
+        refresher.check_once()
+        first = refresher.repository
+
+        first.versions = ("i2", "c2")
+        self.assertTrue(refresher.check_once())
+
+        self.assertFalse(first.persist_path.exists())
+        self.assertFalse(first.metadata_path.exists())
+        self.assertTrue(refresher.repository.persist_path.exists())
+
+    def test_inconsistent_download_is_not_published(self):
+        repository = FakeRepository(
+            self.persist_path, versions=("i1", "c1"), live_vectors=3
+        )
+        refresher = S3IndexRefresher(repository, on_swap=self.published.append)
+
+        with self.assertRaises(ValueError):
+            refresher.check_once()
+
+        self.assertEqual(self.published, [])
+        self.assertIs(refresher.repository, repository)
+        self.assertIsNone(refresher.active_version)
+        self.assertFalse(repository.reload_lock.locked())
+
+    def test_failed_load_removes_the_downloaded_side_files(self):
+        repository = FakeRepository(self.persist_path, versions=("i1", "c1"))
+        replica_of = repository.replica
+
+        def failing_replica(persist_path):
+            replica = replica_of(persist_path)
+            replica.load = MagicMock(side_effect=RuntimeError("corrupt index"))
+            return replica
+
+        repository.replica = failing_replica
+        refresher = S3IndexRefresher(repository, on_swap=self.published.append)
+
+        with self.assertRaises(RuntimeError):
+            refresher.check_once()
+
+        replica = repository.replicas[0]
+        self.assertEqual(self.published, [])
+        self.assertFalse(replica.persist_path.exists())
+        self.assertFalse(replica.metadata_path.exists())
+        self.assertFalse(repository.reload_lock.locked())
+
+    def test_busy_reload_lock_skips_the_check(self):
+        repository = FakeRepository(self.persist_path, versions=("i1", "c1"))
+        refresher = S3IndexRefresher(repository, on_swap=self.published.append)
+
+        with repository.reload_lock:
+            self.assertFalse(refresher.check_once())
+        self.assertEqual(self.published, [])
+
+    def test_redirect_hands_the_live_repository_to_a_new_target(self):
+        repository = FakeRepository(self.persist_path, versions=("i1", "c1"))
+        refresher = S3IndexRefresher(repository, on_swap=self.published.append)
+        refresher.check_once()
+        redirected = []
+
+        live = refresher.redirect(redirected.append)
+
+        self.assertIs(live, refresher.repository)
+        self.assertIsNot(live, repository)
+        live.versions = ("i2", "c2")
+        self.assertTrue(refresher.check_once())
+        self.assertEqual(redirected, [refresher.repository])
+        self.assertEqual(len(self.published), 1)
+
+    def test_close_removes_the_live_side_files(self):
+        repository = FakeRepository(self.persist_path, versions=("i1", "c1"))
+        refresher = S3IndexRefresher(repository, on_swap=self.published.append)
+        refresher.check_once()
+        live = refresher.repository
+
+        refresher.close()
+
+        self.assertFalse(live.persist_path.exists())
+        self.assertFalse(live.metadata_path.exists())
+
+    def test_side_files_in_use_are_not_overwritten(self):
+        Path(self.test_dir, "index.s3-1.bin").write_bytes(b"live")
+        repository = FakeRepository(self.persist_path, versions=("i1", "c1"))
+        refresher = S3IndexRefresher(repository, on_swap=self.published.append)
+
+        refresher.check_once()
+
+        self.assertEqual(refresher.repository.persist_path.name, "index.s3-2.bin")
+        self.assertEqual(Path(self.test_dir, "index.s3-1.bin").read_bytes(), b"live")
+
+    def test_reload_warms_and_publishes_the_live_s3_index(self):
+        def build():
+            # As the API's build: a fresh repository on an empty local path, brought
+            # up to the live S3 version before the reloader warms it.
+            query_service = SimpleNamespace(
+                embedding_service=MagicMock(),
+                vector_repository=FakeRepository(self.persist_path, ("i1", "c1")),
+            )
+            query_service.embedding_service.embed_query.return_value = np.zeros(2)
+
+            def publish(repository):
+                query_service.vector_repository = repository
+
+            refresher = S3IndexRefresher(query_service.vector_repository, publish)
+            refresher.check_once()
+            return BuiltService(query_service, index_refresher=refresher)
+
+        reloader = ServiceReloader(build=build, publish=self.published.append)
+        job = reloader.start()
+        reloader.wait(5)
+
+        self.assertEqual(reloader.get(job.id).status, "succeeded")
+        built = self.published[0]
+        repository = built.query_service.vector_repository
+        self.assertEqual(repository.persist_path.name, "index.s3-1.bin")
+        # The warm-up search ran against the downloaded data, not the empty index.
+        self.assertEqual(len(repository.searches), 1)
+        self.assertEqual(len(repository.searches[0]), 1)
+        # The refresher starts at the version it loaded, so it will not download it again.
+        self.assertEqual(built.index_refresher.active_version, "c1")
+        self.assertFalse(built.index_refresher.check_once())
+
+
+if __name__ == "__main__":
+    unittest.main()
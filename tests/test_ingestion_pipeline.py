@@ -0,0 +1,402 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from src.application.pipeline import run_pipeline
+from src.application.services.ingestion_service import IngestionService
+from src.domain.entities.chunk import Chunk, chunk_content_id
+from src.domain.entities.document import Document
+from src.domain.entities.sync_plan import SyncPlan
+from src.domain.ports import (
+    IChunkingStrategy,
+    IDataSource,
+    IEmbeddingService,
+    IVectorRepository,
+)
+
+
+class FakeDataSource(IDataSource):
+    def __init__(self, contents):
+        self.docs = {f"doc-{i}": text for i, text in enumerate(contents)}
+        self.loaded = 0
+        self.listings = 0
+
+    def get_all_source_document_identifiers(self):
+        self.listings += 1
+        return list(self.docs)
+
+    def load_all(self):
+        return [self.load(doc_id) for doc_id in self.docs]
+
+    def load_new(self, last_known_ids):
+        return [self.load(d) for d in self.docs if d not in last_known_ids]
+
+    def load(self, doc_id):
+        self.loaded += 1
+        return Document(id=doc_id, content=self.docs[doc_id], source_location=doc_id)
+
+
+class WordChunker(IChunkingStrategy):
+    def chunk(self, document):
+        return [
+            Chunk(id=f"{document.id}-{i}", document_id=document.id, content=word)
+            for i, word in enumerate(document.content.split())
+        ]
+
+
+class LengthEmbedder(IEmbeddingService):
+    def embed_chunks(self, chunks, out=None):
+        for i, chunk in enumerate(chunks):
+            out[i] = [len(chunk.content), 1.0]
+
+    def embed_query(self, query):
+        return np.array([len(query), 1.0], dtype=np.float32)
+
+    def get_dimension(self):
+        return 2
+
+
+class ListRepository(IVectorRepository):
+    def __init__(self, doc_ids=()):
+        self.chunks = [Chunk(id="old", document_id=d, content="") for d in doc_ids]
+        self.saved = 0
+
+    def get_all_document_identifiers(self):
+        return list({c.document_id for c in self.chunks})
+
+    def delete_by_document_id(self, doc_ids):
+        self.chunks = [c for c in self.chunks if c.document_id not in doc_ids]
+
+    def add(self, chunks):
+        self.chunks.extend(chunks)
+
+    def search(self, query_embedding, top_k=5, metadata_filter=None):
+        return []
+
+    def save(self):
+        self.saved += 1
+
+    def carry_over(self, previous_document_id, chunks):
+        stored = [c for c in self.chunks if c.document_id == previous_document_id]
+        for chunk in chunks:
+            old = next(c for c in stored if c.id == chunk.id)
+            stored.remove(old)
+            chunk.embedding = old.embedding
+        self.chunks = [
+            c for c in self.chunks if c.document_id != previous_document_id
+        ] + list(chunks)
+
+
+class VersionedDataSource(FakeDataSource):
+    """Files whose ids change with their content, as S3 ETags and file hashes do."""
+
+    def __init__(self, files):
+        self.files = dict(files)
+        self.loaded = 0
+        self.listings = 0
+
+    @property
+    def docs(self):
+        return {f"{name}#{hash(text)}": name for name, text in self.files.items()}
+
+    def load(self, doc_id):
+        self.loaded += 1
+        name = self.docs[doc_id]
+        return Document(
+            id=doc_id,
+            content=self.files[name],
+            source_location=name,
+            metadata={"source": name},
+        )
+
+
+class CountingEmbedder(LengthEmbedder):
+    def __init__(self):
+        self.embedded = []
+
+    def embed_chunks(self, chunks, out=None):
+        self.embedded.extend(c.content for c in chunks)
+        super().embed_chunks(chunks, out)
+
+
+class DiffingRepository(ListRepository):
+    """Returns stored chunks for diffing, so they are carried over by id."""
+
+    def get_chunks_by_document_id(self, doc_ids):
+        found = {}
+        for chunk in self.chunks:
+            if chunk.document_id in doc_ids:
+                found.setdefault(chunk.document_id, []).append(chunk)
+        return found
+
+
+class CheckpointedRepository(DiffingRepository):
+    """Persists a copy of its chunks on save() and restores it on load()."""
+
+    def __init__(self, doc_ids=()):
+        super().__init__(doc_ids)
+        self.persisted = []
+        self.snapshots = []
+
+    def save(self):
+        super().save()
+        self.persisted = list(self.chunks)
+        self.snapshots.append(self.persisted)
+
+    def load(self):
+        self.chunks = list(self.persisted)
+
+
+class FailingEmbedder(CountingEmbedder):
+    def embed_chunks(self, chunks, out=None):
+        if any(c.content == "boom" for c in chunks):
+            raise RuntimeError("embedding task died")
+        super().embed_chunks(chunks, out)
+
+
+class TestRunPipeline(unittest.TestCase):
+    """Tests ordering, backpressure and error propagation of the staged pipeline."""
+
+    def test_items_keep_source_order_through_batching_stages(self):
+        def pairs(items):
+            batch = []
+            for item in items:
+                batch.append(item)
+                if len(batch) == 2:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        out = []
+        run_pipeline(range(7), [("pairs", pairs)], out.append, queue_size=1)
+        self.assertEqual(out, [[0, 1], [2, 3], [4, 5], [6]])
+
+    def test_slow_sink_bounds_items_read_ahead(self):
+        read = []
+
+        def source():
+            for i in range(50):
+                read.append(i)
+                yield i
+
+        def slow_sink(item):
+            if item == 0:
+                time.sleep(0.3)
+                # Source queue, one stage, stage queue, plus one item held per thread.
+                self.assertLessEqual(len(read), 2 + 2 + 3)
+
+        run_pipeline(source(), [("noop", lambda items: items)], slow_sink, queue_size=2)
+        self.assertEqual(len(read), 50)
+
+    def test_stage_error_is_raised_and_stops_the_source(self):
+        stop = threading.Event()
+
+        def endless():
+            i = 0
+            while not stop.is_set():
+                yield i
+                i += 1
+
+        def explode(items):
+            for item in items:
+                if item == 3:
+                    raise ValueError("boom")
+                yield item
+
+        with self.assertRaises(ValueError):
+            run_pipeline(endless(), [("explode", explode)], lambda item: None)
+        stop.set()
+
+
+class TestSyncPlan(unittest.TestCase):
+    def test_plan_splits_source_into_adds_deletes_and_unchanged(self):
+        plan = SyncPlan.compute({"a": 1, "b": 2, "c": 3}, ["b", "x", "y"])
+        self.assertEqual(plan.to_add, {"a": 1, "c": 3})
+        self.assertEqual(plan.to_delete, ["x", "y"])
+        self.assertEqual(plan.unchanged, 1)
+        self.assertEqual(plan.summary(), "2 to add, 2 to delete, 1 unchanged")
+
+
+class TestStreamingIngestion(unittest.TestCase):
+    """Tests IngestionService end to end against in-memory ports."""
+
+    def test_ingest_streams_all_chunks_in_micro_batches(self):
+        source = FakeDataSource(["a bb ccc", "dddd", "e ff"])
+        repository = ListRepository()
+        added = []
+        repository.add = lambda chunks: added.append(list(chunks))
+        service = IngestionService(
+            source, WordChunker(), LengthEmbedder(), repository, embed_batch_size=2
+        )
+        service.ingest()
+
+        self.assertEqual([len(batch) for batch in added], [2, 2, 2])
+        flat = [chunk for batch in added for chunk in batch]
+        self.assertEqual(
+            [c.content for c in flat], ["a", "bb", "ccc", "dddd", "e", "ff"]
+        )
+        np.testing.assert_array_equal(flat[3].embedding, [4.0, 1.0])
+        self.assertEqual(repository.saved, 1)
+
+    def test_streamed_documents_are_chunked_by_the_pipeline(self):
+        text = "one two three four five"
+        doc = Document(
+            id="big",
+            content="",
+            source_location="big",
+            stream=lambda: iter(text[i : i + 4] for i in range(0, len(text), 4)),
+        )
+        repository = ListRepository()
+        service = IngestionService(
+            FakeDataSource([]), WordChunker(), LengthEmbedder(), repository
+        )
+        service._stream([doc])
+        self.assertEqual([c.content for c in repository.chunks], text.split())
+
+    def test_run_deletes_removed_documents_and_adds_only_new_ones(self):
+        source = FakeDataSource(["x y", "z"])
+        repository = ListRepository(doc_ids=["doc-0", "gone"])
+        IngestionService(source, WordChunker(), LengthEmbedder(), repository).run()
+
+        self.assertEqual(source.loaded, 1)
+        self.assertEqual(source.listings, 1)
+        self.assertEqual(
+            sorted(c.document_id for c in repository.chunks), ["doc-0", "doc-1"]
+        )
+        self.assertEqual(repository.saved, 1)
+
+    def test_repositories_cannot_skip_carry_over(self):
+        # Carried-over chunks are never re-embedded, so no default could keep them.
+        self.assertIn("carry_over", IVectorRepository.__abstractmethods__)
+
+    def test_run_embeds_only_the_changed_chunks_of_an_edited_document(self):
+        source = VersionedDataSource(
+            {"a.md": "one two three two", "b.md": "keep me", "c.md": "deleted"}
+        )
+        repository = DiffingRepository()
+        embedder = CountingEmbedder()
+        service = IngestionService(source, WordChunker(), embedder, repository)
+        service.run()
+        self.assertEqual(len(embedder.embedded), 7)
+
+        embedder.embedded.clear()
+        source.files["a.md"] = "one two 3 two four"
+        del source.files["c.md"]
+        service.run()
+
+        self.assertEqual(embedder.embedded, ["3", "four"])
+        new_a = next(i for i, name in source.docs.items() if name == "a.md")
+        contents = sorted(
+            (c.content, c.embedding.tolist())
+            for c in repository.chunks
+            if c.document_id == new_a
+        )
+        self.assertEqual([c for c, _ in contents], ["3", "four", "one", "two", "two"])
+        self.assertEqual(dict(contents)["one"], [3.0, 1.0])  # Vector kept
+        self.assertEqual(
+            sorted({c.document_id for c in repository.chunks}),
+            sorted(source.docs),
+        )
+        self.assertEqual(repository.chunks[0].id, chunk_content_id("keep"))
+
+    def test_checkpoints_hold_complete_documents_with_versions_carried_over(self):
+        files = {
+            f"{i}.md": " ".join(f"w{i}x{j}" for j in range(i % 4 + 1)) for i in range(9)
+        }
+        source = VersionedDataSource(files)
+        repository = CheckpointedRepository()
+        IngestionService(source, WordChunker(), LengthEmbedder(), repository).run()
+
+        for name in ("1.md", "6.md"):
+            source.files[name] += " edited"
+        source.files["9.md"] = "new file here"
+        repository.snapshots.clear()
+        IngestionService(
+            source,
+            WordChunker(),
+            LengthEmbedder(),
+            repository,
+            embed_batch_size=2,
+            queue_size=1,
+            checkpoint_every_chunks=1,
+        ).run()
+
+        self.assertGreater(len(repository.snapshots), 1)
+        for snapshot in repository.snapshots:
+            by_doc = {}
+            for chunk in snapshot:
+                by_doc.setdefault(chunk.document_id, []).append(chunk)
+            sources = [chunks[0].metadata["source"] for chunks in by_doc.values()]
+            self.assertEqual(len(sources), len(set(sources)))  # No stale versions
+            for doc_id, chunks in by_doc.items():
+                if doc_id in source.docs:  # Not a version yet to be replaced
+                    text = source.files[source.docs[doc_id]]
+                    self.assertEqual(len(chunks), len(text.split()))
+        self.assertEqual(
+            sorted({c.document_id for c in repository.chunks}), sorted(source.docs)
+        )
+
+    def test_checkpoints_a_repository_cannot_take_yet_are_retried_later(self):
+        source = FakeDataSource([f"a{i} b{i} c{i}" for i in range(12)])
+        repository = ListRepository()
+        attempts = []
+
+        def checkpoint():
+            attempts.append(len(repository.chunks))
+            return False  # As an IVF index still waiting for training vectors
+
+        repository.checkpoint = checkpoint
+        service = IngestionService(
+            source,
+            WordChunker(),
+            LengthEmbedder(),
+            repository,
+            embed_batch_size=2,
+            queue_size=1,
+            checkpoint_every_chunks=6,
+        )
+
+        service.ingest()
+
+        # Each refusal restarts the interval instead of retrying every batch.
+        self.assertTrue(attempts)
+        for before, after in zip(attempts, attempts[1:]):
+            self.assertGreaterEqual(after - before, 6)
+        self.assertEqual(repository.saved, 1)  # Only the final save
+        self.assertEqual(len(repository.chunks), 36)
+
+    def test_resume_skips_documents_saved_by_the_last_checkpoint(self):
+        contents = [f"a{i} b{i} c{i}" for i in range(12)] + ["boom"]
+        source = FakeDataSource(contents)
+        repository = CheckpointedRepository()
+        with self.assertRaises(RuntimeError):
+            IngestionService(
+                source,
+                WordChunker(),
+                FailingEmbedder(),
+                repository,
+                embed_batch_size=2,
+                queue_size=1,
+                checkpoint_every_chunks=4,
+            ).ingest()
+        checkpointed = {c.document_id for c in repository.persisted}
+        self.assertTrue(checkpointed)
+        self.assertNotIn("doc-12", checkpointed)
+
+        source.docs["doc-12"] = "fixed"
+        embedder = CountingEmbedder()
+        repository.chunks = []  # The task died; only the checkpoint survives.
+        IngestionService(source, WordChunker(), embedder, repository).ingest(
+            resume=True
+        )
+
+        self.assertEqual(len(embedder.embedded), 3 * (12 - len(checkpointed)) + 1)
+        words = sorted(c.content for c in repository.chunks)
+        self.assertEqual(words, sorted(" ".join(source.docs.values()).split()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec("sentence_transformers"),
+    "src.main imports every embedding service",
+)
+class TestIngestionMain(unittest.TestCase):
+    """Tests that the ingestion entry point wires the config into the adapters."""
+
+    def test_data_source_settings_reach_the_data_source(self):
+        # src.main builds a ConfigManager at import, which requires APP_MODE.
+        with patch.dict(os.environ, {"APP_MODE": "dev"}):
+            from src import main
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            config = SimpleNamespace(
+                data_source={
+                    "type": "file_system",
+                    "path": data_dir,
+                    "include": ["*.py"],
+                    "stream_threshold_bytes": 1024,
+                },
+                chunking_strategy={},
+                embedding_service={"type": "sentence_transformer"},
+                vector_repository={"persist_path": f"{data_dir}/index.faiss"},
+                ingestion={},
+            )
+            with (
+                patch.object(main, "config_manager", SimpleNamespace(config=config)),
+                patch.object(main, "create_data_source") as create_data_source,
+                patch.object(main, "create_chunking_strategy"),
+                patch.object(main, "create_embedding_service"),
+                patch.object(main, "create_vector_repository"),
+                patch.object(main, "IngestionService"),
+            ):
+                self.assertEqual(main.main(), 0)
+
+        create_data_source.assert_called_once_with(
+            "file_system",
+            path=data_dir,
+            include=["*.py"],
+            stream_threshold_bytes=1024,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+from src.adapters.vector_storage.metadata_index import MetadataIndex, id_bitmap
+
+
+class TestMetadataIndex(unittest.TestCase):
+    """Tests the (key, value) -> vector id inverted index used for filtered search."""
+
+    def setUp(self):
+        self.index = MetadataIndex()
+        self.index.add(0, {"source": "s3://b/contracts/a.md", "lang": "en"})
+        self.index.add(1, {"source": "s3://b/contracts/b.md", "lang": "fr"})
+        self.index.add(2, {"source": "s3://b/memos/c.md", "lang": "en"})
+        self.index.add(3, {"source": "s3://b/memos/d.md", "tags": ["x", "y"]})
+
+    def test_equality_in_and_prefix_conditions(self):
+        self.assertEqual(self.index.match({"lang": "en"}).tolist(), [0, 2])
+        self.assertEqual(self.index.match({"lang": ["fr", "de"]}).tolist(), [1])
+        self.assertEqual(
+            self.index.match({"source": {"prefix": "s3://b/contracts/"}}).tolist(),
+            [0, 1],
+        )
+        self.assertEqual(self.index.match({"tags": ["x", "y"]}).tolist(), [])
+        self.assertEqual(self.index.match({"tags": (["x", "y"],)}).tolist(), [3])
+
+    def test_conditions_are_and_ed_and_unknown_keys_match_nothing(self):
+        self.assertEqual(
+            self.index.match(
+                {"lang": "en", "source": {"prefix": "s3://b/memos/"}}
+            ).tolist(),
+            [2],
+        )
+        self.assertEqual(self.index.match({"missing": 1}).tolist(), [])
+
+    def test_remove_drops_postings(self):
+        self.index.remove(0, {"source": "s3://b/contracts/a.md", "lang": "en"})
+
+        self.assertEqual(self.index.match({"lang": "en"}).tolist(), [2])
+        self.assertEqual(
+            self.index.match({"source": {"prefix": "s3://b/contracts/"}}).tolist(), [1]
+        )
+
+    def test_id_bitmap_matches_faiss_layout(self):
+        bitmap = id_bitmap(np.array([0, 3, 10]), 16)
+
+        np.testing.assert_array_equal(bitmap, np.array([0b1001, 0b100], dtype=np.uint8))
+
+
+if __name__ == "__main__":
+    unittest.main()
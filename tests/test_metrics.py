@@ -0,0 +1,129 @@
+import threading
+import unittest
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.adapters.api.metrics import RequestMetricsMiddleware
+from src.application.metrics import REGISTRY, MetricsRegistry
+
+
+def samples(registry):
+    """Rendered samples as {name{labels}: value}, without HELP/TYPE lines."""
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in registry.render().splitlines()
+        if not line.startswith("#")
+    }
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Tests the text exposition of counters, gauges and histograms."""
+
+    def test_histogram_buckets_are_cumulative_with_sum_and_count(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("t_seconds", "Time.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        rendered = registry.render()
+        self.assertIn("# HELP t_seconds Time.\n# TYPE t_seconds histogram\n", rendered)
+        self.assertEqual(
+            samples(registry),
+            {
+                't_seconds_bucket{le="0.1"}': 2,
+                't_seconds_bucket{le="1.0"}': 3,
+                't_seconds_bucket{le="+Inf"}': 4,
+                "t_seconds_sum": 3.65,
+                "t_seconds_count": 4,
+            },
+        )
+
+    def test_labelled_children_and_escaping(self):
+        registry = MetricsRegistry()
+        errors = registry.counter("errors_total", "Errors.", ["endpoint"])
+        errors.labels("/query").inc()
+        errors.labels("/query").inc(2)
+        errors.labels('a"b').inc()
+        gauge = registry.gauge("info", "Info.", ["version"])
+        gauge.labels("7").set(1)
+
+        self.assertEqual(
+            samples(registry),
+            {
+                'errors_total{endpoint="/query"}': 3,
+                'errors_total{endpoint="a\\"b"}': 1,
+                'info{version="7"}': 1,
+            },
+        )
+        with self.assertRaises(ValueError):
+            errors.labels("/query", "extra")
+
+    def test_function_metrics_are_read_at_scrape_time_and_can_be_repointed(self):
+        registry = MetricsRegistry()
+        state = {"hits": 1}
+        registry.counter("hits_total", "Hits.", ["tier"], lambda: {("exact",): 1})
+        registry.gauge("size", "Size.", function=lambda: state["hits"])
+        state["hits"] = 5
+        self.assertEqual(samples(registry)["size"], 5)
+        self.assertEqual(samples(registry)['hits_total{tier="exact"}'], 1)
+
+        # Registering again returns the same metric, pointed at the new function.
+        same = registry.gauge("size", "Size.", function=lambda: 9)
+        self.assertEqual(samples(registry)["size"], 9)
+        self.assertIs(same, registry.gauge("size", "Size."))
+        with self.assertRaises(ValueError):
+            registry.counter("size", "Size.")
+
+        registry.gauge("broken", "Broken.", function=lambda: 1 / 0)
+        self.assertIn("# broken unavailable", registry.render())
+
+    def test_updates_from_many_threads_are_not_lost(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("c_total", "C.")
+        histogram = registry.histogram("h_seconds", "H.")
+
+        def work():
+            for _ in range(20000):
+                counter.inc()
+                histogram.observe(0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(samples(registry)["c_total"], 80000)
+        self.assertEqual(samples(registry)["h_seconds_count"], 80000)
+
+
+class TestRequestMetricsMiddleware(unittest.TestCase):
+    """Tests request timing and error counting by route template."""
+
+    def test_requests_are_timed_by_route_and_5xx_counted(self):
+        def item(request):
+            if request.path_params["name"] == "boom":
+                return PlainTextResponse("no", status_code=503)
+            return PlainTextResponse("ok")
+
+        app = Starlette(routes=[Route("/items/{name}", item)])
+        app.add_middleware(RequestMetricsMiddleware)
+        with TestClient(app) as client:
+            for name in ("a", "b", "boom"):
+                client.get(f"/items/{name}")
+            client.get("/elsewhere")
+
+        scraped = samples(REGISTRY)
+        route = 'endpoint="/items/{name}"'
+        self.assertEqual(scraped[f"rag_request_seconds_count{{{route}}}"], 3)
+        self.assertEqual(scraped[f"rag_errors_total{{{route}}}"], 1)
+        self.assertGreaterEqual(
+            scraped['rag_request_seconds_count{endpoint="unmatched"}'], 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from src.application.parallel_chunking import ParallelChunker
+from src.domain.entities.chunk import Chunk
+from src.domain.entities.document import Document
+from src.domain.ports import IChunkingStrategy
+
+
+class WordChunker(IChunkingStrategy):
+    def chunk(self, document):
+        return [
+            Chunk(id=f"{document.id}-{i}", document_id=document.id, content=word)
+            for i, word in enumerate(document.content.split())
+        ]
+
+
+def make_docs(sizes):
+    return [
+        Document(id=f"doc-{i}", content=" ".join(["w"] * n), source_location="")
+        for i, n in enumerate(sizes)
+    ]
+
+
+def chunk_ids(results):
+    return [(doc.id, [c.id for c in chunks]) for doc, chunks in results]
+
+
+class TestParallelChunker(unittest.TestCase):
+    """Tests ordering and in-process fallbacks of the process-pool chunker."""
+
+    def test_pool_output_matches_serial_order(self):
+        # Uneven sizes over several small batches exercise the ordered window.
+        docs = make_docs([300, 5, 1200, 40, 800, 2, 600, 900, 7, 350] * 3)
+        chunker = ParallelChunker(
+            WordChunker(), max_workers=2, batch_bytes=2000, min_parallel_bytes=0
+        )
+        try:
+            parallel = chunk_ids(chunker.chunk_documents(iter(docs)))
+            self.assertIsNotNone(chunker._pool)
+        finally:
+            chunker.close()
+        serial = chunk_ids(ParallelChunker(WordChunker()).chunk_documents(docs))
+        self.assertEqual(parallel, serial)
+
+    def test_tiny_input_stays_in_process(self):
+        chunker = ParallelChunker(WordChunker(), max_workers=4)
+        results = chunk_ids(chunker.chunk_documents(make_docs([3, 4])))
+        self.assertIsNone(chunker._pool)
+        self.assertEqual(results[1], ("doc-1", [f"doc-1-{i}" for i in range(4)]))
+
+    def test_streamed_documents_are_chunked_in_process(self):
+        streamed = Document(
+            id="big", content="", source_location="", stream=lambda: iter(["a b ", "c"])
+        )
+        docs = make_docs([2]) + [streamed]
+        chunker = ParallelChunker(WordChunker(), max_workers=2)
+        results = chunk_ids(chunker.chunk_documents(docs))
+        self.assertIsNone(chunker._pool)
+        self.assertEqual(results[1], ("big", ["big-0", "big-1", "big-2"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from src.application.query_batching import QueryBatcher
+from src.domain.entities import Chunk
+
+
+class RecordingSearch:
+    """Answers each query with top_k chunks named after it; records every batch."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.calls = []
+        self.threads = set()
+        self.delay = delay
+        self.error = error
+
+    def __call__(self, queries, top_k):
+        self.calls.append((list(queries), top_k))
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [
+            [Chunk(id=f"{q}-{i}", document_id=q, content=q) for i in range(top_k)]
+            for q in queries
+        ]
+
+
+class TestQueryBatcher(unittest.IsolatedAsyncioTestCase):
+    """Tests coalescing, fan-out and failure handling of /query micro-batches."""
+
+    async def test_concurrent_queries_share_one_search_and_keep_their_top_k(self):
+        search = RecordingSearch()
+        batcher = QueryBatcher(search, max_batch_size=8, max_wait_ms=50)
+        results = await asyncio.gather(
+            *(batcher.search(f"q{i}", top_k=i % 3 + 1) for i in range(5))
+        )
+        await batcher.close()
+
+        self.assertEqual(search.calls, [([f"q{i}" for i in range(5)], 3)])
+        self.assertNotIn(threading.get_ident(), search.threads)
+        for i, chunks in enumerate(results):
+            self.assertEqual(
+                [c.id for c in chunks], [f"q{i}-{j}" for j in range(i % 3 + 1)]
+            )
+
+    async def test_batches_are_capped_and_queries_arriving_meanwhile_batch_up(self):
+        search = RecordingSearch(delay=0.05)
+        batcher = QueryBatcher(search, max_batch_size=3, max_wait_ms=1)
+        first = asyncio.ensure_future(batcher.search("first"))
+        await asyncio.sleep(0.02)  # The first batch is now searching
+        rest = [batcher.search(f"q{i}") for i in range(5)]
+        await asyncio.gather(first, *rest)
+        await batcher.close()
+
+        self.assertEqual([len(q) for q, _ in search.calls], [1, 3, 2])
+        self.assertEqual(batcher.batches, 3)
+        self.assertEqual(batcher.queries, 6)
+
+    async def test_a_lone_query_waits_at_most_max_wait(self):
+        batcher = QueryBatcher(RecordingSearch(), max_batch_size=32, max_wait_ms=20)
+        start = time.perf_counter()
+        await batcher.search("alone")
+        await batcher.close()
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    async def test_a_failed_search_fails_every_query_of_its_batch(self):
+        batcher = QueryBatcher(RecordingSearch(error=ValueError("model down")))
+        results = await asyncio.gather(
+            batcher.search("a"), batcher.search("b"), return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+        batcher.search_batch = RecordingSearch()
+        self.assertEqual(len(await batcher.search("c", top_k=2)), 2)
+        await batcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from src.application.query_cache import QueryResultCache, normalize_query
+from src.domain.entities import Chunk
+
+
+def chunks(name, n=2, size=10):
+    return [
+        Chunk(id=f"{name}-{i}", document_id=name, content="x" * size) for i in range(n)
+    ]
+
+
+class TestQueryResultCache(unittest.TestCase):
+    """Tests keys, versioned invalidation, expiry and eviction of /query results."""
+
+    def test_hit_after_put_with_normalized_text_and_same_top_k_and_filter(self):
+        cache = QueryResultCache()
+        cache.put("How  do I\tsearch?", 3, 1, chunks("a"))
+
+        self.assertEqual(
+            [c.id for c in cache.get(" How do I search? ", 3, 1)], ["a-0", "a-1"]
+        )
+        self.assertIsNone(cache.get("How do I search?", 2, 1))
+        self.assertIsNone(
+            cache.get("How do I search?", 3, 1, metadata_filter={"lang": "py"})
+        )
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(normalize_query("Café  x"), "Café x")
+
+    def test_a_newer_index_version_clears_the_cache(self):
+        cache = QueryResultCache()
+        cache.put("q", 3, 1, chunks("a"))
+        self.assertIsNone(cache.get("q", 3, 2))
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache.invalidations, 1)
+        # A search that started before the swap stores under the old version: dropped.
+        cache.put("q", 3, 1, chunks("stale"))
+        self.assertIsNone(cache.get("q", 3, 2))
+        self.assertEqual(cache.stats()["index_version"], 2)
+
+    def test_unversioned_results_are_never_cached(self):
+        cache = QueryResultCache()
+        cache.put("q", 3, None, chunks("a"))
+        self.assertIsNone(cache.get("q", 3, None))
+        self.assertEqual(cache.memory_bytes, 0)
+
+    def test_entries_expire_after_ttl(self):
+        cache = QueryResultCache(ttl_seconds=10)
+        now = time.monotonic()
+        with patch("src.application.query_cache.time.monotonic", return_value=now):
+            cache.put("q", 3, 1, chunks("a"))
+        with patch("src.application.query_cache.time.monotonic", return_value=now + 11):
+            self.assertIsNone(cache.get("q", 3, 1))
+        self.assertEqual(cache.memory_bytes, 0)
+
+    def test_least_recently_used_are_evicted_beyond_entries_and_bytes(self):
+        cache = QueryResultCache(max_entries=2)
+        cache.put("a", 3, 1, chunks("a"))
+        cache.put("b", 3, 1, chunks("b"))
+        cache.get("a", 3, 1)
+        cache.put("c", 3, 1, chunks("c"))
+        self.assertIsNone(cache.get("b", 3, 1))
+        self.assertIsNotNone(cache.get("a", 3, 1))
+        self.assertEqual(cache.evictions, 1)
+
+        cache = QueryResultCache(max_bytes=3000)
+        for name in "abcde":
+            cache.put(name, 3, 1, chunks(name, size=400))
+        self.assertLessEqual(cache.memory_bytes, 3000)
+        self.assertLess(cache.stats()["entries"], 5)
+        self.assertIsNotNone(cache.get("e", 3, 1))
+
+    def test_configure_applies_smaller_limits_to_held_entries(self):
+        cache = QueryResultCache()
+        for name in "abc":
+            cache.put(name, 3, 1, chunks(name))
+        cache.get("a", 3, 1)
+
+        cache.configure(max_entries=1, max_bytes=64 << 20, ttl_seconds=60)
+
+        self.assertEqual(cache.stats()["entries"], 1)
+        self.assertIsNotNone(cache.get("a", 3, 1))
+        self.assertEqual((cache.evictions, cache.ttl_seconds), (2, 60))
+
+    def test_zero_max_entries_disables_the_cache(self):
+        cache = QueryResultCache(max_entries=0)
+        cache.put("q", 3, 1, chunks("a"))
+        self.assertIsNone(cache.get("q", 3, 1))
+        self.assertFalse(cache.stats()["enabled"])
+
+
+if __name__ == "__main__":
+    unittest.main()
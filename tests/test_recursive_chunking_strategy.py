@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import random
+import unittest
+
+from src.adapters.chunking.recursive_chunking_strategy import RecursiveChunkingStrategy
+from src.domain.entities.document import Document
+
+GOLDEN_PATH = os.path.join(
+    os.path.dirname(__file__), "data", "recursive_splitter_golden.json"
+)
+
+# (chunk_size, chunk_overlap) pairs the golden outputs were recorded for.
+SPLITTER_PARAMS = [(1000, 200), (200, 50), (64, 0), (37, 10), (5, 2), (1, 0)]
+
+CODE_LINES = [
+    "def handler(event, context):",
+    "    return {'statusCode': 200, 'body': json.dumps(result)}",
+    "class ContractClause(BaseModel):",
+    "        if clause.term_days > 30 and not clause.auto_renew:",
+    "\tfor i in range(len(items)):  # tabs, too",
+    "    x = compute_the_very_long_identifier_name_without_any_spaces_at_all_here()",
+]
+PROSE_WORDS = (
+    "the party shall indemnify agreement clause term notice payment within days "
+    "naïve café 契約 — “quoted” ünïcödé"
+).split()
+
+
+def golden_corpus():
+    """Deterministic mix of code, prose, blank-line runs and unbroken tokens."""
+    rng = random.Random(1234)
+    texts = ["", " ", "\n\n\n", "a", "word " * 3, "x" * 2500]
+    for _ in range(14):
+        parts = []
+        for _ in range(rng.randint(5, 60)):
+            kind = rng.random()
+            if kind < 0.45:
+                parts.append("\n".join(rng.choices(CODE_LINES, k=rng.randint(1, 12))))
+            elif kind < 0.85:
+                parts.append(" ".join(rng.choices(PROSE_WORDS, k=rng.randint(1, 120))))
+            elif kind < 0.95:
+                parts.append("y" * rng.randint(50, 1500))
+            else:
+                parts.append(" \t ")
+            parts.append(rng.choice(["\n\n", "\n", "\n\n\n", " ", "\n \n"]))
+        texts.append("".join(parts))
+    return texts
+
+
+def digest(chunks):
+    return hashlib.sha256(json.dumps(chunks).encode("utf-8")).hexdigest()
+
+
+class TestRecursiveChunkingStrategy(unittest.TestCase):
+    """Tests the native splitter against recorded RecursiveCharacterTextSplitter output."""
+
+    def test_matches_langchain_on_golden_corpus(self):
+        with open(GOLDEN_PATH, encoding="utf-8") as f:
+            golden = json.load(f)
+        corpus = golden_corpus()
+        for chunk_size, chunk_overlap in SPLITTER_PARAMS:
+            splitter = RecursiveChunkingStrategy(chunk_size, chunk_overlap)
+            expected = golden[f"{chunk_size}/{chunk_overlap}"]
+            for i, text in enumerate(corpus):
+                with self.subTest(chunk_size=chunk_size, text=i):
+                    chunks = splitter.split_text(text)
+                    self.assertEqual(
+                        [len(chunks), digest(chunks)], expected[i], "differs"
+                    )
+
+    def test_chunks_record_their_span(self):
+        text = golden_corpus()[7]
+        doc = Document(
+            id="d", content=text, source_location="", metadata={"source": "s"}
+        )
+        chunks = RecursiveChunkingStrategy(200, 50).chunk(doc)
+        self.assertGreater(len(chunks), 10)
+        for chunk in chunks:
+            start, end = chunk.metadata["start_index"], chunk.metadata["end_index"]
+            self.assertEqual(text[start:end], chunk.content)
+            self.assertEqual(chunk.metadata["source"], "s")
+
+    def test_streamed_spans_are_document_offsets(self):
+        text = golden_corpus()[9]
+        strategy = RecursiveChunkingStrategy(64, 0)
+        strategy.STREAM_WINDOW_CHUNKS = 4
+        pieces = [text[i : i + 100] for i in range(0, len(text), 100)]
+        doc = Document(
+            id="d", content="", source_location="", stream=lambda: iter(pieces)
+        )
+        chunks = list(strategy.chunk_stream(doc))
+        self.assertGreater(len(chunks), 20)
+        for chunk in chunks:
+            start, end = chunk.metadata["start_index"], chunk.metadata["end_index"]
+            self.assertEqual(text[start:end], chunk.content)
+        self.assertEqual([c.id for c in chunks][-1], f"d_chunk_{len(chunks) - 1}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+import functools
+import io
+import threading
+import time
+import unittest
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+from src.adapters.data_sources import s3_data_source, streaming_reads
+from src.adapters.data_sources.s3_data_source import S3DataSource
+from src.adapters.data_sources.s3_listing import S3ListingSnapshot
+
+
+class FakeS3Client:
+    """In-memory stand-in for the S3 client: listing, GETs with latency and faults."""
+
+    def __init__(self, objects, latency=0.0, fail_first=0, page_size=1000):
+        self.objects = dict(objects)
+        self.latency = latency
+        self.fail_first = fail_first
+        self.page_size = page_size
+        self.gets = 0
+        self.list_calls = 0
+        self.list_start_after = []
+        self.ranges = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def listing(self, key):
+        return {"Key": key, "ETag": f'"etag-{key}"', "Size": len(self.objects[key])}
+
+    def get_paginator(self, name):
+        client = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix, StartAfter=""):
+                client.list_calls += 1
+                client.list_start_after.append(StartAfter)
+                keys = sorted(
+                    k for k in client.objects if k.startswith(Prefix) and k > StartAfter
+                )
+                for start in range(0, len(keys), client.page_size):
+                    page = keys[start : start + client.page_size]
+                    yield {"Contents": [client.listing(k) for k in page]}
+
+        return Paginator()
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None):
+        with self._lock:
+            self.gets += 1
+            fail = self.gets <= self.fail_first
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if fail:
+                raise ClientError(
+                    {"Error": {"Code": "SlowDown", "Message": "slow down"}}, "GetObject"
+                )
+            body = self.objects[Key]
+            if Range:
+                self.ranges.append(Range)
+                first, last = map(int, Range[len("bytes=") :].split("-"))
+                body = body[first : last + 1]
+            return {"Body": io.BytesIO(body)}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def make_source(client, **kwargs):
+    source = S3DataSource(bucket="bucket", prefix="raw/", client=client, **kwargs)
+    source.fetcher.sleep = lambda seconds: None
+    return source
+
+
+class TestS3DataSource(unittest.TestCase):
+    """Tests concurrent fetching against a fake S3 client."""
+
+    def setUp(self):
+        self.objects = {f"raw/doc-{i:03d}.md": f"text {i}".encode() for i in range(100)}
+
+    def test_ordered_load_keeps_listing_order_and_runs_concurrently(self):
+        client = FakeS3Client(self.objects, latency=0.01)
+        source = make_source(client, max_workers=16)
+        start = time.perf_counter()
+        documents = source.load_all()
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(
+            [d.content for d in documents], [f"text {i}" for i in range(100)]
+        )
+        self.assertEqual(documents[0].id, "etag-raw/doc-000.md")
+        self.assertGreater(client.max_in_flight, 1)
+        self.assertLessEqual(client.max_in_flight, 16)
+        self.assertLess(elapsed, 100 * 0.01 / 2)
+        stats = source.fetcher.last_stats
+        self.assertEqual(stats.objects, 100)
+        self.assertEqual(stats.bytes, sum(len(b) for b in self.objects.values()))
+
+    def test_unordered_load_yields_every_document(self):
+        source = make_source(FakeS3Client(self.objects), ordered=False)
+        contents = {d.content for d in source.iter_all()}
+        self.assertEqual(contents, {f"text {i}" for i in range(100)})
+
+    def test_transient_errors_are_retried_per_object(self):
+        client = FakeS3Client(self.objects, fail_first=5)
+        source = make_source(client, max_workers=4)
+        self.assertEqual(len(source.load_all()), 100)
+        self.assertEqual(source.fetcher.last_stats.retries, 5)
+
+    def test_missing_object_fails_fast(self):
+        client = FakeS3Client(self.objects)
+        client.get_object = lambda Bucket, Key: (_ for _ in ()).throw(
+            ClientError({"Error": {"Code": "NoSuchKey", "Message": ""}}, "GetObject")
+        )
+        with self.assertRaises(ClientError):
+            make_source(client).load_all()
+
+    def test_load_new_fetches_only_unknown_etags(self):
+        client = FakeS3Client(self.objects)
+        source = make_source(client)
+        known = [f"etag-raw/doc-{i:03d}.md" for i in range(90)]
+        self.assertEqual(len(source.load_new(known)), 10)
+        self.assertEqual(client.gets, 10)
+
+    def test_sync_plan_fetches_from_a_single_listing(self):
+        client = FakeS3Client(self.objects)
+        source = make_source(client)
+        known = [f"etag-raw/doc-{i:03d}.md" for i in range(95)] + ["etag-gone"]
+        plan = source.plan_sync(known)
+        self.assertEqual((len(plan.to_add), plan.to_delete), (5, ["etag-gone"]))
+        self.assertEqual(len(list(source.iter_planned(plan))), 5)
+        self.assertEqual((client.list_calls, client.gets), (1, 5))
+
+    def test_large_objects_are_streamed_in_ranged_reads(self):
+        self.objects["raw/big.log"] = "línea\r\n".encode() * 5000  # 40 kB
+        client = FakeS3Client(self.objects)
+        source = make_source(client, stream_threshold_bytes=10_000)
+        with mock.patch.object(s3_data_source, "iter_s3_blocks") as blocks:
+            blocks.side_effect = functools.partial(
+                streaming_reads.iter_s3_blocks, range_bytes=15_999
+            )
+            documents = {d.source_location: d for d in source.iter_all()}
+            self.assertEqual(client.gets, 100)
+
+            big = documents["s3://bucket/raw/big.log"]
+            self.assertTrue(big.is_streamed)
+            self.assertEqual(big.content, "")
+            self.assertEqual("".join(big.iter_text()), "línea\n" * 5000)
+        self.assertEqual(
+            client.ranges, ["bytes=0-15998", "bytes=15999-31997", "bytes=31998-39999"]
+        )
+
+
+class TestS3ListingSnapshot(unittest.TestCase):
+    """Tests id lookups served from the listing snapshot."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.client = FakeS3Client({f"raw/{i:03d}": b"x" for i in range(50)})
+        self.source = make_source(self.client)
+        self.source.listing = S3ListingSnapshot(
+            self.source._paginate,
+            ttl_seconds=60,
+            min_relist_seconds=5,
+            clock=lambda: self.now,
+        )
+
+    def test_point_loads_share_one_listing(self):
+        for i in range(50):
+            doc = self.source.load(f"etag-raw/{i:03d}")
+            self.assertEqual(doc.source_location, f"s3://bucket/raw/{i:03d}")
+        self.assertEqual(self.source.load("raw/007").id, "etag-raw/007")
+        self.assertEqual(self.client.list_calls, 1)
+        self.assertEqual(self.client.gets, 51)
+
+    def test_new_key_is_found_by_listing_after_the_last_key(self):
+        self.source.load("raw/000")
+        self.client.objects["raw/999"] = b"new"
+        self.assertEqual(self.source.load("etag-raw/999").content, "new")
+        self.assertEqual(self.client.list_start_after, ["", "raw/049"])
+
+    def test_overwritten_key_needs_a_full_relist_after_the_min_interval(self):
+        self.source.load("raw/000")
+        self.client.listing = lambda key: {"Key": key, "ETag": f'"v2-{key}"'}
+        with self.assertRaises(ValueError):
+            self.source.load("v2-raw/010")
+        self.now = 5.0
+        self.assertEqual(self.source.load("v2-raw/010").id, "v2-raw/010")
+        self.assertEqual(self.client.list_start_after, ["", "raw/049", "raw/049", ""])
+
+    def test_expired_snapshot_is_relisted(self):
+        self.source.load("raw/000")
+        self.now = 61.0
+        self.source.load("raw/000")
+        self.assertEqual(self.client.list_start_after, ["", ""])
+
+    def test_bulk_listing_refreshes_the_snapshot(self):
+        self.source.get_all_source_document_identifiers()
+        self.source.load("raw/001")
+        self.assertEqual(self.client.list_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
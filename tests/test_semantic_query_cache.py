@@ -0,0 +1,136 @@
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+# test_faiss_vector_repository replaces faiss in sys.modules with a mock; these tests
+# need the real library.
+_mocked_faiss = sys.modules.pop("faiss", None)
+import faiss  # noqa: E402
+
+if _mocked_faiss is not None:
+    sys.modules["faiss"] = _mocked_faiss
+
+from src.adapters.vector_storage import semantic_query_cache  # noqa: E402
+from src.adapters.vector_storage.semantic_query_cache import (  # noqa: E402
+    SemanticQueryCache,
+)
+from src.application.services.query_service import QueryService  # noqa: E402
+from src.domain.entities import Chunk  # noqa: E402
+
+
+def chunks(name, n=3):
+    return [Chunk(id=f"{name}-{i}", document_id=name, content=name) for i in range(n)]
+
+
+def unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class TestSemanticQueryCache(unittest.TestCase):
+    """Tests similarity matching, top_k reuse, versioning and eviction."""
+
+    def setUp(self):
+        patcher = patch.object(semantic_query_cache, "faiss", faiss)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_near_duplicate_embeddings_hit_and_distant_ones_miss(self):
+        cache = SemanticQueryCache(dimension=3, threshold=0.95)
+        cache.add(np.stack([unit(1, 0, 0)]), [chunks("a")], top_k=3, version=1)
+
+        # Scale does not matter: similarity is cosine.
+        near, far = 5 * unit(1, 0.1, 0), unit(1, 1, 0)
+        answers = cache.lookup(np.stack([near, far]), top_k=2, version=1)
+
+        self.assertEqual([c.id for c in answers[0]], ["a-0", "a-1"])
+        self.assertIsNone(answers[1])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_a_cached_result_with_smaller_top_k_does_not_answer(self):
+        cache = SemanticQueryCache(dimension=3)
+        cache.add(np.stack([unit(1, 0, 0)]), [chunks("a", 2)], top_k=2, version=1)
+        self.assertEqual(cache.lookup(np.stack([unit(1, 0, 0)]), 3, 1), [None])
+
+    def test_a_newer_index_version_clears_and_unversioned_never_caches(self):
+        cache = SemanticQueryCache(dimension=3)
+        cache.add(np.stack([unit(1, 0, 0)]), [chunks("a")], top_k=3, version=1)
+        self.assertEqual(cache.lookup(np.stack([unit(1, 0, 0)]), 3, 2), [None])
+        self.assertEqual((cache.stats()["entries"], cache.invalidations), (0, 1))
+
+        cache.add(np.stack([unit(1, 0, 0)]), [chunks("a")], top_k=3, version=None)
+        self.assertEqual(cache.lookup(np.stack([unit(1, 0, 0)]), 3, None), [None])
+
+    def test_oldest_queries_are_evicted_beyond_max_entries(self):
+        cache = SemanticQueryCache(dimension=3, max_entries=2)
+        for name, vector in (("x", (1, 0, 0)), ("y", (0, 1, 0)), ("z", (0, 0, 1))):
+            cache.add(np.stack([unit(*vector)]), [chunks(name)], top_k=3, version=1)
+
+        answers = cache.lookup(np.eye(3, dtype=np.float32), top_k=1, version=1)
+        self.assertEqual(
+            [a[0].document_id if a else None for a in answers], [None, "y", "z"]
+        )
+        self.assertEqual(cache.index.ntotal, 2)
+
+
+class TestQueryServiceSemanticCache(unittest.TestCase):
+    """Tests that QueryService searches only the semantic cache's misses."""
+
+    def setUp(self):
+        patcher = patch.object(semantic_query_cache, "faiss", faiss)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def service(self):
+        embeddings = {
+            "how do I reload": unit(1, 0, 0),
+            "how can I reload": unit(1, 0.05, 0),
+            "what is faiss": unit(0, 1, 0),
+        }
+        embedding_service = MagicMock()
+        embedding_service.embed_query.side_effect = embeddings.get
+        embedding_service.embed_queries.side_effect = lambda qs: np.stack(
+            [embeddings[q] for q in qs]
+        )
+        repository = MagicMock()
+        repository.index_version.return_value = 7
+        repository.search_batch.side_effect = lambda matrix, top_k: [
+            [(chunk, 0.0) for chunk in chunks(f"hit{len(matrix)}", top_k)]
+            for _ in matrix
+        ]
+        return QueryService(
+            embedding_service, repository, SemanticQueryCache(dimension=3)
+        )
+
+    def test_paraphrases_skip_the_repository_search(self):
+        service = self.service()
+        repository = service.vector_repository
+
+        first = service.search("how do I reload", top_k=2, use_semantic_cache=True)
+        batch = service.search_batch(
+            ["how can I reload", "what is faiss"], top_k=2, use_semantic_cache=True
+        )
+
+        self.assertEqual(batch[0], first)
+        self.assertEqual(repository.search_batch.call_count, 2)
+        # Only the miss went to the repository.
+        self.assertEqual(len(repository.search_batch.call_args[0][0]), 1)
+        self.assertEqual(service.semantic_cache.stats()["hits"], 1)
+
+    def test_callers_that_do_not_ask_for_it_bypass_the_cache(self):
+        service = self.service()
+        repository = service.vector_repository
+        service.search("how do I reload", top_k=2, use_semantic_cache=True)
+
+        # As /query/batch: every query is searched, and nothing is cached.
+        service.search_batch(["how can I reload", "how do I reload"], top_k=2)
+
+        self.assertEqual(len(repository.search_batch.call_args[0][0]), 2)
+        stats = service.semantic_cache.stats()
+        self.assertEqual((stats["hits"], stats["entries"]), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.application.service_reloader import (
+    BuiltService,
+    ReloadInProgressError,
+    ServiceReloader,
+)
+
+
+def built_service(calls=None):
+    """A BuiltService whose model and index record their warm-up calls."""
+    calls = calls if calls is not None else []
+
+    def embed_query(query):
+        calls.append("embed")
+        return np.zeros(2, dtype=np.float32)
+
+    def search(query_embedding, top_k):
+        calls.append("search")
+        return []
+
+    query_service = MagicMock()
+    query_service.embedding_service.embed_query.side_effect = embed_query
+    query_service.vector_repository.search.side_effect = search
+    return BuiltService(query_service, config_version="7")
+
+
+class TestServiceReloader(unittest.TestCase):
+    """Tests background rebuilds: warm before swap, one at a time, failures."""
+
+    def test_the_new_service_is_warmed_before_it_is_published(self):
+        calls = []
+        built = built_service(calls)
+        published = []
+
+        def build():
+            calls.append("build")
+            return built
+
+        def publish(service):
+            calls.append("publish")
+            published.append(service)
+
+        reloader = ServiceReloader(build=build, publish=publish)
+
+        job = reloader.start()
+        reloader.wait(5)
+
+        self.assertEqual(calls, ["build", "embed", "search", "publish"])
+        self.assertEqual(published, [built])
+        status = reloader.get(job.id).to_dict()
+        self.assertEqual(status["status"], "succeeded")
+        self.assertEqual(status["config_version"], "7")
+        self.assertIsNotNone(status["build_seconds"])
+        self.assertIsNotNone(status["warm_seconds"])
+        self.assertIsNotNone(status["finished_at"])
+
+    def test_a_second_reload_is_refused_while_one_is_building(self):
+        release = threading.Event()
+        built = built_service()
+        published = []
+
+        def slow_build():
+            release.wait(5)
+            return built
+
+        reloader = ServiceReloader(build=slow_build, publish=published.append)
+        job = reloader.start()
+        with self.assertRaises(ReloadInProgressError) as raised:
+            reloader.start()
+        self.assertEqual(raised.exception.job_id, job.id)
+        # The old service keeps serving until the new one is ready.
+        self.assertEqual(published, [])
+        self.assertIn(reloader.get(job.id).status, ("pending", "building"))
+
+        release.set()
+        reloader.wait(5)
+        self.assertEqual(published, [built])
+        reloader.start()  # Finished jobs do not block new ones
+        reloader.wait(5)
+
+    def test_failed_builds_and_warm_ups_are_reported_and_never_published(self):
+        published = []
+
+        def failing_build():
+            raise RuntimeError("SSM unavailable")
+
+        reloader = ServiceReloader(build=failing_build, publish=published.append)
+        job = reloader.start()
+        reloader.wait(5)
+        self.assertEqual(reloader.get(job.id).status, "failed")
+        self.assertEqual(reloader.get(job.id).error, "SSM unavailable")
+
+        cold = built_service()
+        cold.query_service.embedding_service.embed_query.side_effect = OSError(
+            "model files missing"
+        )
+        reloader.build = lambda: cold
+        job = reloader.start()
+        reloader.wait(5)
+        self.assertEqual(reloader.get(job.id).status, "failed")
+        self.assertEqual(published, [])
+
+    def test_only_the_latest_jobs_are_kept(self):
+        reloader = ServiceReloader(
+            build=built_service, publish=lambda b: None, max_jobs=2
+        )
+        jobs = []
+        for _ in range(3):
+            jobs.append(reloader.start())
+            reloader.wait(5)
+        self.assertIsNone(reloader.get(jobs[0].id))
+        self.assertIsNotNone(reloader.get(jobs[2].id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from src.adapters.chunking.streaming import iter_split_stream
+from src.adapters.data_sources.file_system_data_source import FileSystemDataSource
+from src.adapters.data_sources.streaming_reads import iter_decoded
+
+
+def split_words(text, size=12, overlap_words=1):
+    """Greedy word packer with overlap, standing in for a real text splitter."""
+    words, pieces, current = text.split(), [], []
+    for word in words:
+        if current and len(" ".join(current + [word])) > size:
+            pieces.append(" ".join(current))
+            current = current[-overlap_words:]
+        current.append(word)
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+class TestStreamingReads(unittest.TestCase):
+    """Tests incremental decoding and window-at-a-time splitting."""
+
+    def test_decoder_handles_characters_and_crlf_split_across_blocks(self):
+        data = "añb\r\nc\rd\r\n".encode()
+        blocks = [data[:2], data[2:4], data[4:5], data[5:8], data[8:]]
+        self.assertEqual("".join(iter_decoded(blocks)), "añb\nc\nd\n")
+
+    def test_stream_split_matches_whole_text_split(self):
+        text = " ".join(f"w{i}" for i in range(500))
+        segments = [text[i : i + 37] for i in range(0, len(text), 37)]
+        streamed = list(iter_split_stream(segments, split_words, window_chars=100))
+        self.assertEqual(streamed, split_words(text))
+
+    def test_large_file_is_streamed_through_mmap(self):
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, "big.txt"), "wb") as f:
+                f.write("ünïcode line\r\n".encode() * 10_000)
+            with open(os.path.join(root, "small.txt"), "w") as f:
+                f.write("small")
+            source = FileSystemDataSource(root, stream_threshold_bytes=4096)
+            documents = {d.source_location: d for d in source.iter_all()}
+
+            big = documents[os.path.join(root, "big.txt")]
+            self.assertTrue(big.is_streamed)
+            self.assertEqual("".join(big.iter_text()), "ünïcode line\n" * 10_000)
+            self.assertEqual(source.load(big.id).id, big.id)
+            self.assertFalse(documents[os.path.join(root, "small.txt")].is_streamed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import textwrap
+import unittest
+
+from src.adapters.chunking.token_budget_chunking_strategy import (
+    TokenBudgetChunkingStrategy,
+)
+from src.adapters.chunking.token_counting import TokenCounter
+from src.domain.entities.document import Document
+
+SOURCE = textwrap.dedent(
+    '''\
+    """Module docstring."""
+    import os
+
+
+    # Helper comment stays with its function.
+    def small(a, b):
+        return os.path.join(a, b)
+
+
+    @decorator
+    def medium(values):
+        total = 0
+        for value in values:
+            total += value * 2
+        return total
+
+
+    class Service:
+        """A class too large for one chunk."""
+
+        def first(self, x):
+            return [x + i for i in range(10)] + [x - i for i in range(10)]
+
+        def second(self, y):
+            if y > 10:
+                return {"big": y, "small": None, "values": [y, y, y, y]}
+            return {"big": None, "small": y, "values": [y, y, y, y]}
+
+        def third(self, z):
+            return sorted(set(z), key=lambda item: (len(item), item.lower()))
+    '''
+)
+
+
+def chunk(content, source="module.py", **kwargs):
+    doc = Document(id="d", content=content, source_location=source)
+    return TokenBudgetChunkingStrategy(**kwargs).chunk(doc)
+
+
+class TestTokenBudgetChunkingStrategy(unittest.TestCase):
+    """Tests token-budgeted packing and syntax-aware splitting of Python sources."""
+
+    def test_chunks_fill_but_never_exceed_the_budget(self):
+        counter = TokenCounter()
+        for budget in (40, 60, 100):
+            chunks = chunk(SOURCE, max_tokens=budget)
+            for c in chunks:
+                self.assertLessEqual(counter.count(c.content), budget)
+                self.assertEqual(c.metadata["tokens"], counter.count(c.content))
+                start, end = c.metadata["start_index"], c.metadata["end_index"]
+                self.assertEqual(SOURCE[start:end], c.content)
+        self.assertEqual(len(chunk(SOURCE, max_tokens=10_000)), 1)
+
+    def test_python_is_split_at_definitions(self):
+        chunks = chunk(SOURCE, max_tokens=60)
+        for c in chunks:
+            line_start = SOURCE.rfind("\n", 0, c.metadata["start_index"]) + 1
+            self.assertEqual(SOURCE[line_start : c.metadata["start_index"]].strip(), "")
+        # Functions that fit are whole; the class header travels with its first method.
+        medium = next(c for c in chunks if "def medium" in c.content)
+        self.assertIn("@decorator\ndef medium", medium.content)
+        self.assertIn("return total", medium.content)
+        header = next(c for c in chunks if "class Service" in c.content)
+        self.assertIn("def first", header.content)
+        self.assertTrue(any(c.content.startswith("def third") for c in chunks))
+
+    def test_unparseable_or_non_python_text_is_split_as_text(self):
+        prose = "\n\n".join(
+            " ".join(f"word{i}{j}" for j in range(30)) for i in range(6)
+        )
+        for source in ("notes.md", "broken.py"):
+            chunks = chunk(prose + "\ndef (", source=source, max_tokens=100)
+            self.assertGreater(len(chunks), 1)
+            self.assertTrue(all(c.metadata["tokens"] <= 100 for c in chunks))
+            self.assertTrue(chunks[1].content.startswith("word"))
+
+    def test_overlap_repeats_trailing_units(self):
+        lines = "\n".join(f"line {i} of the log" for i in range(60))
+        chunks = chunk(lines, source="log.txt", max_tokens=50, overlap_tokens=15)
+        for previous, current in zip(chunks, chunks[1:]):
+            self.assertLess(
+                current.metadata["start_index"], previous.metadata["end_index"]
+            )
+
+    def test_streamed_documents_keep_document_offsets(self):
+        strategy = TokenBudgetChunkingStrategy(max_tokens=30)
+        strategy.STREAM_WINDOW_CHARS_PER_TOKEN = 20
+        pieces = [SOURCE[i : i + 97] for i in range(0, len(SOURCE), 97)]
+        doc = Document(
+            id="d", content="", source_location="x.py", stream=lambda: iter(pieces)
+        )
+        chunks = strategy.chunk(doc)
+        self.assertGreater(len(chunks), 5)
+        for c in chunks:
+            start, end = c.metadata["start_index"], c.metadata["end_index"]
+            self.assertEqual(SOURCE[start:end], c.content)
+
+    def test_unavailable_tokenizer_falls_back_to_approximation(self):
+        counter = TokenCounter("/nonexistent/tokenizer.json")
+        self.assertFalse(counter.exact)
+        self.assertEqual(counter.count("total += value * 2"), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()